@@ -1,28 +1,90 @@
-import tkinter as tk
-from tkinter import messagebox
-import os
-
-# Import database and helper utilities
-from utils.database import Database
-from utils.helpers import (
-    load_image, PUP_RED, PUP_GOLD, LIGHT_BG, WHITE_BG, PUP_LOGO_PATH,
-    QUESTION_MARK_PATH, CART_ICON_PATH, USER_ICON_PATH,
-    HEADER_FONT, TITLE_FONT, GLOBAL_FONT, # These are initially defaults, will be updated by load_custom_fonts
-    create_rounded_rectangle,
-    load_custom_fonts # <--- IMPORT THE FONT LOADING FUNCTION
-)
-
-# Import screen modules
-from screens.login_screen import LoginScreen
-from screens.register_screen import RegisterScreen
-from screens.home_screen import HomeScreen
-from screens.product_detail_screen import ProductDetailScreen
-from screens.shopping_cart_screen import ShoppingCartScreen
-from screens.checkout_screen import CheckoutScreen
-from screens.order_history_screen import OrderHistoryScreen
-from screens.profile_screen import ProfileScreen
-from screens.contact_us_screen import ContactUsScreen
-from screens.inventory_management_screen import InventoryManagementScreen
+import time
+STARTUP_T0 = time.perf_counter() # Taken before the heavy imports so they count towards startup time
+
+import argparse
+import sys
+
+from utils.startup_profiler import StartupProfiler
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="PUP E-Shop kiosk")
+    parser.add_argument("--profile-startup", nargs="?", const="-", metavar="JSON",
+                        help="record startup phase and import timings; write JSON to this file (default: print)")
+    parser.add_argument("--cprofile", metavar="PATH", help="with --profile-startup, also dump a cProfile of startup to PATH")
+    parser.add_argument("--exit-after-startup", action="store_true",
+                        help="quit as soon as the login screen is interactive (for repeatable startup measurements)")
+    parser.add_argument("--server", metavar="URL",
+                        help="client mode: use the shop API at URL (python -m services.server) instead of the local database")
+    return parser.parse_args(argv)
+
+ARGS = parse_args() if __name__ == "__main__" else parse_args([])
+startup = StartupProfiler(t0=STARTUP_T0, enabled=ARGS.profile_startup is not None,
+                          cprofile_path=ARGS.cprofile if ARGS.profile_startup is not None else None)
+
+with startup.timed_imports():
+    import tkinter as tk
+    from tkinter import messagebox
+    import os
+
+    # Import database and helper utilities
+    from utils.database import Database
+    from utils.write_queue import WRITE_WINDOW_MS
+    from services import Services
+    from services.client import RemoteServices
+    from utils.image_cache import image_cache
+    from utils.image_loader import ImageLoader
+    from utils.helpers import (
+        load_image, PUP_RED, PUP_GOLD, LIGHT_BG, WHITE_BG, PUP_LOGO_PATH,
+        QUESTION_MARK_PATH, CART_ICON_PATH, USER_ICON_PATH,
+        HEADER_FONT, TITLE_FONT, GLOBAL_FONT, # Named fonts, created by the FontRegistry below
+        create_rounded_rectangle
+    )
+    from utils.fonts import FontRegistry
+    from utils.transitions import TRANSITION_MS, TransitionEngine
+    from utils.watchdog import STALL_MS, StallWatchdog
+
+    # Import screen modules
+    from screens.login_screen import LoginScreen
+    from screens.register_screen import RegisterScreen
+    from screens.home_screen import HomeScreen
+    from screens.product_detail_screen import ProductDetailScreen
+    from screens.shopping_cart_screen import ShoppingCartScreen
+    from screens.checkout_screen import CheckoutScreen
+    from screens.order_history_screen import OrderHistoryScreen
+    from screens.profile_screen import ProfileScreen
+    from screens.contact_us_screen import ContactUsScreen
+    from screens.inventory_management_screen import InventoryManagementScreen
+
+QUERY_REPORT_ENV = "PUPSHOP_QUERY_REPORT"
+IMAGE_CACHE_MB_ENV = "PUPSHOP_IMAGE_CACHE_MB"
+IMAGE_QUALITY_ENV = "PUPSHOP_IMAGE_QUALITY" # best / balanced / fast, see utils/thumbnails.py
+PREBUILD_ENV = "PUPSHOP_PREBUILD_SCREENS" # "0" disables building the other screens in idle time
+STARTUP_BUDGET_ENV = "PUPSHOP_STARTUP_BUDGET_MS"
+TRANSITION_MS_ENV = "PUPSHOP_TRANSITION_MS" # Screen slide length; "0" switches screens without animating
+UI_REPORT_ENV = "PUPSHOP_UI_REPORT" # Stall and handler latency report written on exit, see utils/watchdog.py
+STALL_MS_ENV = "PUPSHOP_STALL_MS"
+WATCHDOG_ENV = "PUPSHOP_WATCHDOG" # "0" turns off the stall watchdog and handler timing
+SERVER_URL_ENV = "PUPSHOP_SERVER_URL" # Same as --server
+ADMIN_TOKEN_ENV = "PUPSHOP_ADMIN_TOKEN" # Lets this kiosk edit inventory on the API server (client mode only)
+WRITE_WINDOW_MS_ENV = "PUPSHOP_WRITE_WINDOW_MS" # Group commit window of the database writer, see utils/write_queue.py
+
+STARTUP_BUDGET_MS = 1500 # Time-to-first-interactive target for the login screen
+PREBUILD_DELAY_MS = 50   # Gap between idle-time screen builds, so input is handled in between
+
+# Screens in the order they are pre-built after the login screen is up:
+# the shopping flow first, since that is where a shopper goes next.
+SCREEN_CLASSES = [
+    LoginScreen,
+    HomeScreen,
+    ProductDetailScreen,
+    ShoppingCartScreen,
+    CheckoutScreen,
+    RegisterScreen,
+    OrderHistoryScreen,
+    ProfileScreen,
+    ContactUsScreen,
+    InventoryManagementScreen,
+]
 
 class App(tk.Tk):
     def __init__(self):
@@ -32,13 +94,37 @@ class App(tk.Tk):
         self.resizable(False, False)
         self.configure(bg=LIGHT_BG)
 
-        # --- IMPORTANT FIX: Initialize core attributes first ---
-        self.db = Database()
-        self.db.create_tables()
+        # Times every Tk callback registered from here on; the heartbeat starts once startup is over
+        self.watchdog = None
+        if os.environ.get(WATCHDOG_ENV, "1") != "0":
+            self.watchdog = StallWatchdog(self, stall_ms=float(os.environ.get(STALL_MS_ENV) or STALL_MS),
+                                          screen_provider=lambda: self.current_frame_name)
+            self.watchdog.install()
+        startup.checkpoint("tk_root")
 
+        # --- IMPORTANT FIX: Initialize core attributes first ---
+        self.server_url = ARGS.server or os.environ.get(SERVER_URL_ENV)
+        if self.server_url:
+            # Client mode: every service call goes to the shared API server; no local database is opened
+            self.db = None
+            self.services = RemoteServices(self.server_url, admin_token=os.environ.get(ADMIN_TOKEN_ENV))
+        else:
+            self.db = Database(write_window_ms=float(os.environ.get(WRITE_WINDOW_MS_ENV) or WRITE_WINDOW_MS))
+            self.db.create_tables()
+            self.services = Services(self.db) # Shop logic; the screens are views over it
+        self.services.start_executor(self) # Background calls report back through self.after()
+        self.services.stats.screen_provider = lambda: self.current_frame_name # Attribute query counts to the visible screen
         self.current_user_id = None
-        self.shopping_cart = {}
         self.current_frame_name = None
+        startup.checkpoint("database")
+
+        # Memory budget of the shared image cache (utils/image_cache.py), overridable per kiosk
+        if os.environ.get(IMAGE_CACHE_MB_ENV):
+            image_cache.set_budget(int(float(os.environ[IMAGE_CACHE_MB_ENV]) * 1024 * 1024))
+        if os.environ.get(IMAGE_QUALITY_ENV):
+            image_cache.set_quality(os.environ[IMAGE_QUALITY_ENV])
+
+        self.image_loader = ImageLoader(self) # Product images are decoded on their own worker threads
 
         # Load common images once
         self.pup_logo = load_image(PUP_LOGO_PATH, (120, 120))
@@ -46,9 +132,11 @@ class App(tk.Tk):
         self.cart_icon = load_image(CART_ICON_PATH, (30, 30))
         self.user_icon = load_image(USER_ICON_PATH, (30, 30))
         # --- End of crucial initializations ---
+        startup.checkpoint("images")
 
-        # --- FONT LOADING FIX: Load custom fonts after Tkinter root is ready ---
-        load_custom_fonts() # <--- CALL THE FONT LOADING FUNCTION HERE
+        # Named fonts live on this root; screens share them and self.fonts.measure() for text layout
+        self.fonts = FontRegistry(self)
+        startup.checkpoint("fonts")
 
         # --- CORRECTED CANVAS AND CONTAINER SETUP ---
         canvas_width = 360
@@ -72,84 +160,126 @@ class App(tk.Tk):
 
         self.container.grid_rowconfigure(0, weight=1)
         self.container.grid_columnconfigure(0, weight=1)
+        self.transitions = TransitionEngine(self, self.container,
+                                            duration_ms=int(os.environ.get(TRANSITION_MS_ENV) or TRANSITION_MS))
+        startup.checkpoint("window")
 
+        # Screens are registered as factories and only built the first time they are needed
         self.frames = {}
-        screen_classes = [
-            LoginScreen,
-            RegisterScreen,
-            HomeScreen,
-            ProductDetailScreen,
-            ShoppingCartScreen,
-            CheckoutScreen,
-            OrderHistoryScreen,
-            ProfileScreen,
-            ContactUsScreen,
-            InventoryManagementScreen,
-        ]
-
-        for F in screen_classes:
-            page_name = F.__name__
-            frame = F(parent=self.container, controller=self)
-            self.frames[page_name] = frame
-            frame.grid(row=0, column=0, sticky="nsew")
+        self.screen_factories = {F.__name__: F for F in SCREEN_CLASSES}
+        self.screen_build_ms = {}
+        self.shown_screens = set()
+        self.first_interactive_ms = None
 
         self.show_frame("LoginScreen", animate=False)
+        startup.checkpoint("login_screen")
 
         self.help_button = tk.Button(self.outer_canvas, image=self.question_mark_icon, command=self.show_help, bd=0, bg=LIGHT_BG,
                                      activebackground=LIGHT_BG)
         self.help_button.place(relx=0.9, rely=0.95, anchor="se", x=-10, y=-10)
 
+        # F9 prints the query report on demand (see utils/instrumentation.py)
+        self.bind_all("<F9>", lambda event: self.print_query_report())
+
+        # Runs once the login screen has been drawn and the event loop is free
+        self.after_idle(self._on_first_interactive)
+
+    def get_frame(self, page_name):
+        """Returns the screen, building it on first use."""
+        frame = self.frames.get(page_name)
+        if frame is None:
+            start = time.perf_counter()
+            frame = self.screen_factories[page_name](parent=self.container, controller=self)
+            frame.grid(row=0, column=0, sticky="nsew")
+            frame.lower() # Newer widgets stack on top; keep it hidden until it is raised
+            self.frames[page_name] = frame
+            self.screen_build_ms[page_name] = (time.perf_counter() - start) * 1000.0
+        return frame
+
+    def _on_first_interactive(self):
+        startup.checkpoint("first_idle") # Geometry, drawing and anything else queued before the first idle
+        startup.mark("first_interactive")
+        self.first_interactive_ms = (time.perf_counter() - STARTUP_T0) * 1000.0
+        budget = float(os.environ.get(STARTUP_BUDGET_ENV) or STARTUP_BUDGET_MS)
+        built = ", ".join(f"{name} {ms:.0f} ms" for name, ms in self.screen_build_ms.items())
+        print(f"Startup: login screen interactive after {self.first_interactive_ms:.0f} ms "
+              f"(budget {budget:.0f} ms; built {built})")
+        if self.first_interactive_ms > budget:
+            print(f"Warning: startup exceeded its {budget:.0f} ms budget by {self.first_interactive_ms - budget:.0f} ms")
+
+        if startup.enabled:
+            self.write_startup_profile(budget)
+        if ARGS.exit_after_startup:
+            self.after(0, self.destroy)
+            return
+
+        if self.watchdog is not None:
+            self.watchdog.start()
+        if os.environ.get(PREBUILD_ENV, "1") != "0":
+            self.after(PREBUILD_DELAY_MS, self._prebuild_next)
+
+    def write_startup_profile(self, budget_ms):
+        """--profile-startup: prints the phase summary and writes the JSON report (and cProfile dump)."""
+        startup.stop()
+        print(startup.summary())
+        startup.dump(ARGS.profile_startup, extra={
+            "first_interactive_ms": round(self.first_interactive_ms, 3),
+            "startup_budget_ms": budget_ms,
+            "screen_build_ms": {name: round(ms, 3) for name, ms in self.screen_build_ms.items()},
+        })
+        if ARGS.profile_startup != "-":
+            print(f"Startup profile written to {ARGS.profile_startup}")
+        if ARGS.cprofile:
+            print(f"cProfile data written to {ARGS.cprofile} (view with: python -m pstats {ARGS.cprofile})")
+
+    def _prebuild_next(self):
+        """Builds one not-yet-built screen per idle slot until all of them exist."""
+        pending = [name for name in self.screen_factories if name not in self.frames]
+        if not pending:
+            return
+        def build():
+            self.get_frame(pending[0])
+            if len(pending) > 1:
+                self.after(PREBUILD_DELAY_MS, self._prebuild_next)
+        self.after_idle(build)
+
 
     def show_frame(self, page_name, product_id=None, animate=True):
         """
         Switches between frames with an optional slide animation.
         """
-        new_frame = self.frames[page_name]
+        new_frame = self.get_frame(page_name)
+        first_show = page_name not in self.shown_screens
+        self.shown_screens.add(page_name)
 
+        # Screens load their data when shown, not when built, so idle-time pre-building never queries
         if page_name == "ProductDetailScreen" and product_id is not None:
             new_frame.load_product(product_id)
+        elif page_name == "HomeScreen" and first_show:
+            new_frame.load_products() # Later visits keep the shopper's search and scroll position
         elif page_name == "ShoppingCartScreen":
             new_frame.load_cart_items()
+        elif page_name == "CheckoutScreen":
+            new_frame.load_checkout_details()
         elif page_name == "OrderHistoryScreen":
             new_frame.load_orders()
         elif page_name == "ProfileScreen":
             new_frame.load_addresses()
+        elif page_name == "ContactUsScreen":
+            new_frame.load_user_info()
         elif page_name == "InventoryManagementScreen":
              new_frame.load_products()
 
-        if self.current_frame_name is None or not animate:
+        previous_name, self.current_frame_name = self.current_frame_name, page_name
+        if previous_name is not None and previous_name != page_name:
+            on_hide = getattr(self.frames[previous_name], "on_hide", None)
+            if on_hide is not None:
+                on_hide() # e.g. stop building rows nobody will see
+        if previous_name is None or not animate:
+            self.transitions.finish() # A slide still running would otherwise end on top of this screen
             new_frame.tkraise()
-            self.current_frame_name = page_name
             return
-
-        old_frame = self.frames[self.current_frame_name]
-        
-        width = self.container.winfo_width()
-
-        new_frame.place(x=width, y=0, relwidth=1, relheight=1)
-        new_frame.tkraise()
-
-        step = 25
-        delay = 10
-
-        def animate_swipe():
-            if not old_frame.winfo_ismapped() or not new_frame.winfo_ismapped():
-                return
-
-            current_x_old = old_frame.winfo_x()
-            current_x_new = new_frame.winfo_x()
-
-            if current_x_new > 0:
-                old_frame.place(x=current_x_old - step, y=0, relwidth=1, relheight=1)
-                new_frame.place(x=current_x_new - step, y=0, relwidth=1, relheight=1)
-                self.after(delay, animate_swipe)
-            else:
-                old_frame.place_forget()
-                new_frame.place(x=0, y=0, relwidth=1, relheight=1)
-                self.current_frame_name = page_name
-
-        animate_swipe()
-
+        self.transitions.slide(self.get_frame(previous_name), new_frame)
 
     def set_current_user(self, user_id):
         self.current_user_id = user_id
@@ -158,32 +288,67 @@ class App(tk.Tk):
         return self.current_user_id
 
     def get_db(self):
+        """The local Database, or None in client mode (--server)."""
         return self.db
 
+    def get_services(self):
+        return self.services
+
     def get_cart(self):
-        return self.shopping_cart
+        return self.services.cart.items
 
     def add_to_cart(self, product_id, quantity=1):
-        if product_id in self.shopping_cart:
-            self.shopping_cart[product_id] += quantity
-        else:
-            self.shopping_cart[product_id] = quantity
+        self.services.cart.add(product_id, quantity)
         messagebox.showinfo("Cart Update", f"Added {quantity} item(s) to cart.")
 
     def remove_from_cart(self, product_id):
-        if product_id in self.shopping_cart:
-            del self.shopping_cart[product_id]
+        if self.services.cart.remove(product_id):
             messagebox.showinfo("Cart Update", "Item removed from cart.")
 
     def update_cart_quantity(self, product_id, quantity):
-        if product_id in self.shopping_cart:
-            if quantity > 0:
-                self.shopping_cart[product_id] = quantity
-            else:
-                self.remove_from_cart(product_id)
+        if quantity > 0:
+            self.services.cart.set_quantity(product_id, quantity)
+        else:
+            self.remove_from_cart(product_id)
 
     def clear_cart(self):
-        self.shopping_cart = {}
+        self.services.cart.clear()
+
+    def print_query_report(self):
+        print(self.services.stats.report())
+        if self.db is not None:
+            print(self.db.writes.report())
+        print(image_cache.report())
+        print(self.fonts.report())
+        print(self.transitions.stats.report())
+        if self.watchdog is not None:
+            print(self.watchdog.report())
+
+    def dump_query_report(self):
+        """On exit: writes the JSON query report to $PUPSHOP_QUERY_REPORT if set ("-" prints a summary)."""
+        target = os.environ.get(QUERY_REPORT_ENV)
+        if not target:
+            return
+        if target == "-":
+            self.print_query_report()
+        else:
+            self.services.stats.dump(target)
+            print(f"Query report written to {target}")
+
+    def dump_ui_report(self):
+        """On exit: writes the stall and handler latency report to $PUPSHOP_UI_REPORT if set ("-" prints it)."""
+        if self.watchdog is None:
+            return
+        self.watchdog.stop()
+        self.watchdog.uninstall()
+        target = os.environ.get(UI_REPORT_ENV)
+        if not target:
+            return
+        if target == "-":
+            print(self.watchdog.report())
+        else:
+            self.watchdog.dump(target)
+            print(f"UI latency report written to {target}")
 
     def show_help(self):
         messagebox.showinfo("Help", "This is the help section of the PUP E-Shop app. "
@@ -191,4 +356,6 @@ class App(tk.Tk):
 
 if __name__ == "__main__":
     app = App()
-    app.mainloop()
\ No newline at end of file
+    app.mainloop()
+    app.dump_query_report()
+    app.dump_ui_report()
\ No newline at end of file
@@ -1,20 +1,23 @@
 import tkinter as tk
 from tkinter import messagebox
-import datetime
 import os
-import sqlite3
 
 from utils.helpers import (
     load_image, PUP_RED, PUP_GOLD, LIGHT_BG, WHITE_BG, GLOBAL_FONT, GLOBAL_FONT_BOLD,
     TITLE_FONT, HEADER_FONT, CHECK_MARK_PATH, CART_ICON_PATH, USER_ICON_PATH,
     BORDER_COLOR, GRAY_TEXT
 )
+from services import ServiceError
+from utils.checkout import CheckoutError, PriceChangedError
+
+ITEM_TEXT_WIDTH = 150 # Width the first item's name is wrapped to
 
 class CheckoutScreen(tk.Frame):
     def __init__(self, parent, controller):
         tk.Frame.__init__(self, parent, bg=WHITE_BG) # Make screen background uniformly white
         self.controller = controller
-        self.db = self.controller.get_db()
+        self.checkout = self.controller.get_services().checkout
+        self.cart = self.controller.get_services().cart
 
         self.check_mark_img = load_image(CHECK_MARK_PATH, (20, 20))
 
@@ -55,7 +58,7 @@ class CheckoutScreen(tk.Frame):
         item_details_frame = tk.Frame(item_frame, bg=WHITE_BG)
         item_details_frame.pack(side="left", fill="x", expand=True, padx=5)
 
-        self.item_name_label = tk.Label(item_details_frame, text="", font=GLOBAL_FONT_BOLD, fg="black", bg=WHITE_BG, wraplength=150, justify="left")
+        self.item_name_label = tk.Label(item_details_frame, text="", font=GLOBAL_FONT_BOLD, fg="black", bg=WHITE_BG, justify="left")
         self.item_name_label.pack(anchor="w")
         self.item_desc_label = tk.Label(item_details_frame, text="", font=GLOBAL_FONT, fg="gray", bg=WHITE_BG, wraplength=150, justify="left")
         self.item_desc_label.pack(anchor="w")
@@ -110,57 +113,36 @@ class CheckoutScreen(tk.Frame):
                                              command=self.process_checkout)
         self.checkout_now_button.pack(pady=5)
 
-        self.load_checkout_details()
 
     def load_checkout_details(self):
-        cart_items = self.controller.get_cart()
+        cart_items = self.cart.items
         if not cart_items:
             messagebox.showwarning("Checkout", "Your cart is empty. Please add items before checking out.")
             self.controller.show_frame("ShoppingCartScreen")
             return
 
-        product_ids = ",".join(map(str, cart_items.keys()))
-        products_data = self.db.fetch_all(f"SELECT id, name, price, image_path, description FROM products WHERE id IN ({product_ids})")
-
-        subtotal = 0.0
-        total_items = 0
-        first_item_details = None
-
-        for prod_id, name, price, img_path, desc in products_data:
-            quantity = cart_items.get(prod_id, 0)
-            subtotal += price * quantity
-            total_items += quantity
-            
-            if first_item_details is None:
-                first_item_details = {
-                    "name": name,
-                    "desc": desc,
-                    "price": price,
-                    "img_path": img_path
-                }
-        
+        summary = self.checkout.summary(cart_items)
+        first_item_details = summary.first_item
+
         if first_item_details:
-            self.item_name_label.config(text=first_item_details['name'])
+            self.item_name_label.config(text=self.controller.fonts.wrap(first_item_details['name'], GLOBAL_FONT_BOLD, ITEM_TEXT_WIDTH, 2))
             self.item_desc_label.config(text=first_item_details['desc'])
             self.item_price_label.config(text=f"P{first_item_details['price']:.2f}")
             item_image_full_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'assets', 'images', first_item_details['img_path'])
-            item_img = load_image(item_image_full_path, (80, 80))
-            if item_img:
-                self.item_image_label.config(image=item_img)
-                self.item_image_label.image = item_img
+            self.controller.image_loader.load_into(self.item_image_label, item_image_full_path, (80, 80))
         else:
+            self.controller.image_loader.cancel(self.item_image_label)
             self.item_name_label.config(text="No items in cart")
             self.item_desc_label.config(text="")
             self.item_price_label.config(text="P0.00")
             self.item_image_label.config(image='')
 
 
-        shipping_cost = 36.00
-        total_amount = subtotal + shipping_cost
-
-        self.subtotal_label.config(text=f"P{subtotal:.2f}")
-        self.summary_shipping_label.config(text=f"P{shipping_cost:.2f}")
-        self.shipping_cost_label.config(text=f"P{shipping_cost:.2f}")
+        total_items = summary.item_count
+        total_amount = summary.total
+        self.subtotal_label.config(text=f"P{summary.subtotal:.2f}")
+        self.summary_shipping_label.config(text=f"P{summary.shipping_cost:.2f}")
+        self.shipping_cost_label.config(text=f"P{summary.shipping_cost:.2f}")
         self.total_label.config(text=f"P{total_amount:.2f}")
 
         if total_items == 1:
@@ -181,60 +163,37 @@ class CheckoutScreen(tk.Frame):
             self.controller.show_frame("LoginScreen")
             return
 
-        cart_items = self.controller.get_cart()
+        cart_items = self.cart.items
         if not cart_items:
             messagebox.showwarning("Checkout", "Your cart is empty!")
             return
 
-        subtotal = 0.0
-        product_details = {}
-        for prod_id, quantity in cart_items.items():
-            product_data = self.db.fetch_one("SELECT name, price, stock_quantity FROM products WHERE id = ?", (prod_id,))
-            if product_data:
-                name, price, stock = product_data
-                if stock < quantity:
-                    messagebox.showerror("Checkout Error", f"Not enough stock for {name}. Available: {stock}")
-                    return
-                subtotal += price * quantity
-                product_details[prod_id] = {"name": name, "price": price, "quantity": quantity}
-            else:
-                messagebox.showerror("Checkout Error", f"Product ID {prod_id} not found.")
-                return
-
-        shipping_cost = 36.00
-        total_amount = subtotal + shipping_cost
-
-        confirm = messagebox.askyesno("Confirm Order", f"Total amount: P{total_amount:.2f}\nConfirm purchase?")
+        # One batched query validates every line up front; nothing is locked while the dialog is open.
+        try:
+            quote = self.checkout.quote(cart_items)
+        except (CheckoutError, ServiceError) as e:
+            messagebox.showerror("Checkout Error", str(e))
+            return
+
+        confirm = messagebox.askyesno("Confirm Order", f"Total amount: P{quote.total:.2f}\nConfirm purchase?")
         if not confirm:
             return
 
-        self.db.connect()
+        # Stock is re-checked and reserved atomically inside place_order's transaction, which
+        # also refuses the order if it no longer comes to the total the shopper just confirmed.
         try:
-            self.db.cursor.execute("BEGIN TRANSACTION;")
-
-            order_date = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            self.db.cursor.execute(
-                "INSERT INTO orders (user_id, order_date, total_amount, status) VALUES (?, ?, ?, ?)",
-                (user_id, order_date, total_amount, 'Pending')
-            )
-            order_id = self.db.cursor.lastrowid
-
-            for prod_id, details in product_details.items():
-                self.db.cursor.execute(
-                    "INSERT INTO order_items (order_id, product_id, quantity, item_price_at_order) VALUES (?, ?, ?, ?)",
-                    (order_id, prod_id, details['quantity'], details['price'])
-                )
-                self.db.cursor.execute(
-                    "UPDATE products SET stock_quantity = stock_quantity - ?, sales_count = sales_count + ? WHERE id = ?",
-                    (details['quantity'], details['quantity'], prod_id)
-                )
-
-            self.db.conn.commit()
-            messagebox.showinfo("Order Placed", f"Your order (Ref No: {order_id}) has been placed successfully!")
-            self.controller.clear_cart()
-            self.controller.show_frame("OrderHistoryScreen")
-        except sqlite3.Error as e:
-            self.db.conn.rollback()
-            messagebox.showerror("Order Error", f"Failed to place order: {e}")
-        finally:
-            pass
\ No newline at end of file
+            result = self.checkout.place_order(user_id, cart_items, expected_total=quote.total)
+        except PriceChangedError as e:
+            messagebox.showerror("Checkout Error", str(e))
+            self.load_checkout_details() # Show the new prices before the shopper tries again
+            return
+        except CheckoutError as e:
+            messagebox.showerror("Checkout Error", str(e))
+            return
+        except ServiceError as e:
+            messagebox.showerror("Order Error", str(e))
+            return
+
+        messagebox.showinfo("Order Placed", f"Your order (Ref No: {result.order_id}) has been placed successfully!")
+        self.controller.clear_cart()
+        self.controller.show_frame("OrderHistoryScreen")
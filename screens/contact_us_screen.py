@@ -1,6 +1,6 @@
 import tkinter as tk
 from tkinter import messagebox
-import datetime
+from services import ServiceError
 from utils.helpers import (
     load_image, PUP_RED, PUP_GOLD, LIGHT_BG, WHITE_BG, GLOBAL_FONT, GLOBAL_FONT_BOLD,
     TITLE_FONT, HEADER_FONT, BORDER_COLOR, CART_ICON_PATH, USER_ICON_PATH, GRAY_TEXT,
@@ -11,7 +11,7 @@ class ContactUsScreen(tk.Frame):
     def __init__(self, parent, controller):
         tk.Frame.__init__(self, parent, bg=WHITE_BG) # Make screen background uniformly white
         self.controller = controller
-        self.db = self.controller.get_db()
+        self.accounts = self.controller.get_services().accounts
 
         # --- Variables ---
         self.name_var = tk.StringVar()
@@ -70,42 +70,25 @@ class ContactUsScreen(tk.Frame):
         self.submit_button_canvas = create_styled_button(submit_button_frame, "Submit", self.submit_message, PUP_RED, PUP_GOLD, width=120, height=30)
         self.submit_button_canvas.pack()
 
-        self.load_user_info()
 
     def load_user_info(self):
         user_id = self.controller.get_current_user()
         if user_id:
-            user_data = self.db.fetch_one("SELECT name, email FROM users WHERE id = ?", (user_id,))
+            user_data = self.accounts.user_info(user_id)
             if user_data:
                 self.name_var.set(user_data[0])
                 self.email_var.set(user_data[1])
 
     def submit_message(self):
-        name = self.name_var.get().strip()
-        email = self.email_var.get().strip()
-        message = self.message_text.get("1.0", tk.END).strip()
-
-        if not name or not email or not message:
-            messagebox.showerror("Submission Error", "All fields are required.")
-            return
-
-        if "@" not in email or "." not in email:
-            messagebox.showerror("Submission Error", "Please enter a valid email address.")
+        try:
+            self.accounts.send_message(self.controller.get_current_user(), self.name_var.get(), self.email_var.get(),
+                                       self.message_text.get("1.0", tk.END))
+        except ServiceError as e:
+            messagebox.showerror("Submission Error", str(e))
             return
 
-        user_id = self.controller.get_current_user()
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-        success = self.db.execute_query(
-            "INSERT INTO contact_messages (user_id, name, email, message, timestamp) VALUES (?, ?, ?, ?, ?)",
-            (user_id, name, email, message, timestamp)
-        )
-
-        if success:
-            messagebox.showinfo("Success", "Your message has been sent!")
-            self.clear_fields()
-        else:
-            messagebox.showerror("Error", "Failed to send message. Please try again.")
+        messagebox.showinfo("Success", "Your message has been sent!")
+        self.clear_fields()
 
     def clear_fields(self):
         self.name_var.set("")
@@ -5,15 +5,27 @@ from utils.helpers import (
     GLOBAL_FONT, GLOBAL_FONT_BOLD, CART_ICON_PATH, USER_ICON_PATH, GRAY_TEXT,
     HEADER_FONT, PUP_GOLD
 )
+from utils.virtual_list import VirtualList
 import os
 
+SEARCH_DEBOUNCE_MS = 250
+SEARCH_RESULT_LIMIT = 50
+PRODUCT_PAGE_SIZE = 40
+LOAD_MORE_ROWS = 10 # Fetch the next page once the view is this close to the last loaded product
+PRODUCT_ROW_HEIGHT = 78 # 60px image + padding, borders and the gap between rows
+PRODUCT_NAME_WIDTH = 120 # Names are pre-wrapped to this width and cut to PRODUCT_NAME_LINES so rows keep their height
+PRODUCT_NAME_LINES = 2
+
 class HomeScreen(tk.Frame):
     def __init__(self, parent, controller):
         tk.Frame.__init__(self, parent, bg=WHITE_BG) # Make screen background uniformly white
         self.controller = controller
-        self.db = self.controller.get_db()
+        self.services = self.controller.get_services() # Runs the catalog calls on its worker threads
+        self.catalog = self.services.catalog
+        self.cart = self.services.cart
 
-        self.product_list_window_id = None
+        self.products_job = None
+        self.next_page_token = None
 
         # --- Top Bar (Icons) ---
         top_bar_frame = tk.Frame(self, bg=WHITE_BG) # Changed to WHITE_BG
@@ -55,20 +67,23 @@ class HomeScreen(tk.Frame):
         tk.Label(self.study_with_style_frame, text="StudywithStyle", font=GLOBAL_FONT_BOLD, fg=PUP_RED, bg=WHITE_BG).pack(side="left") # Changed to WHITE_BG
 
 
-        # --- Product List (using a scrollable canvas) ---
-        self.product_canvas = tk.Canvas(main_content_area, bg=WHITE_BG, highlightthickness=0) # Changed to WHITE_BG, child of main_content_area
-        self.product_canvas.pack(side="top", fill="both", expand=True, padx=10, pady=5) # Ensure it takes top portion of main_content_area
-
-        self.product_scrollbar = tk.Scrollbar(self.product_canvas, orient="vertical", command=self.product_canvas.yview) # Scrollbar is child of canvas
-        self.product_scrollbar.pack(side="right", fill="y")
-
-        self.product_canvas.configure(yscrollcommand=self.product_scrollbar.set)
-        self.product_canvas.bind('<Configure>', self._on_canvas_configure)
-
-        self.product_list_frame = tk.Frame(self.product_canvas, bg=WHITE_BG) # Changed to WHITE_BG
-        self.product_list_window_id = self.product_canvas.create_window(0, 0, window=self.product_list_frame, anchor="nw")
-
-        self.load_products()
+        # --- Search Bar ---
+        search_frame = tk.Frame(main_content_area, bg=WHITE_BG)
+        search_frame.pack(fill="x", padx=10, pady=(0, 3))
+        tk.Label(search_frame, text="Search:", font=GLOBAL_FONT_BOLD, fg=PUP_RED, bg=WHITE_BG).pack(side="left", padx=(0, 5))
+        self.search_var = tk.StringVar()
+        self.search_entry = tk.Entry(search_frame, textvariable=self.search_var, font=GLOBAL_FONT, relief="solid", bd=1,
+                                     highlightbackground=PUP_GOLD, highlightthickness=1, bg="white", fg=GRAY_TEXT,
+                                     insertbackground=PUP_RED)
+        self.search_entry.pack(side="left", fill="x", expand=True)
+        self.search_after_id = None
+        self.search_var.trace_add("write", self._on_search_changed)
+
+        # --- Product List (virtualized: only the visible rows exist as widgets) ---
+        self.product_list = VirtualList(main_content_area, PRODUCT_ROW_HEIGHT, self._create_product_row, self._bind_product_row,
+                                        unbind_row=self._unbind_product_row, on_near_end=self.load_more_products,
+                                        near_end_rows=LOAD_MORE_ROWS)
+        self.product_list.pack(side="top", fill="both", expand=True, padx=10, pady=5) # Ensure it takes top portion of main_content_area
 
         # --- CHECK OUT Button ---
         main_content_area.update_idletasks() # Force update to compute accurate main_content_area height
@@ -81,74 +96,118 @@ class HomeScreen(tk.Frame):
                                          command=self.go_to_checkout)
         self.checkout_button.pack(pady=5)
 
-    def _on_canvas_configure(self, event):
-        self.product_canvas.configure(scrollregion=self.product_canvas.bbox("all"))
-        canvas_width = event.width
-        if self.product_list_window_id is not None:
-            self.product_canvas.itemconfig(self.product_list_window_id, width=canvas_width)
-
     def load_products(self):
-        for widget in self.product_list_frame.winfo_children():
-            widget.destroy()
+        if self.products_job is not None:
+            self.products_job.cancel()
+
+        self.product_list.set_items([], message="Loading products...")
+
+        self.next_page_token = None
+        self.products_job = self.services.submit_call(self.catalog.list_page, (None, PRODUCT_PAGE_SIZE),
+                                                      on_done=self._on_products_page, on_error=self._on_products_error)
+
+    def load_more_products(self):
+        if self.products_job is not None or self.next_page_token is None:
+            return
+        self.products_job = self.services.submit_call(self.catalog.list_page, (self.next_page_token, PRODUCT_PAGE_SIZE),
+                                                      on_done=self._on_products_page, on_error=self._on_products_error)
+
+    def _on_products_page(self, page):
+        first_page = self.next_page_token is None
+        self.next_page_token = page.next_token
+        if first_page:
+            self._render_products(page.rows)
+        else:
+            self.products_job = None
+            self.product_list.append_items(page.rows)
+
+    def _on_products_error(self, error):
+        print(f"Error loading products: {error}")
+        self.products_job = None
+        if self.next_page_token is None: # The first page or a search; a failed next page keeps the rows shown
+            self.product_list.set_items([], message="Could not load products.")
+
+    def _on_search_changed(self, *args):
+        # Debounce: only query once the shopper pauses typing.
+        if self.search_after_id is not None:
+            self.after_cancel(self.search_after_id)
+        self.search_after_id = self.after(SEARCH_DEBOUNCE_MS, self.run_search)
+
+    def run_search(self):
+        self.search_after_id = None
+        text = self.search_var.get().strip()
+        if not text:
+            self.load_products()
+            return
+
+        if self.products_job is not None:
+            self.products_job.cancel()
+        self.next_page_token = None # Search results are ranked and limited, not paged
+        self.products_job = self.services.submit_call(self.catalog.search, (text, SEARCH_RESULT_LIMIT),
+                                                      on_done=self._render_products, on_error=self._on_products_error)
+
+    def _render_products(self, products):
+        self.products_job = None
+        self.product_list.set_items(products, message="No products found.")
+
+    # --- Product rows (built once, then recycled by the VirtualList as it scrolls) ---
+    def _create_product_row(self, parent):
+        product_frame = tk.Frame(parent, bg=WHITE_BG, bd=1, relief="solid", highlightbackground=BORDER_COLOR, highlightthickness=1)
 
-        products = self.db.fetch_all("SELECT id, name, price, image_path, sales_count FROM products ORDER BY name")
+        left_section = tk.Frame(product_frame, bg=WHITE_BG)
+        left_section.pack(side="left", padx=3, pady=3)
 
-        for product in products:
-            product_id, name, price, image_path, sales_count = product
-            product_image_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'assets', 'images', image_path)
-            
-            product_frame = tk.Frame(self.product_list_frame, bg=WHITE_BG, bd=1, relief="solid", highlightbackground=BORDER_COLOR, highlightthickness=1)
-            product_frame.pack(fill="x", pady=3, padx=3)
+        # Decoded off the Tk thread; a grey placeholder shows until the image is ready
+        product_frame.image_label = tk.Label(left_section, font=GLOBAL_FONT, bg=WHITE_BG)
+        product_frame.image_label.pack(side="left", padx=3)
 
-            left_section = tk.Frame(product_frame, bg=WHITE_BG)
-            left_section.pack(side="left", padx=3, pady=3)
+        details_section = tk.Frame(product_frame, bg=WHITE_BG)
+        details_section.pack(side="left", fill="x", expand=True, padx=3)
 
-            img = load_image(product_image_path, (60, 60))
-            if img:
-                img_label = tk.Label(left_section, image=img, bg=WHITE_BG)
-                img_label.image = img
-                img_label.pack(side="left", padx=3)
-            else:
-                tk.Label(left_section, text="[No Image]", font=GLOBAL_FONT, bg=WHITE_BG).pack(side="left", padx=3)
+        product_frame.name_label = tk.Label(details_section, font=GLOBAL_FONT_BOLD, fg=GRAY_TEXT, bg=WHITE_BG, justify="left")
+        product_frame.name_label.pack(anchor="w")
+        product_frame.price_label = tk.Label(details_section, font=GLOBAL_FONT, fg=PUP_RED, bg=WHITE_BG)
+        product_frame.price_label.pack(anchor="w", pady=(1,0))
 
-            details_section = tk.Frame(product_frame, bg=WHITE_BG)
-            details_section.pack(side="left", fill="x", expand=True, padx=3)
+        quantity_control_frame = tk.Frame(product_frame, bg=WHITE_BG)
+        quantity_control_frame.pack(side="right", padx=3, pady=3)
 
-            tk.Label(details_section, text=name, font=GLOBAL_FONT_BOLD, fg=GRAY_TEXT, bg=WHITE_BG, wraplength=120, justify="left").pack(anchor="w")
-            tk.Label(details_section, text=f"P{price:.2f}", font=GLOBAL_FONT, fg=PUP_RED, bg=WHITE_BG).pack(anchor="w", pady=(1,0))
+        product_frame.quantity_label = tk.Label(quantity_control_frame, font=GLOBAL_FONT_BOLD, bg=WHITE_BG, fg=PUP_RED)
+        product_frame.quantity_label.pack(side="right", padx=1) # Reduced padx
 
-            quantity_control_frame = tk.Frame(product_frame, bg=WHITE_BG)
-            quantity_control_frame.pack(side="right", padx=3, pady=3)
+        add_button = tk.Button(quantity_control_frame, text="+", font=GLOBAL_FONT_BOLD, fg="white", bg=PUP_RED,
+                               activebackground=PUP_RED, activeforeground="white", bd=0, relief="flat", width=2, height=1, # Added width/height
+                               command=lambda row=product_frame: self.add_item_to_cart_and_refresh(row.product_id, row.quantity_label))
+        add_button.pack(side="right")
 
-            current_quantity = self.controller.get_cart().get(product_id, 0)
-            quantity_label = tk.Label(quantity_control_frame, text=f"{current_quantity}", font=GLOBAL_FONT_BOLD, bg=WHITE_BG, fg=PUP_RED)
-            quantity_label.pack(side="right", padx=1) # Reduced padx
+        # The row is reused for other products, so clicks look up whichever product it shows now
+        product_frame.bind("<Button-1>", lambda e, row=product_frame: self.go_to_product_detail(row.product_id))
+        for child in product_frame.winfo_children():
+            child.bind("<Button-1>", lambda e, row=product_frame: self.go_to_product_detail(row.product_id))
+        return product_frame
 
-            add_button = tk.Button(quantity_control_frame, text="+", font=GLOBAL_FONT_BOLD, fg="white", bg=PUP_RED,
-                                   activebackground=PUP_RED, activeforeground="white", bd=0, relief="flat", width=2, height=1, # Added width/height
-                                   command=lambda p_id=product_id, q_label=quantity_label: self.add_item_to_cart_and_refresh(p_id, q_label))
-            add_button.pack(side="right")
-            
-            product_frame.bind("<Button-1>", lambda e, p_id=product_id: self.go_to_product_detail(p_id))
-            for child in product_frame.winfo_children():
-                child.bind("<Button-1>", lambda e, p_id=product_id: self.go_to_product_detail(p_id))
+    def _bind_product_row(self, row, product, index):
+        product_id, name, price, image_path, sales_count = product
+        product_image_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'assets', 'images', image_path)
 
-        # --- Scrolling Fix: Force update and trigger configure event after content loads ---
-        self.product_list_frame.update_idletasks() # Force geometry calculations
-        self.product_canvas.config(scrollregion=self.product_canvas.bbox("all")) # Set scrollregion based on content
-        # No need for event_generate here, as bbox("all") implies updates.
+        row.product_id = product_id
+        row.name_label.config(text=self.controller.fonts.wrap(name, GLOBAL_FONT_BOLD, PRODUCT_NAME_WIDTH, PRODUCT_NAME_LINES))
+        row.price_label.config(text=f"P{price:.2f}")
+        row.quantity_label.config(text=f"{self.cart.quantity(product_id)}")
+        self.controller.image_loader.load_into(row.image_label, product_image_path, (60, 60))
 
+    def _unbind_product_row(self, row):
+        self.controller.image_loader.cancel(row.image_label)
 
     def add_item_to_cart_and_refresh(self, product_id, quantity_label):
         self.controller.add_to_cart(product_id, 1)
-        current_quantity = self.controller.get_cart().get(product_id, 0)
-        quantity_label.config(text=f"{current_quantity}")
+        quantity_label.config(text=f"{self.cart.quantity(product_id)}")
 
     def go_to_product_detail(self, product_id):
         self.controller.show_frame("ProductDetailScreen", product_id=product_id)
 
     def go_to_checkout(self):
-        if not self.controller.get_cart():
+        if self.cart.is_empty():
             messagebox.showwarning("Checkout", "Your shopping cart is empty!")
             return
         self.controller.show_frame("CheckoutScreen")
\ No newline at end of file
@@ -1,17 +1,24 @@
 import tkinter as tk
 from tkinter import messagebox
 from tkinter import ttk # For Treeview
+from services import ServiceError
 from utils.helpers import (
     load_image, PUP_RED, PUP_GOLD, LIGHT_BG, WHITE_BG, GLOBAL_FONT, GLOBAL_FONT_BOLD,
     TITLE_FONT, HEADER_FONT, BORDER_COLOR, CART_ICON_PATH, USER_ICON_PATH, GRAY_TEXT
 )
 import os
 
+INVENTORY_PAGE_SIZE = 100
+LOAD_MORE_AT = 0.9 # Fetch the next page once the bottom of the view passes 90% of the list
+
 class InventoryManagementScreen(tk.Frame):
     def __init__(self, parent, controller):
         tk.Frame.__init__(self, parent, bg=WHITE_BG) # Make screen background uniformly white
         self.controller = controller
-        self.db = self.controller.get_db()
+        self.services = self.controller.get_services() # Runs the inventory queries on its worker threads
+        self.catalog = self.services.catalog
+        self.products_job = None
+        self.next_page_token = None
 
         # --- Variables ---
         self.item_id_var = tk.StringVar()
@@ -106,20 +113,42 @@ class InventoryManagementScreen(tk.Frame):
 
         tree_scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.inventory_tree.yview)
         tree_scrollbar.pack(side="right", fill="y", padx=(0,10))
-        self.inventory_tree.configure(yscrollcommand=tree_scrollbar.set)
+        self.tree_scrollbar = tree_scrollbar
+        self.inventory_tree.configure(yscrollcommand=self._on_tree_scrolled)
         
         self.inventory_tree.bind("<<TreeviewSelect>>", self.on_item_select)
 
-        self.load_products()
 
     def load_products(self):
-        for i in self.inventory_tree.get_children():
-            i.delete(i) # Fix from 'i' to 'self.inventory_tree.delete(i)'
+        if self.products_job is not None:
+            self.products_job.cancel()
+
+        self.inventory_tree.delete(*self.inventory_tree.get_children())
+        self.inventory_tree.insert("", "end", values=("", "Loading...", "", ""))
 
-        products = self.db.fetch_all("SELECT id, name, stock_quantity, price FROM products ORDER BY id")
-        for prod in products:
+        self.next_page_token = None
+        self.products_job = self.services.submit_call(self.catalog.inventory_page, (None, INVENTORY_PAGE_SIZE),
+                                                      on_done=self._on_products_page)
+
+    def load_more_products(self):
+        if self.products_job is not None or self.next_page_token is None:
+            return
+        self.products_job = self.services.submit_call(self.catalog.inventory_page, (self.next_page_token, INVENTORY_PAGE_SIZE),
+                                                      on_done=self._on_products_page)
+
+    def _on_products_page(self, page):
+        if self.next_page_token is None:
+            self.inventory_tree.delete(*self.inventory_tree.get_children())
+        self.products_job = None
+        self.next_page_token = page.next_token
+        for prod in page.rows:
             self.inventory_tree.insert("", "end", values=prod)
 
+    def _on_tree_scrolled(self, first, last):
+        self.tree_scrollbar.set(first, last)
+        if float(last) >= LOAD_MORE_AT:
+            self.load_more_products()
+
     def on_item_select(self, event):
         selected_item = self.inventory_tree.selection()
         if not selected_item:
@@ -140,33 +169,15 @@ class InventoryManagementScreen(tk.Frame):
         self.inventory_tree.selection_remove(self.inventory_tree.selection())
 
     def add_item(self):
-        name = self.item_name_var.get().strip()
-        quantity = self.quantity_var.get().strip()
-        price = self.price_var.get().strip()
-
-        if not name or not quantity or not price:
-            messagebox.showerror("Error", "Name, Quantity, and Price are required.")
-            return
-        
         try:
-            quantity = int(quantity)
-            price = float(price)
-            if quantity < 0 or price < 0:
-                raise ValueError("Values cannot be negative.")
-        except ValueError:
-            messagebox.showerror("Error", "Quantity must be an integer and Price must be a number.")
+            self.catalog.add_product(self.item_name_var.get(), self.quantity_var.get(), self.price_var.get())
+        except ServiceError as e:
+            messagebox.showerror("Error", str(e))
             return
-        
-        success = self.db.execute_query(
-            "INSERT INTO products (name, stock_quantity, price) VALUES (?, ?, ?)",
-            (name, quantity, price)
-        )
-        if success:
-            messagebox.showinfo("Success", "Item added successfully.")
-            self.load_products()
-            self.clear_fields()
-        else:
-            messagebox.showerror("Error", "Failed to add item.")
+
+        messagebox.showinfo("Success", "Item added successfully.")
+        self.load_products()
+        self.clear_fields()
 
     def view_item(self):
         selected_item = self.inventory_tree.selection()
@@ -175,35 +186,16 @@ class InventoryManagementScreen(tk.Frame):
             return
 
     def update_item(self):
-        item_id = self.item_id_var.get().strip()
-        name = self.item_name_var.get().strip()
-        quantity = self.quantity_var.get().strip()
-        price = self.price_var.get().strip()
-
-        if not item_id or not name or not quantity or not price:
-            messagebox.showerror("Error", "All fields are required for update.")
-            return
-
         try:
-            item_id = int(item_id)
-            quantity = int(quantity)
-            price = float(price)
-            if quantity < 0 or price < 0:
-                raise ValueError("Values cannot be negative.")
-        except ValueError:
-            messagebox.showerror("Error", "ID, Quantity, and Price must be valid numbers.")
+            self.catalog.update_product(self.item_id_var.get(), self.item_name_var.get(),
+                                        self.quantity_var.get(), self.price_var.get())
+        except ServiceError as e:
+            messagebox.showerror("Error", str(e))
             return
 
-        success = self.db.execute_query(
-            "UPDATE products SET name = ?, stock_quantity = ?, price = ? WHERE id = ?",
-            (name, quantity, price, item_id)
-        )
-        if success:
-            messagebox.showinfo("Success", "Item updated successfully.")
-            self.load_products()
-            self.clear_fields()
-        else:
-            messagebox.showerror("Error", "Failed to update item.")
+        messagebox.showinfo("Success", "Item updated successfully.")
+        self.load_products()
+        self.clear_fields()
 
     def delete_item(self):
         item_id = self.item_id_var.get().strip()
@@ -215,10 +207,12 @@ class InventoryManagementScreen(tk.Frame):
         if not confirm:
             return
 
-        success = self.db.execute_query("DELETE FROM products WHERE id = ?", (int(item_id),))
-        if success:
-            messagebox.showinfo("Success", "Item deleted successfully.")
-            self.load_products()
-            self.clear_fields()
-        else:
-            messagebox.showerror("Error", "Failed to delete item.")
\ No newline at end of file
+        try:
+            self.catalog.delete_product(item_id)
+        except ServiceError as e:
+            messagebox.showerror("Error", str(e))
+            return
+
+        messagebox.showinfo("Success", "Item deleted successfully.")
+        self.load_products()
+        self.clear_fields()
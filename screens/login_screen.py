@@ -1,7 +1,8 @@
 import tkinter as tk
 from tkinter import messagebox
+from services import ServiceError
 from utils.helpers import (
-    check_password, load_image, PUP_RED, PUP_GOLD, BUTTON_BLUE_LIGHT, BUTTON_BLUE_DARK,
+    load_image, PUP_RED, PUP_GOLD, BUTTON_BLUE_LIGHT, BUTTON_BLUE_DARK,
     LIGHT_BG, WHITE_BG, GRAY_TEXT, HEADER_FONT, TITLE_FONT, GLOBAL_FONT, BUTTON_FONT,
     PUP_LOGO_PATH, create_styled_button, create_rounded_entry_field
 )
@@ -9,7 +10,7 @@ class LoginScreen(tk.Frame):
     def __init__(self, parent, controller):
         tk.Frame.__init__(self, parent, bg=WHITE_BG) # Make screen background uniformly white
         self.controller = controller
-        self.db = self.controller.get_db()
+        self.auth = self.controller.get_services().auth
 
         # --- Variables ---
         self.email_var = tk.StringVar()
@@ -38,26 +39,16 @@ class LoginScreen(tk.Frame):
         self.register_button_canvas.pack(pady=5)
 
     def login_user(self):
-        email = self.email_var.get().strip()
-        password = self.password_var.get()
-
-        if not email or not password:
-            messagebox.showerror("Login Error", "Email and Password are required.")
+        try:
+            user = self.auth.login(self.email_var.get(), self.password_var.get())
+        except ServiceError as e:
+            messagebox.showerror("Login Error", str(e))
             return
 
-        user_data = self.db.fetch_one("SELECT id, name, password FROM users WHERE email = ?", (email,))
-
-        if user_data:
-            user_id, name, hashed_password = user_data
-            if check_password(password, hashed_password):
-                messagebox.showinfo("Login Success", f"Welcome, {name}!")
-                self.controller.set_current_user(user_id)
-                self.controller.show_frame("HomeScreen")
-                self.clear_fields()
-            else:
-                messagebox.showerror("Login Error", "Invalid email or password.")
-        else:
-            messagebox.showerror("Login Error", "Invalid email or password.")
+        messagebox.showinfo("Login Success", f"Welcome, {user.name}!")
+        self.controller.set_current_user(user.id)
+        self.controller.show_frame("HomeScreen")
+        self.clear_fields()
 
     def go_to_register(self):
         self.controller.show_frame("RegisterScreen")
@@ -5,13 +5,23 @@ from utils.helpers import (
     TITLE_FONT, HEADER_FONT, BORDER_COLOR, CART_ICON_PATH, USER_ICON_PATH, GRAY_TEXT,
     create_rounded_rectangle
 )
+from utils.reconcile import KeyedRows
+from utils.render_scheduler import ChunkedRenderer
+
+ORDER_PAGE_SIZE = 30
+LOAD_MORE_AT = 0.9 # Fetch the next page once the bottom of the view passes 90% of the list
+
 class OrderHistoryScreen(tk.Frame):
     def __init__(self, parent, controller):
         tk.Frame.__init__(self, parent, bg=WHITE_BG) # Make screen background uniformly white
         self.controller = controller
-        self.db = self.controller.get_db()
+        self.services = self.controller.get_services() # Runs the order queries on its worker threads
+        self.checkout = self.services.checkout
 
         self.order_list_window_id = None
+        self.orders_job = None
+        self.orders_user_id = None
+        self.next_page_token = None
 
         # --- Top Bar (Icons) ---
         top_bar_frame = tk.Frame(self, bg=WHITE_BG) # Changed to WHITE_BG
@@ -59,13 +69,19 @@ class OrderHistoryScreen(tk.Frame):
         self.order_scrollbar = tk.Scrollbar(self.order_canvas, orient="vertical", command=self.order_canvas.yview) # Scrollbar is child of canvas
         self.order_scrollbar.pack(side="right", fill="y")
 
-        self.order_canvas.configure(yscrollcommand=self.order_scrollbar.set)
+        self.order_canvas.configure(yscrollcommand=self._on_orders_scrolled)
         self.order_canvas.bind('<Configure>', self._on_canvas_configure)
 
         self.order_list_frame = tk.Frame(self.order_canvas, bg=WHITE_BG) # Changed to WHITE_BG
         self.order_list_window_id = self.order_canvas.create_window(0, 0, window=self.order_list_frame, anchor="nw")
+        # The scrollregion follows the frame as rows are added, without forcing idle work per chunk
+        self.order_list_frame.bind("<Configure>", self._update_scrollregion)
+
+        # Rows keyed by order id; a refresh only touches orders that are new or changed (e.g. status).
+        # They are built a chunk per idle slot, so a long history never freezes the screen.
+        self.order_rows = KeyedRows(self.order_list_frame, self._create_order_row, self._update_order_row,
+                                    empty_text="No orders found.", renderer=ChunkedRenderer(self.order_list_frame))
 
-        self.load_orders()
 
     def _on_canvas_configure(self, event):
         self.order_canvas.configure(scrollregion=self.order_canvas.bbox("all"))
@@ -80,31 +96,73 @@ class OrderHistoryScreen(tk.Frame):
             self.controller.show_frame("LoginScreen")
             return
 
-        for widget in self.order_list_frame.winfo_children():
-            widget.destroy()
+        if self.orders_job is not None:
+            self.orders_job.cancel()
 
-        orders = self.db.fetch_all("SELECT id, order_date, total_amount, status FROM orders WHERE user_id = ? ORDER BY order_date DESC", (user_id,))
+        if user_id != self.orders_user_id:
+            self.order_rows.clear() # Never show the previous shopper's orders while loading
+        if not self.order_rows.order:
+            self.order_rows.show_message("Loading orders...")
 
-        if not orders:
-            tk.Label(self.order_list_frame, text="No orders found.", font=GLOBAL_FONT_BOLD, fg=GRAY_TEXT, bg=WHITE_BG).pack(pady=50) # Changed to WHITE_BG
-            return
+        self.orders_user_id = user_id
+        self.next_page_token = None
+        self.orders_job = self.services.submit_call(self.checkout.order_page, (user_id, None, ORDER_PAGE_SIZE),
+                                                    on_done=self._on_orders_page, on_error=self._on_orders_error)
 
-        for order in orders:
-            order_id, order_date, total_amount, status = order
-            total_quantity = self.db.fetch_one("SELECT SUM(quantity) FROM order_items WHERE order_id = ?", (order_id,))[0] or 0
+    def load_more_orders(self):
+        if self.orders_job is not None or self.next_page_token is None:
+            return
+        self.orders_job = self.services.submit_call(self.checkout.order_page,
+                                                    (self.orders_user_id, self.next_page_token, ORDER_PAGE_SIZE),
+                                                    on_done=self._on_orders_page, on_error=self._on_orders_error)
+
+    def _on_orders_page(self, page):
+        first_page = self.next_page_token is None
+        self.next_page_token = page.next_token
+        if first_page:
+            self._render_orders(page.rows)
+        else:
+            self.orders_job = None
+            self._append_orders(page.rows)
+
+    def _on_orders_error(self, error):
+        print(f"Error loading orders: {error}")
+        self.orders_job = None
+        if self.next_page_token is None: # A failed next page keeps the rows shown; scrolling retries it
+            self.order_rows.show_message("Could not load orders.")
+
+    def _on_orders_scrolled(self, first, last):
+        self.order_scrollbar.set(first, last)
+        if float(last) >= LOAD_MORE_AT:
+            self.load_more_orders()
+
+    def _render_orders(self, orders):
+        self.orders_job = None
+        self.order_rows.render(orders)
+
+    def _append_orders(self, orders):
+        self.order_rows.extend(orders)
+
+    def on_hide(self):
+        self.order_rows.cancel_render() # Picked up again by load_orders() on the next visit
+
+    def _update_scrollregion(self, event=None):
+        self.order_canvas.config(scrollregion=self.order_canvas.bbox("all"))
 
-            order_frame = tk.Frame(self.order_list_frame, bg=WHITE_BG, bd=1, relief="solid", highlightbackground=BORDER_COLOR, highlightthickness=1)
-            order_frame.pack(fill="x", pady=3, padx=3)
+    def _create_order_row(self, parent, order):
+        order_frame = tk.Frame(parent, bg=WHITE_BG, bd=1, relief="solid", highlightbackground=BORDER_COLOR, highlightthickness=1)
+        order_frame.labels = []
+        for _ in range(4):
+            label = tk.Label(order_frame, font=GLOBAL_FONT, fg=GRAY_TEXT, bg=WHITE_BG)
+            label.pack(side="left", expand=True)
+            order_frame.labels.append(label)
+        self._update_order_row(order_frame, order)
+        return order_frame
+
+    def _update_order_row(self, order_frame, order):
+        order_id, status, total_quantity, total_amount = order
+        for label, text in zip(order_frame.labels, (order_id, status, total_quantity, f"P{total_amount:.2f}")):
+            label.config(text=text)
 
-            tk.Label(order_frame, text=order_id, font=GLOBAL_FONT, fg=GRAY_TEXT, bg=WHITE_BG).pack(side="left", expand=True)
-            tk.Label(order_frame, text=status, font=GLOBAL_FONT, fg=GRAY_TEXT, bg=WHITE_BG).pack(side="left", expand=True)
-            tk.Label(order_frame, text=total_quantity, font=GLOBAL_FONT, fg=GRAY_TEXT, bg=WHITE_BG).pack(side="left", expand=True)
-            tk.Label(order_frame, text=f"P{total_amount:.2f}", font=GLOBAL_FONT, fg=GRAY_TEXT, bg=WHITE_BG).pack(side="left", expand=True)
-            
-        # Scrolling Fix: Force update and trigger configure event after content loads
-        self.order_list_frame.update_idletasks()
-        self.order_canvas.config(scrollregion=self.order_canvas.bbox("all"))
-        # No need for event_generate here as bbox("all") updates scrollregion.
-            
     def view_order_details(self, order_id):
         messagebox.showinfo("Order Details", f"Viewing details for Order ID: {order_id}")
\ No newline at end of file
@@ -1,9 +1,10 @@
 import tkinter as tk
 from tkinter import messagebox
+from services import ServiceError
 from utils.helpers import (
     load_image, PUP_RED, PUP_GOLD, LIGHT_BG, WHITE_BG, GLOBAL_FONT, GLOBAL_FONT_BOLD,
     TITLE_FONT, HEADER_FONT, ADD_TO_CART_BTN_PATH, BUY_NOW_BTN_PATH, BORDER_COLOR,
-    CART_ICON_PATH, USER_ICON_PATH, GRAY_TEXT
+    CART_ICON_PATH, USER_ICON_PATH, GRAY_TEXT, FALLBACK_FONT_FAMILY
 )
 import os
 
@@ -11,7 +12,7 @@ class ProductDetailScreen(tk.Frame):
     def __init__(self, parent, controller):
         tk.Frame.__init__(self, parent, bg=WHITE_BG) # Make screen background uniformly white
         self.controller = controller
-        self.db = self.controller.get_db()
+        self.catalog = self.controller.get_services().catalog
         self.current_product = None
 
         # --- Top Bar (Icons) ---
@@ -38,7 +39,6 @@ class ProductDetailScreen(tk.Frame):
 
 
         # --- Product Image ---
-        self.product_display_image = None
         self.product_image_label = tk.Label(self, bg=WHITE_BG) # Changed to WHITE_BG
         self.product_image_label.pack(pady=5)
 
@@ -87,7 +87,7 @@ class ProductDetailScreen(tk.Frame):
         rating_frame.pack(fill="x", padx=15, pady=(0, 10))
 
         tk.Label(rating_frame, text="4.9", font=GLOBAL_FONT_BOLD, fg=PUP_RED, bg=WHITE_BG).pack(side="left") # Changed to WHITE_BG
-        tk.Label(rating_frame, text="★", font=(GLOBAL_FONT[0], 12), fg=PUP_GOLD, bg=WHITE_BG).pack(side="left", padx=(0, 3)) # Changed to WHITE_BG
+        tk.Label(rating_frame, text="★", font=(FALLBACK_FONT_FAMILY, 12), fg=PUP_GOLD, bg=WHITE_BG).pack(side="left", padx=(0, 3)) # Changed to WHITE_BG
         self.rating_text_label = tk.Label(rating_frame, text="Product rating (100)", font=GLOBAL_FONT, fg=GRAY_TEXT, bg=WHITE_BG) # Changed to WHITE_BG
         self.rating_text_label.pack(side="left")
 
@@ -114,29 +114,20 @@ class ProductDetailScreen(tk.Frame):
 
 
     def load_product(self, product_id):
-        product_data = self.db.fetch_one("SELECT id, name, price, image_path, sales_count, description, rating FROM products WHERE id = ?", (product_id,))
-        if product_data:
-            self.current_product = {
-                "id": product_data[0],
-                "name": product_data[1],
-                "price": product_data[2],
-                "image_path": product_data[3],
-                "sales_count": product_data[4],
-                "description": product_data[5],
-                "rating": product_data[6]
-            }
-            self.price_label.config(text=f"P{self.current_product['price']:.2f}")
-            self.sold_label.config(text=f"{self.current_product['sales_count']} sold")
-            self.name_label.config(text=self.current_product['name'])
-            self.rating_text_label.config(text=f"Product rating ({int(self.current_product['rating']*20)} ratings)")
-
-            product_image_full_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'assets', 'images', self.current_product['image_path'])
-            self.product_display_image = load_image(product_image_full_path, (180, 180))
-            self.product_image_label.config(image=self.product_display_image)
-            self.product_image_label.image = self.product_display_image
-        else:
-            messagebox.showerror("Error", "Product not found!")
+        try:
+            self.current_product = self.catalog.product(product_id)
+        except ServiceError as e:
+            messagebox.showerror("Error", str(e))
             self.controller.show_frame("HomeScreen")
+            return
+
+        self.price_label.config(text=f"P{self.current_product['price']:.2f}")
+        self.sold_label.config(text=f"{self.current_product['sales_count']} sold")
+        self.name_label.config(text=self.current_product['name'])
+        self.rating_text_label.config(text=f"Product rating ({int(self.current_product['rating']*20)} ratings)")
+
+        product_image_full_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'assets', 'images', self.current_product['image_path'])
+        self.controller.image_loader.load_into(self.product_image_label, product_image_full_path, (180, 180))
 
     def add_to_cart_action(self):
         if self.current_product:
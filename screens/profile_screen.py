@@ -1,5 +1,6 @@
 import tkinter as tk
 from tkinter import messagebox
+from services import ServiceError
 from utils.helpers import (
     load_image, PUP_RED, PUP_GOLD, LIGHT_BG, WHITE_BG, GLOBAL_FONT, GLOBAL_FONT_BOLD,
     TITLE_FONT, HEADER_FONT, BORDER_COLOR, USER_ICON_PATH, CART_ICON_PATH, GRAY_TEXT,
@@ -10,7 +11,7 @@ class ProfileScreen(tk.Frame):
     def __init__(self, parent, controller):
         tk.Frame.__init__(self, parent, bg=WHITE_BG) # Make screen background uniformly white
         self.controller = controller
-        self.db = self.controller.get_db()
+        self.accounts = self.controller.get_services().accounts
 
         # --- Variables for Address fields ---
         self.address1_line_var = tk.StringVar()
@@ -71,7 +72,6 @@ class ProfileScreen(tk.Frame):
                                               activebackground=PUP_RED, bd=0, relief="flat", command=lambda: self.save_address(2))
         self.save_address2_button.pack(pady=5)
 
-        self.load_addresses()
 
     def load_addresses(self):
         user_id = self.controller.get_current_user()
@@ -80,7 +80,7 @@ class ProfileScreen(tk.Frame):
             self.controller.show_frame("LoginScreen")
             return
 
-        addresses = self.db.fetch_all("SELECT id, address_line, contact_name, contact_no FROM addresses WHERE user_id = ? ORDER BY id ASC", (user_id,))
+        addresses = self.accounts.addresses(user_id)
         
         self.address1_line_var.set("")
         self.address1_name_var.set("")
@@ -107,36 +107,22 @@ class ProfileScreen(tk.Frame):
             return
 
         if address_num == 1:
-            address_line = self.address1_line_var.get().strip()
-            contact_name = self.address1_name_var.get().strip()
-            contact_no = self.address1_contact_var.get().strip()
+            address_line = self.address1_line_var.get()
+            contact_name = self.address1_name_var.get()
+            contact_no = self.address1_contact_var.get()
             address_id_to_update = getattr(self, 'address1_id', None)
         else:
-            address_line = self.address2_line_var.get().strip()
-            contact_name = self.address2_name_var.get().strip()
-            contact_no = self.address2_contact_var.get().strip()
+            address_line = self.address2_line_var.get()
+            contact_name = self.address2_name_var.get()
+            contact_no = self.address2_contact_var.get()
             address_id_to_update = getattr(self, 'address2_id', None)
         
-        if not address_line or not contact_name or not contact_no:
-            messagebox.showerror("Save Error", "All fields for the address must be filled.")
+        try:
+            action = self.accounts.save_address(user_id, address_id_to_update, address_line, contact_name, contact_no)
+        except ServiceError as e:
+            messagebox.showerror("Save Error", f"Address {address_num}: {e}")
             return
 
-        if address_id_to_update:
-            success = self.db.execute_query(
-                "UPDATE addresses SET address_line = ?, contact_name = ?, contact_no = ? WHERE id = ?",
-                (address_line, contact_name, contact_no, address_id_to_update)
-            )
-            action = "updated"
-        else:
-            success = self.db.execute_query(
-                "INSERT INTO addresses (user_id, address_line, contact_name, contact_no) VALUES (?, ?, ?, ?)",
-                (user_id, address_line, contact_name, contact_no)
-            )
-            if success:
-                self.load_addresses()
-            action = "added"
-
-        if success:
-            messagebox.showinfo("Success", f"Address {address_num} {action} successfully!")
-        else:
-            messagebox.showerror("Error", f"Failed to {action} address {address_num}.")
\ No newline at end of file
+        if action == "added":
+            self.load_addresses() # Picks up the new address id, so the next save updates it
+        messagebox.showinfo("Success", f"Address {address_num} {action} successfully!")
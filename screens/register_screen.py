@@ -1,7 +1,8 @@
 import tkinter as tk
 from tkinter import messagebox
+from services import ServiceError
 from utils.helpers import (
-    hash_password, load_image, PUP_RED, PUP_GOLD, BUTTON_BLUE_LIGHT, BUTTON_BLUE_DARK,
+    load_image, PUP_RED, PUP_GOLD, BUTTON_BLUE_LIGHT, BUTTON_BLUE_DARK,
     LIGHT_BG, WHITE_BG, GRAY_TEXT, HEADER_FONT, TITLE_FONT, GLOBAL_FONT, BUTTON_FONT,
     PUP_LOGO_PATH, create_styled_button, create_rounded_entry_field
 )
@@ -10,7 +11,7 @@ class RegisterScreen(tk.Frame):
     def __init__(self, parent, controller):
         tk.Frame.__init__(self, parent, bg=WHITE_BG) # Make screen background uniformly white
         self.controller = controller
-        self.db = self.controller.get_db()
+        self.auth = self.controller.get_services().auth
 
         # --- Variables ---
         self.name_var = tk.StringVar()
@@ -48,44 +49,16 @@ class RegisterScreen(tk.Frame):
         self.controller.show_frame("LoginScreen")
 
     def register_user(self):
-        name = self.name_var.get().strip()
-        email = self.email_var.get().strip()
-        password = self.password_var.get()
-        confirm_password = self.confirm_password_var.get()
-
-        if not name or not email or not password or not confirm_password:
-            messagebox.showerror("Registration Error", "All fields are required.")
-            return
-
-        if "@" not in email or "." not in email:
-            messagebox.showerror("Registration Error", "Please enter a valid email address.")
-            return
-
-        if password != confirm_password:
-            messagebox.showerror("Registration Error", "Passwords do not match.")
-            return
-
-        if len(password) < 6:
-            messagebox.showerror("Registration Error", "Password must be at least 6 characters long.")
-            return
-
-        hashed_password = hash_password(password)
-
-        if self.db.fetch_one("SELECT id FROM users WHERE email = ?", (email,)):
-            messagebox.showerror("Registration Error", "Email already registered. Please log in or use a different email.")
+        try:
+            self.auth.register(self.name_var.get(), self.email_var.get(),
+                               self.password_var.get(), self.confirm_password_var.get())
+        except ServiceError as e:
+            messagebox.showerror("Registration Error", str(e))
             return
 
-        success = self.db.execute_query(
-            "INSERT INTO users (name, email, password) VALUES (?, ?, ?)",
-            (name, email, hashed_password)
-        )
-
-        if success:
-            messagebox.showinfo("Registration Success", "Account created successfully! You can now log in.")
-            self.clear_fields()
-            self.controller.show_frame("LoginScreen")
-        else:
-            messagebox.showerror("Registration Error", "Failed to register. Please try again.")
+        messagebox.showinfo("Registration Success", "Account created successfully! You can now log in.")
+        self.clear_fields()
+        self.controller.show_frame("LoginScreen")
 
     def clear_fields(self):
         self.name_var.set("")
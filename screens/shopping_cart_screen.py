@@ -4,15 +4,22 @@ from utils.helpers import (
     load_image, PUP_RED, PUP_GOLD, LIGHT_BG, WHITE_BG, GLOBAL_FONT, GLOBAL_FONT_BOLD,
     TITLE_FONT, HEADER_FONT, BORDER_COLOR, CART_ICON_PATH, USER_ICON_PATH, GRAY_TEXT
 )
+from utils.reconcile import KeyedRows
+from utils.render_scheduler import ChunkedRenderer
 import os
 
+CART_NAME_WIDTH = 120 # Item names are pre-wrapped to this width, at most CART_NAME_LINES lines
+CART_NAME_LINES = 2
+
 class ShoppingCartScreen(tk.Frame):
     def __init__(self, parent, controller):
         tk.Frame.__init__(self, parent, bg=WHITE_BG) # Make screen background uniformly white
         self.controller = controller
-        self.db = self.controller.get_db()
+        self.services = self.controller.get_services()
+        self.cart = self.services.cart
 
         self.cart_list_window_id = None
+        self.cart_job = None # Pending background cart lookup
 
         # --- Top Bar (Icons) ---
         top_bar_frame = tk.Frame(self, bg=WHITE_BG) # Changed to WHITE_BG
@@ -56,10 +63,13 @@ class ShoppingCartScreen(tk.Frame):
 
         self.cart_items_frame = tk.Frame(self.cart_canvas, bg=WHITE_BG) # Changed to WHITE_BG
         self.cart_list_window_id = self.cart_canvas.create_window(0, 0, window=self.cart_items_frame, anchor="nw")
+        # The scrollregion follows the frame as rows are added or removed, without forcing idle work per chunk
+        self.cart_items_frame.bind("<Configure>", self._update_scrollregion)
 
-        self.cart_item_widgets = {}
+        # Rows keyed by product id; refreshes only touch rows whose product or quantity changed
+        self.cart_rows = KeyedRows(self.cart_items_frame, self._create_cart_row, self._update_cart_row,
+                                   empty_text="Your cart is empty!", renderer=ChunkedRenderer(self.cart_items_frame))
 
-        self.load_cart_items()
 
         # --- CHECK OUT Button ---
         main_content_area.update_idletasks() # Force update to compute accurate main_content_area height
@@ -79,101 +89,106 @@ class ShoppingCartScreen(tk.Frame):
             self.cart_canvas.itemconfig(self.cart_list_window_id, width=canvas_width)
 
     def load_cart_items(self):
-        for widget in self.cart_items_frame.winfo_children():
-            widget.destroy()
-        self.cart_item_widgets = {}
-
-        current_cart = self.controller.get_cart()
-        if not current_cart:
-            tk.Label(self.cart_items_frame, text="Your cart is empty!", font=GLOBAL_FONT_BOLD, fg=GRAY_TEXT, bg=WHITE_BG).pack(pady=50) # Changed to WHITE_BG
+        if self.cart_job is not None:
+            self.cart_job.cancel()
+        if not self.cart_rows.order:
+            self.cart_rows.show_message("Loading cart...")
+        # Names and prices are looked up off the Tk thread (an HTTP round trip in client mode)
+        items = dict(self.cart.items)
+        self.cart_job = self.services.submit_call(self.cart.lines, (items,),
+                                                  on_done=lambda lines: self._on_cart_lines(items, lines),
+                                                  on_error=self._on_cart_error)
+
+    def _on_cart_lines(self, items, lines):
+        self.cart_job = None
+        if items != self.cart.items: # Changed while the lookup ran; price the current cart instead
+            self.load_cart_items()
             return
+        self.cart_rows.render(lines) # Built a chunk per idle slot
+
+    def _on_cart_error(self, error):
+        print(f"Error loading cart: {error}")
+        self.cart_job = None
+        self.cart_rows.show_message("Could not load your cart.")
+
+    def on_hide(self):
+        if self.cart_job is not None:
+            self.cart_job.cancel()
+            self.cart_job = None
+        self.cart_rows.cancel_render()
 
-        product_ids = ",".join(map(str, current_cart.keys()))
-        products_in_cart = self.db.fetch_all(f"SELECT id, name, price, image_path FROM products WHERE id IN ({product_ids})")
-
-        for product in products_in_cart:
-            product_id, name, price, image_path = product
-            quantity = current_cart.get(product_id, 0)
-            if quantity == 0: continue
-
-            product_image_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'assets', 'images', image_path)
-            
-            item_frame = tk.Frame(self.cart_items_frame, bg=WHITE_BG, bd=1, relief="solid", highlightbackground=BORDER_COLOR, highlightthickness=1)
-            item_frame.pack(fill="x", pady=3, padx=3)
-
-            left_section = tk.Frame(item_frame, bg=WHITE_BG)
-            left_section.pack(side="left", padx=3, pady=3)
-
-            img = load_image(product_image_path, (60, 60)) # Reduced image size
-            if img:
-                img_label = tk.Label(left_section, image=img, bg=WHITE_BG)
-                img_label.image = img
-                img_label.pack(side="left", padx=3)
-            else:
-                tk.Label(left_section, text="[No Image]", font=GLOBAL_FONT, bg=WHITE_BG).pack(side="left", padx=3)
-
-            details_section = tk.Frame(item_frame, bg=WHITE_BG)
-            details_section.pack(side="left", fill="x", expand=True, padx=3)
-
-            tk.Label(details_section, text=name, font=GLOBAL_FONT_BOLD, fg=GRAY_TEXT, bg=WHITE_BG, wraplength=120, justify="left").pack(anchor="w") # Reduced wraplength
-            tk.Label(details_section, text=f"P{price:.2f}", font=GLOBAL_FONT, fg=PUP_RED, bg=WHITE_BG).pack(anchor="w", pady=(1,0))
-
-            quantity_control_frame = tk.Frame(item_frame, bg=WHITE_BG)
-            quantity_control_frame.pack(side="right", padx=3, pady=3)
-
-            # Quantity buttons (+/-) and label
-            minus_button = tk.Button(quantity_control_frame, text="-", font=GLOBAL_FONT_BOLD, fg="white", bg=PUP_RED, bd=0, relief="flat", width=2, height=1, # Added width/height
-                                     command=lambda p_id=product_id: self.update_quantity(p_id, -1))
-            minus_button.pack(side="left")
-
-            quantity_label = tk.Label(quantity_control_frame, text=f"{quantity}", font=GLOBAL_FONT_BOLD, bg=WHITE_BG, fg=PUP_RED)
-            quantity_label.pack(side="left", padx=1) # Reduced padx
-
-            plus_button = tk.Button(quantity_control_frame, text="+", font=GLOBAL_FONT_BOLD, fg="white", bg=PUP_RED, bd=0, relief="flat", width=2, height=1, # Added width/height
-                                    command=lambda p_id=product_id: self.update_quantity(p_id, 1))
-            plus_button.pack(side="left")
-
-            self.cart_item_widgets[product_id] = {
-                "frame": item_frame,
-                "quantity_label": quantity_label,
-                "image_label": img_label
-            }
-            
-            # The 'X' remove button (make it a square button like +/-)
-            remove_button = tk.Button(item_frame, text="X", font=GLOBAL_FONT_BOLD, fg="gray", bg=WHITE_BG, bd=0, relief="flat", width=2, height=1, # Added width/height
-                                      command=lambda p_id=product_id: self.remove_item(p_id))
-            remove_button.pack(side="right", padx=3, anchor="n")
-
-
-        # --- Scrolling Fix: Force update and trigger configure event after content loads ---
-        self.cart_items_frame.update_idletasks() # Force geometry calculations
+    def _update_scrollregion(self, event=None):
         self.cart_canvas.config(scrollregion=self.cart_canvas.bbox("all")) # Set scrollregion based on content
-        # No need for event_generate here, as bbox("all") implies updates.
 
+    def _create_cart_row(self, parent, item):
+        product_id = item[0]
+        item_frame = tk.Frame(parent, bg=WHITE_BG, bd=1, relief="solid", highlightbackground=BORDER_COLOR, highlightthickness=1)
+
+        left_section = tk.Frame(item_frame, bg=WHITE_BG)
+        left_section.pack(side="left", padx=3, pady=3)
+
+        item_frame.image_label = tk.Label(left_section, font=GLOBAL_FONT, bg=WHITE_BG)
+        item_frame.image_label.pack(side="left", padx=3)
+
+        details_section = tk.Frame(item_frame, bg=WHITE_BG)
+        details_section.pack(side="left", fill="x", expand=True, padx=3)
+
+        item_frame.name_label = tk.Label(details_section, font=GLOBAL_FONT_BOLD, fg=GRAY_TEXT, bg=WHITE_BG, justify="left")
+        item_frame.name_label.pack(anchor="w")
+        item_frame.price_label = tk.Label(details_section, font=GLOBAL_FONT, fg=PUP_RED, bg=WHITE_BG)
+        item_frame.price_label.pack(anchor="w", pady=(1,0))
+
+        quantity_control_frame = tk.Frame(item_frame, bg=WHITE_BG)
+        quantity_control_frame.pack(side="right", padx=3, pady=3)
+
+        # Quantity buttons (+/-) and label
+        minus_button = tk.Button(quantity_control_frame, text="-", font=GLOBAL_FONT_BOLD, fg="white", bg=PUP_RED, bd=0, relief="flat", width=2, height=1, # Added width/height
+                                 command=lambda p_id=product_id: self.update_quantity(p_id, -1))
+        minus_button.pack(side="left")
+
+        item_frame.quantity_label = tk.Label(quantity_control_frame, font=GLOBAL_FONT_BOLD, bg=WHITE_BG, fg=PUP_RED)
+        item_frame.quantity_label.pack(side="left", padx=1) # Reduced padx
+
+        plus_button = tk.Button(quantity_control_frame, text="+", font=GLOBAL_FONT_BOLD, fg="white", bg=PUP_RED, bd=0, relief="flat", width=2, height=1, # Added width/height
+                                command=lambda p_id=product_id: self.update_quantity(p_id, 1))
+        plus_button.pack(side="left")
+
+        # The 'X' remove button (make it a square button like +/-)
+        remove_button = tk.Button(item_frame, text="X", font=GLOBAL_FONT_BOLD, fg="gray", bg=WHITE_BG, bd=0, relief="flat", width=2, height=1, # Added width/height
+                                  command=lambda p_id=product_id: self.remove_item(p_id))
+        remove_button.pack(side="right", padx=3, anchor="n")
+
+        self._update_cart_row(item_frame, item)
+        return item_frame
+
+    def _update_cart_row(self, item_frame, item):
+        product_id, name, price, image_path, quantity = item
+        product_image_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'assets', 'images', image_path)
+        item_frame.name_label.config(text=self.controller.fonts.wrap(name, GLOBAL_FONT_BOLD, CART_NAME_WIDTH, CART_NAME_LINES))
+        item_frame.price_label.config(text=f"P{price:.2f}")
+        item_frame.quantity_label.config(text=f"{quantity}")
+        self.controller.image_loader.load_into(item_frame.image_label, product_image_path, (60, 60)) # Reduced image size
 
     def update_quantity(self, product_id, change):
-        current_cart = self.controller.get_cart()
-        new_quantity = current_cart.get(product_id, 0) + change
+        new_quantity = self.cart.quantity(product_id) + change
 
         if new_quantity <= 0:
             self.remove_item(product_id)
         else:
             self.controller.update_cart_quantity(product_id, new_quantity)
-            if product_id in self.cart_item_widgets:
-                self.cart_item_widgets[product_id]["quantity_label"].config(text=str(new_quantity))
+            item = self.cart_rows.items.get(product_id)
+            if item is not None:
+                self.cart_rows.update(product_id, item[:4] + (new_quantity,))
 
     def remove_item(self, product_id):
         confirm = messagebox.askyesno("Remove Item", "Are you sure you want to remove this item from your cart?")
         if confirm:
             self.controller.remove_from_cart(product_id)
-            if product_id in self.cart_item_widgets:
-                self.cart_item_widgets[product_id]["frame"].destroy()
-                del self.cart_item_widgets[product_id]
+            self.cart_rows.remove(product_id) # Only this row goes; the rest of the cart is left as is
             messagebox.showinfo("Cart Update", "Item removed successfully.")
-            self.load_cart_items()
 
     def go_to_checkout(self):
-        if not self.controller.get_cart():
+        if self.cart.is_empty():
             messagebox.showwarning("Checkout", "Your shopping cart is empty!")
             return
         self.controller.show_frame("CheckoutScreen")
\ No newline at end of file
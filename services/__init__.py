@@ -0,0 +1,40 @@
+"""
+UI-free shop logic on top of utils.database.Database.
+
+Screens are thin views over these services: they read widgets, call a service, and
+turn its return value or ServiceError into widgets and message boxes. Nothing in this
+package shows a message box or touches a widget, so the business paths can be
+benchmarked, load-tested and run on worker threads without a display.
+"""
+from services.accounts import AccountService
+from services.auth import AuthService, User
+from services.cart import CartService
+from services.catalog import CatalogService
+from services.checkout import CheckoutService, CheckoutSummary
+from services.errors import AuthError, ForbiddenError, NotFoundError, ServiceError, ValidationError
+
+
+class Services:
+    """
+    Every service over one Database. The App builds one; so can scripts and load tests.
+    services.client.RemoteServices has the same interface over a ShopServer.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.auth = AuthService(db)
+        self.catalog = CatalogService(db)
+        self.cart = CartService(db)
+        self.checkout = CheckoutService(db)
+        self.accounts = AccountService(db)
+
+    @property
+    def stats(self):
+        return self.db.stats
+
+    def start_executor(self, root, workers=2):
+        return self.db.start_executor(root, workers=workers)
+
+    def submit_call(self, fn, args=(), on_done=None, on_error=None):
+        """Runs fn(*args) (e.g. a catalog call) on a database worker thread; on_done(result) runs on the Tk thread."""
+        return self.db.submit_call(fn, args, on_done=on_done, on_error=on_error)
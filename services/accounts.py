@@ -0,0 +1,59 @@
+import datetime
+import sqlite3
+
+from services.auth import is_valid_email
+from services.errors import NotFoundError, ServiceError, ValidationError
+
+
+class AccountService:
+    """A shopper's profile details, saved addresses and contact messages."""
+
+    def __init__(self, db):
+        self.db = db
+
+    def user_info(self, user_id):
+        """(name, email) of a user, or None."""
+        return self.db.fetch_one("SELECT name, email FROM users WHERE id = ?", (user_id,))
+
+    def addresses(self, user_id):
+        """(id, address_line, contact_name, contact_no) rows, oldest first."""
+        return self.db.fetch_all("SELECT id, address_line, contact_name, contact_no FROM addresses WHERE user_id = ? ORDER BY id ASC",
+                                 (user_id,))
+
+    def save_address(self, user_id, address_id, address_line, contact_name, contact_no):
+        """Updates the user's address_id, or adds a new address when it is None. Returns "updated" or "added"."""
+        address_line = address_line.strip()
+        contact_name = contact_name.strip()
+        contact_no = contact_no.strip()
+        if not address_line or not contact_name or not contact_no:
+            raise ValidationError("All fields for the address must be filled.")
+
+        if address_id:
+            # Scoped to user_id, so nobody can overwrite another shopper's address by guessing its id
+            try:
+                result = self.db.submit_query("UPDATE addresses SET address_line = ?, contact_name = ?, contact_no = ? "
+                                              "WHERE id = ? AND user_id = ?",
+                                              (address_line, contact_name, contact_no, address_id, user_id)).result()
+            except sqlite3.Error as e:
+                raise ServiceError("Failed to update address.") from e
+            if result.rowcount == 0:
+                raise NotFoundError("Address not found.")
+            return "updated"
+        if not self.db.execute_query("INSERT INTO addresses (user_id, address_line, contact_name, contact_no) VALUES (?, ?, ?, ?)",
+                                     (user_id, address_line, contact_name, contact_no)):
+            raise ServiceError("Failed to add address.")
+        return "added"
+
+    def send_message(self, user_id, name, email, message):
+        name = name.strip()
+        email = email.strip()
+        message = message.strip()
+        if not name or not email or not message:
+            raise ValidationError("All fields are required.")
+        if not is_valid_email(email):
+            raise ValidationError("Please enter a valid email address.")
+
+        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        if not self.db.execute_query("INSERT INTO contact_messages (user_id, name, email, message, timestamp) VALUES (?, ?, ?, ?, ?)",
+                                     (user_id, name, email, message, timestamp)):
+            raise ServiceError("Failed to send message. Please try again.")
@@ -0,0 +1,58 @@
+import sqlite3
+
+from services.errors import AuthError, ServiceError, ValidationError
+from utils.helpers import check_password, hash_password
+
+MIN_PASSWORD_LENGTH = 6
+
+
+def is_valid_email(email):
+    return "@" in email and "." in email
+
+
+class User:
+    def __init__(self, user_id, name, email):
+        self.id = user_id
+        self.name = name
+        self.email = email
+
+
+class AuthService:
+    """Logging in and registering shoppers. Passwords are bcrypt hashes (utils/helpers.py)."""
+
+    def __init__(self, db):
+        self.db = db
+
+    def login(self, email, password):
+        """Returns the User for a correct email and password; raises ValidationError or AuthError."""
+        email = email.strip()
+        if not email or not password:
+            raise ValidationError("Email and Password are required.")
+
+        row = self.db.fetch_one("SELECT id, name, password FROM users WHERE email = ?", (email,))
+        # The same message for an unknown email and a wrong password, so accounts cannot be probed
+        if row is None or not check_password(password, row[2]):
+            raise AuthError("Invalid email or password.")
+        return User(row[0], row[1], email)
+
+    def register(self, name, email, password, confirm_password):
+        """Creates an account and returns its user id."""
+        name = name.strip()
+        email = email.strip()
+        if not name or not email or not password or not confirm_password:
+            raise ValidationError("All fields are required.")
+        if not is_valid_email(email):
+            raise ValidationError("Please enter a valid email address.")
+        if password != confirm_password:
+            raise ValidationError("Passwords do not match.")
+        if len(password) < MIN_PASSWORD_LENGTH:
+            raise ValidationError(f"Password must be at least {MIN_PASSWORD_LENGTH} characters long.")
+
+        if self.db.fetch_one("SELECT id FROM users WHERE email = ?", (email,)):
+            raise ValidationError("Email already registered. Please log in or use a different email.")
+
+        try:
+            return self.db.submit_query("INSERT INTO users (name, email, password) VALUES (?, ?, ?)",
+                                        (name, email, hash_password(password))).result().lastrowid
+        except sqlite3.Error as e:
+            raise ServiceError("Failed to register. Please try again.") from e
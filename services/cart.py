@@ -0,0 +1,52 @@
+class CartService:
+    """
+    The shopper's cart: product id -> quantity, kept in memory for the session.
+
+    items is the live dict (in the order products were added) that checkout reads.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.items = {}
+
+    def add(self, product_id, quantity=1):
+        """Adds quantity of a product; returns the new quantity in the cart."""
+        self.items[product_id] = self.items.get(product_id, 0) + quantity
+        return self.items[product_id]
+
+    def set_quantity(self, product_id, quantity):
+        """Sets the quantity of a product already in the cart; 0 or less removes it. Returns False if it was not there."""
+        if product_id not in self.items:
+            return False
+        if quantity > 0:
+            self.items[product_id] = quantity
+        else:
+            del self.items[product_id]
+        return True
+
+    def remove(self, product_id):
+        """Returns True if the product was in the cart."""
+        return self.items.pop(product_id, None) is not None
+
+    def clear(self):
+        self.items.clear()
+
+    def quantity(self, product_id):
+        return self.items.get(product_id, 0)
+
+    def is_empty(self):
+        return not self.items
+
+    def lines(self, items=None):
+        """
+        (id, name, price, image_path, quantity) for every product in the cart, in one query.
+        items is a copy of the cart to price instead (worker threads must not read the live dict).
+        """
+        items = self.items if items is None else items
+        if not items:
+            return []
+        product_ids = list(items)
+        rows = self.db.fetch_all(f"SELECT id, name, price, image_path FROM products WHERE id IN ({','.join('?' * len(product_ids))})",
+                                 product_ids)
+        return [(product_id, name, price, image_path, items[product_id])
+                for product_id, name, price, image_path in rows if items.get(product_id, 0) > 0]
@@ -0,0 +1,80 @@
+from services.errors import NotFoundError, ServiceError, ValidationError
+from utils.pagination import DEFAULT_PAGE_SIZE
+from utils.search import DEFAULT_LIMIT, search_products
+
+
+def _parse_stock(quantity, price, message):
+    """Parses quantity and price typed into the inventory form; raises ValidationError(message)."""
+    try:
+        quantity = int(quantity)
+        price = float(price)
+    except (TypeError, ValueError):
+        raise ValidationError(message)
+    if quantity < 0 or price < 0:
+        raise ValidationError(message)
+    return quantity, price
+
+
+class CatalogService:
+    """Product listing, search and detail, plus the inventory edits of the admin screen."""
+
+    def __init__(self, db):
+        self.db = db
+
+    # --- Browsing ---
+    def list_page(self, token=None, page_size=DEFAULT_PAGE_SIZE):
+        """One page of (id, name, price, image_path, sales_count), by name. Returns a utils.pagination.Page."""
+        return self.db.fetch_page("id, name, price, image_path, sales_count", "products", "name",
+                                  page_size=page_size, token=token)
+
+    def search(self, text, limit=DEFAULT_LIMIT):
+        """Ranked full-text search with the same row shape as list_page()."""
+        return search_products(self.db, text, limit)
+
+    def product(self, product_id):
+        row = self.db.fetch_one("SELECT id, name, price, image_path, sales_count, description, rating FROM products WHERE id = ?",
+                                (product_id,))
+        if row is None:
+            raise NotFoundError("Product not found!")
+        return {
+            "id": row[0],
+            "name": row[1],
+            "price": row[2],
+            "image_path": row[3],
+            "sales_count": row[4],
+            "description": row[5],
+            "rating": row[6]
+        }
+
+    # --- Inventory ---
+    def inventory_page(self, token=None, page_size=DEFAULT_PAGE_SIZE):
+        """One page of (id, name, stock_quantity, price), by id."""
+        return self.db.fetch_page("id, name, stock_quantity, price", "products", "id",
+                                  page_size=page_size, token=token)
+
+    def add_product(self, name, quantity, price):
+        name = name.strip()
+        if not name or not str(quantity).strip() or not str(price).strip():
+            raise ValidationError("Name, Quantity, and Price are required.")
+        quantity, price = _parse_stock(quantity, price, "Quantity must be an integer and Price must be a number.")
+        if not self.db.execute_query("INSERT INTO products (name, stock_quantity, price) VALUES (?, ?, ?)",
+                                     (name, quantity, price)):
+            raise ServiceError("Failed to add item.")
+
+    def update_product(self, product_id, name, quantity, price):
+        name = name.strip()
+        if not str(product_id).strip() or not name or not str(quantity).strip() or not str(price).strip():
+            raise ValidationError("All fields are required for update.")
+        message = "ID, Quantity, and Price must be valid numbers."
+        try:
+            product_id = int(product_id)
+        except (TypeError, ValueError):
+            raise ValidationError(message)
+        quantity, price = _parse_stock(quantity, price, message)
+        if not self.db.execute_query("UPDATE products SET name = ?, stock_quantity = ?, price = ? WHERE id = ?",
+                                     (name, quantity, price, product_id)):
+            raise ServiceError("Failed to update item.")
+
+    def delete_product(self, product_id):
+        if not self.db.execute_query("DELETE FROM products WHERE id = ?", (int(product_id),)):
+            raise ServiceError("Failed to delete item.")
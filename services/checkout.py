@@ -0,0 +1,66 @@
+import sqlite3
+
+from services.errors import ServiceError, ValidationError
+from utils.checkout import SHIPPING_COST, place_order, quote_cart
+from utils.pagination import DEFAULT_PAGE_SIZE
+
+
+class CheckoutSummary:
+    """What the checkout screen shows for a cart: the first item, item count and totals."""
+
+    def __init__(self, first_item, item_count, subtotal, shipping_cost):
+        self.first_item = first_item # dict with name, desc, price, img_path; None for an empty cart
+        self.item_count = item_count
+        self.subtotal = subtotal
+        self.shipping_cost = shipping_cost
+        self.total = subtotal + shipping_cost
+
+
+class CheckoutService:
+    """Pricing and placing orders (utils/checkout.py does the transactional work) and order history."""
+
+    def __init__(self, db, shipping_cost=SHIPPING_COST):
+        self.db = db
+        self.shipping_cost = shipping_cost
+
+    def summary(self, cart):
+        """Totals for display; unlike quote() it does not check stock."""
+        first_item = None
+        subtotal = 0.0
+        item_count = 0
+        if cart:
+            product_ids = list(cart)
+            rows = self.db.fetch_all(f"SELECT id, name, price, image_path, description FROM products WHERE id IN ({','.join('?' * len(product_ids))})",
+                                     product_ids)
+            for prod_id, name, price, img_path, desc in rows:
+                quantity = cart.get(prod_id, 0)
+                subtotal += price * quantity
+                item_count += quantity
+                if first_item is None:
+                    first_item = {"name": name, "desc": desc, "price": price, "img_path": img_path}
+        return CheckoutSummary(first_item, item_count, subtotal, self.shipping_cost)
+
+    def quote(self, cart):
+        """Validates stock and prices the cart (utils.checkout.Quote); raises CheckoutError if it cannot be bought."""
+        if not cart:
+            raise ValidationError("Your cart is empty!")
+        return quote_cart(self.db, cart, self.shipping_cost)
+
+    def place_order(self, user_id, cart, expected_total=None):
+        """
+        Creates the order and reserves its stock atomically. Returns a utils.checkout.OrderResult.
+        Pass the confirmed quote's total as expected_total to refuse the order if prices moved since.
+        """
+        if not cart:
+            raise ValidationError("Your cart is empty!")
+        try:
+            return place_order(self.db, user_id, cart, self.shipping_cost, expected_total)
+        except sqlite3.Error as e:
+            raise ServiceError(f"Failed to place order: {e}") from e
+
+    def order_page(self, user_id, token=None, page_size=DEFAULT_PAGE_SIZE):
+        """One page of a shopper's (id, status, item_count, total_amount), newest first."""
+        # item_count is kept up to date by triggers on order_items (see utils/migrations.py)
+        return self.db.fetch_page("id, status, item_count, total_amount", "orders", "order_date",
+                                  where="user_id = ?", params=(user_id,), page_size=page_size, token=token,
+                                  descending=True)
@@ -0,0 +1,268 @@
+"""
+Services that call a ShopServer (services/server.py) over HTTP instead of opening the database.
+
+RemoteServices has the same attributes and methods as services.Services, so the screens
+run unchanged in client mode (`python main.py --server http://127.0.0.1:8765`). The cart
+stays on the kiosk; it is sent along when it needs prices or is checked out.
+
+Each thread keeps its own keep-alive connection, so the App's background workers can
+call the server at the same time. Request latency is recorded in a QueryStats keyed by
+"METHOD /path", so the F9 and exit reports work as they do against a local database.
+
+Inventory edits are sent with the server's admin token (admin_token, or PUPSHOP_ADMIN_TOKEN
+in main.py); without it the server refuses them with ForbiddenError.
+"""
+import http.client
+import json
+import threading
+import time
+from urllib.parse import quote, urlencode, urlsplit
+
+from services.auth import User
+from services.cart import CartService
+from services.checkout import CheckoutSummary
+from services.errors import AuthError, ForbiddenError, NotFoundError, ServiceError, ValidationError
+from utils import checkout as checkout_errors
+from utils.checkout import CheckoutError, OrderResult, Quote
+from utils.db_executor import BackgroundExecutor, run_inline
+from utils.instrumentation import QueryStats
+from utils.pagination import DEFAULT_PAGE_SIZE, Page
+from utils.search import DEFAULT_LIMIT
+
+REQUEST_TIMEOUT_S = 15
+SLOW_REQUEST_MS = 500 # Above a bcrypt login round trip
+
+SERVICE_ERRORS = {cls.__name__: cls for cls in (ServiceError, ValidationError, NotFoundError, AuthError, ForbiddenError)}
+CHECKOUT_ERRORS = {cls.__name__: cls for cls in (CheckoutError, checkout_errors.ProductNotFoundError,
+                                                 checkout_errors.InvalidQuantityError, checkout_errors.OutOfStockError,
+                                                 checkout_errors.PriceChangedError, checkout_errors.CheckoutBusyError)}
+
+
+class ApiClient:
+    """JSON requests to one server, on a keep-alive connection per thread."""
+
+    def __init__(self, base_url, timeout=REQUEST_TIMEOUT_S, slow_request_ms=SLOW_REQUEST_MS, admin_token=None):
+        url = urlsplit(base_url)
+        if url.scheme != "http" or not url.hostname:
+            raise ValueError(f"Server URL must look like http://host:port, not {base_url!r}")
+        self.base_url = base_url.rstrip("/")
+        self.host = url.hostname
+        self.port = url.port or 80
+        self.timeout = timeout
+        self.token = None # Session from the last login
+        self.admin_token = admin_token # Sent only with admin requests
+        self.stats = QueryStats(slow_query_ms=slow_request_ms)
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            self._local.used = False
+        return conn
+
+    def _reset(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def request(self, method, path, data=None, params=None, admin=False):
+        """Returns the decoded JSON response; raises the ServiceError or CheckoutError the server reported."""
+        target = path + ("?" + urlencode({k: v for k, v in params.items() if v is not None}) if params else "")
+        body = json.dumps(data).encode("utf-8") if data is not None else None
+        headers = {"Content-Type": "application/json", "Accept": "application/json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        if admin and self.admin_token:
+            headers["X-Admin-Token"] = self.admin_token
+
+        start = time.perf_counter()
+        try:
+            status, payload = self._send(method, target, body, headers)
+        except (OSError, http.client.HTTPException, ValueError) as e:
+            self.stats.record(f"{method} {path}", (time.perf_counter() - start) * 1000.0, error=e)
+            raise ServiceError(f"Cannot reach the shop server at {self.base_url}: {e}") from e
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+        if self.stats.record(f"{method} {path}", elapsed_ms):
+            self.stats.record_slow(f"{method} {path}", [], elapsed_ms, [])
+
+        if status >= 400:
+            raise self._error(status, payload)
+        return payload
+
+    def _send(self, method, target, body, headers):
+        # A keep-alive connection the server has already closed fails before the request is
+        # read, so that case (and only that) is safe to retry once on a fresh connection.
+        for attempt in range(2):
+            conn = self._connection()
+            reused = self._local.used
+            try:
+                conn.request(method, target, body=body, headers=headers)
+                response = conn.getresponse()
+                raw = response.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                self._reset()
+                if reused and attempt == 0:
+                    continue
+                raise
+            except Exception:
+                self._reset()
+                raise
+            self._local.used = True
+            if response.getheader("Connection", "").lower() == "close":
+                self._reset()
+            return response.status, json.loads(raw) if raw else {}
+
+    def _error(self, status, payload):
+        name = payload.get("error")
+        message = payload.get("message") or f"Server error {status}."
+        if name in CHECKOUT_ERRORS:
+            details = payload.get("details")
+            return CHECKOUT_ERRORS[name](**details) if details else CHECKOUT_ERRORS[name](message)
+        return SERVICE_ERRORS.get(name, ServiceError)(message)
+
+
+def page_from_json(payload):
+    return Page([tuple(row) for row in payload["rows"]], payload["next_token"])
+
+
+def cart_to_json(cart):
+    return [[product_id, quantity] for product_id, quantity in cart.items()]
+
+
+class RemoteAuthService:
+    def __init__(self, client):
+        self.client = client
+
+    def login(self, email, password):
+        payload = self.client.request("POST", "/api/login", {"email": email, "password": password})
+        self.client.token = payload["token"]
+        return User(payload["id"], payload["name"], payload["email"])
+
+    def register(self, name, email, password, confirm_password):
+        payload = self.client.request("POST", "/api/register", {"name": name, "email": email, "password": password,
+                                                                "confirm_password": confirm_password})
+        return payload["user_id"]
+
+
+class RemoteCatalogService:
+    def __init__(self, client):
+        self.client = client
+
+    def list_page(self, token=None, page_size=DEFAULT_PAGE_SIZE):
+        return page_from_json(self.client.request("GET", "/api/products", params={"token": token, "page_size": page_size}))
+
+    def search(self, text, limit=DEFAULT_LIMIT):
+        payload = self.client.request("GET", "/api/products/search", params={"q": text, "limit": limit})
+        return [tuple(row) for row in payload["rows"]]
+
+    def product(self, product_id):
+        return self.client.request("GET", f"/api/products/{quote(str(product_id), safe='')}")
+
+    def inventory_page(self, token=None, page_size=DEFAULT_PAGE_SIZE):
+        return page_from_json(self.client.request("GET", "/api/inventory", params={"token": token, "page_size": page_size}))
+
+    def add_product(self, name, quantity, price):
+        self.client.request("POST", "/api/products", {"name": name, "quantity": quantity, "price": price}, admin=True)
+
+    def update_product(self, product_id, name, quantity, price):
+        if not str(product_id).strip():
+            raise ValidationError("All fields are required for update.")
+        self.client.request("PUT", f"/api/products/{quote(str(product_id).strip(), safe='')}",
+                            {"name": name, "quantity": quantity, "price": price}, admin=True)
+
+    def delete_product(self, product_id):
+        self.client.request("DELETE", f"/api/products/{quote(str(product_id), safe='')}", admin=True)
+
+
+class RemoteCartService(CartService):
+    """The kiosk's own cart; only lines() asks the server, for current names and prices."""
+
+    def __init__(self, client):
+        super().__init__(None)
+        self.client = client
+
+    def lines(self, items=None):
+        items = self.items if items is None else items
+        if not items:
+            return []
+        payload = self.client.request("POST", "/api/cart/lines", {"items": cart_to_json(items)})
+        return [tuple(line) for line in payload["lines"]]
+
+
+class RemoteCheckoutService:
+    """user_id arguments are accepted for compatibility; the server acts for the logged-in session."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def summary(self, cart):
+        payload = self.client.request("POST", "/api/checkout/summary", {"items": cart_to_json(cart)})
+        return CheckoutSummary(payload["first_item"], payload["item_count"], payload["subtotal"], payload["shipping_cost"])
+
+    def quote(self, cart):
+        if not cart:
+            raise ValidationError("Your cart is empty!")
+        payload = self.client.request("POST", "/api/checkout/quote", {"items": cart_to_json(cart)})
+        return Quote([tuple(line) for line in payload["lines"]], payload["shipping_cost"])
+
+    def place_order(self, user_id, cart, expected_total=None):
+        if not cart:
+            raise ValidationError("Your cart is empty!")
+        payload = self.client.request("POST", "/api/orders", {"items": cart_to_json(cart), "expected_total": expected_total})
+        return OrderResult(payload["order_id"], payload["total_amount"], payload["retries"])
+
+    def order_page(self, user_id, token=None, page_size=DEFAULT_PAGE_SIZE):
+        return page_from_json(self.client.request("GET", "/api/orders", params={"token": token, "page_size": page_size}))
+
+
+class RemoteAccountService:
+    """user_id arguments are accepted for compatibility; the server acts for the logged-in session."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def user_info(self, user_id):
+        user = self.client.request("GET", "/api/account")["user"]
+        return tuple(user) if user else None
+
+    def addresses(self, user_id):
+        return [tuple(row) for row in self.client.request("GET", "/api/addresses")["rows"]]
+
+    def save_address(self, user_id, address_id, address_line, contact_name, contact_no):
+        payload = self.client.request("POST", "/api/addresses", {"address_id": address_id, "address_line": address_line,
+                                                                 "contact_name": contact_name, "contact_no": contact_no})
+        return payload["action"]
+
+    def send_message(self, user_id, name, email, message):
+        self.client.request("POST", "/api/messages", {"name": name, "email": email, "message": message})
+
+
+class RemoteServices:
+    """Drop-in for services.Services that talks to a ShopServer at base_url."""
+
+    def __init__(self, base_url, timeout=REQUEST_TIMEOUT_S, admin_token=None):
+        self.client = ApiClient(base_url, timeout=timeout, admin_token=admin_token)
+        self.db = None
+        self.executor = None
+        self.auth = RemoteAuthService(self.client)
+        self.catalog = RemoteCatalogService(self.client)
+        self.cart = RemoteCartService(self.client)
+        self.checkout = RemoteCheckoutService(self.client)
+        self.accounts = RemoteAccountService(self.client)
+
+    @property
+    def stats(self):
+        return self.client.stats
+
+    def start_executor(self, root, workers=2):
+        if self.executor is None:
+            self.executor = BackgroundExecutor(root, workers=workers, name="api-worker")
+        return self.executor
+
+    def submit_call(self, fn, args=(), on_done=None, on_error=None):
+        """Runs fn(*args) (e.g. a catalog call) on a worker thread; inline without a started executor."""
+        if self.executor is not None:
+            return self.executor.submit_call(fn, args, on_done=on_done, on_error=on_error)
+        return run_inline(fn, args, on_done, on_error)
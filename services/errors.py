@@ -0,0 +1,18 @@
+class ServiceError(Exception):
+    """Base class for errors a shopper should see as a message. str(error) is that message."""
+
+
+class ValidationError(ServiceError):
+    """The input was missing or malformed; nothing was changed."""
+
+
+class NotFoundError(ServiceError):
+    pass
+
+
+class AuthError(ServiceError):
+    pass
+
+
+class ForbiddenError(ServiceError):
+    """The caller is known but not allowed to do this (e.g. edit inventory without the admin token)."""
@@ -0,0 +1,565 @@
+"""
+Local HTTP/JSON API over the services, so several kiosks share one database process.
+
+Usage:
+    python -m services.server [--host 127.0.0.1] [--port 8765] [--db PATH] [--readers 4] [--writers 4]
+                              [--write-window-ms 2] [--admin-token SECRET] [--report out.json]
+
+Kiosks then run `python main.py --server http://HOST:PORT` (services/client.py) instead of
+opening db/pup_shop.db themselves.
+
+The server is stdlib only: asyncio parses HTTP/1.1 (with keep-alive) on one event loop
+thread and hands each request to a thread pool. Reads go to a pool of reader threads,
+each with its own SQLite connection (WAL lets them run alongside a write). Requests that
+write go to a separate pool, so validation and password hashing can overlap, while every
+statement they write is serialized through the Database's single writer thread and
+group-committed (utils/write_queue.py). Requests never fight each other for SQLite's
+write lock; they wait in the write queue instead, and that wait is measured.
+
+Routes are listed in ShopServer.ROUTES. Logging in returns a session token; routes that
+act for a shopper take it as "Authorization: Bearer <token>" and use its user id, never
+one sent by the client. Inventory edits are admin routes: they need the server's admin
+token (--admin-token or PUPSHOP_ADMIN_TOKEN) as "X-Admin-Token: <token>", since anyone who
+can reach the server can register a shopper account. Without an admin token configured
+those routes are refused. Errors come back as {"error": <exception class>, "message": ...}.
+GET /api/stats returns per-route latency, queue waits and the query report.
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import secrets
+import signal
+import sys
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from services import Services
+from services.cart import CartService
+from services.errors import AuthError, ForbiddenError, NotFoundError, ServiceError, ValidationError
+from utils.checkout import CheckoutBusyError, CheckoutError, InvalidQuantityError, PriceChangedError
+from utils.database import DB_PATH, Database
+from utils.instrumentation import LatencyHistogram
+from utils.pagination import DEFAULT_PAGE_SIZE
+from utils.write_queue import WRITE_WINDOW_MS
+
+DEFAULT_HOST = "127.0.0.1" # Local only; bind another address to serve kiosks on the network
+DEFAULT_PORT = 8765
+READER_THREADS = 4
+WRITE_THREADS = 4 # Request threads for write routes; their statements still commit on the one writer thread
+MAX_PAGE_SIZE = 200
+MAX_BODY_BYTES = 64 * 1024
+KEEPALIVE_S = 30       # Idle keep-alive connections are closed after this long
+MAX_SESSIONS = 10000   # Oldest sessions are dropped first
+SHUTDOWN_GRACE_S = 5   # How long requests in flight get to finish on shutdown
+ADMIN_TOKEN_ENV = "PUPSHOP_ADMIN_TOKEN" # Same as --admin-token
+
+ERROR_STATUS = [ # First match wins, so subclasses come before their base class
+    (ValidationError, HTTPStatus.BAD_REQUEST),
+    (AuthError, HTTPStatus.UNAUTHORIZED),
+    (ForbiddenError, HTTPStatus.FORBIDDEN),
+    (NotFoundError, HTTPStatus.NOT_FOUND),
+    (InvalidQuantityError, HTTPStatus.BAD_REQUEST),
+    (PriceChangedError, HTTPStatus.CONFLICT),
+    (CheckoutBusyError, HTTPStatus.SERVICE_UNAVAILABLE),
+    (CheckoutError, HTTPStatus.CONFLICT),
+    (ServiceError, HTTPStatus.INTERNAL_SERVER_ERROR),
+    (ValueError, HTTPStatus.BAD_REQUEST), # e.g. a malformed page token
+]
+
+
+class Route:
+    def __init__(self, method, pattern, handler, write=False, login=False, admin=False):
+        self.method = method
+        self.pattern = re.compile(f"^{pattern}$")
+        self.handler = handler # name of the ShopServer method
+        self.write = write     # runs on the write pool
+        self.login = login     # needs a session
+        self.admin = admin     # needs the server's admin token
+        self.name = f"{method} {pattern}"
+
+
+class Request:
+    def __init__(self, method, path, args, query, data, token, user_id):
+        self.method = method
+        self.path = path
+        self.args = args       # groups captured by the route pattern
+        self.query = query     # {name: last value}
+        self.data = data       # parsed JSON body ({} without one)
+        self.token = token
+        self.user_id = user_id # from the session, or None
+
+    def param(self, name, default=None):
+        return self.query.get(name, default)
+
+    def text(self, name):
+        """A string field of the JSON body ("" when missing); the services strip() what they get."""
+        value = self.data.get(name, "")
+        if not isinstance(value, str):
+            raise ValidationError(f"{name} must be a string.")
+        return value
+
+    def page_size(self):
+        try:
+            size = int(self.param("page_size", DEFAULT_PAGE_SIZE))
+        except ValueError:
+            raise ValidationError("page_size must be a number.")
+        return max(1, min(size, MAX_PAGE_SIZE))
+
+    def cart(self):
+        """The cart sent as "items": [[product_id, quantity], ...], as the dict the services take."""
+        try:
+            cart = {int(product_id): int(quantity) for product_id, quantity in self.data.get("items") or []}
+        except (TypeError, ValueError):
+            raise ValidationError("items must be a list of [product_id, quantity] pairs.")
+        if any(quantity < 1 for quantity in cart.values()):
+            raise ValidationError("Every quantity must be at least 1.")
+        return cart
+
+
+def page_to_json(page):
+    return {"rows": [list(row) for row in page.rows], "next_token": page.next_token}
+
+
+class ServerStats:
+    """Latency per route and time spent queued for the read and write pools. Updated on the event loop only."""
+
+    def __init__(self):
+        self.routes = {}     # route name -> LatencyHistogram of the whole request
+        self.waits = {"reader": LatencyHistogram(), "writer": LatencyHistogram()}
+        self.queued = {"reader": 0, "writer": 0}
+        self.max_queued = {"reader": 0, "writer": 0}
+        self.statuses = {}
+        self.connections = 0
+        self.started = time.time()
+
+    def enqueue(self, pool):
+        self.queued[pool] += 1
+        self.max_queued[pool] = max(self.max_queued[pool], self.queued[pool])
+
+    def finish(self, pool, route, status, wait_ms, elapsed_ms):
+        if pool is not None:
+            self.queued[pool] -= 1
+            self.waits[pool].add(wait_ms)
+        histogram = self.routes.get(route)
+        if histogram is None:
+            histogram = self.routes[route] = LatencyHistogram()
+        histogram.add(elapsed_ms)
+        if status >= 500:
+            histogram.errors += 1
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def to_dict(self):
+        return {
+            "uptime_s": round(time.time() - self.started, 3),
+            "connections": self.connections,
+            "statuses": {str(status): n for status, n in sorted(self.statuses.items())},
+            "queue_wait_ms": {pool: histogram.to_dict() for pool, histogram in self.waits.items()},
+            "max_queued": dict(self.max_queued),
+            "routes": {name: histogram.to_dict() for name, histogram in self.routes.items()},
+        }
+
+    def report(self):
+        lines = [f"API server ({time.time() - self.started:.0f}s, {self.connections} connections)"]
+        for pool, histogram in self.waits.items():
+            lines.append(f"  {pool} queue wait: p50 {histogram.percentile(50):.1f} ms, p95 {histogram.percentile(95):.1f} ms, "
+                         f"max {histogram.max_ms:.1f} ms, max depth {self.max_queued[pool]}")
+        lines.append(f"{'count':>7} {'err':>4} {'p50':>7} {'p95':>7} {'max':>8}  route")
+        for name, histogram in sorted(self.routes.items(), key=lambda item: item[1].total_ms, reverse=True):
+            lines.append(f"{histogram.count:>7} {histogram.errors:>4} {histogram.percentile(50):>7.2f} "
+                         f"{histogram.percentile(95):>7.2f} {histogram.max_ms:>8.1f}  {name}")
+        return "\n".join(lines)
+
+
+class ShopServer:
+    """
+    Serves Services(db) over HTTP. serve() blocks until stop() (or Ctrl+C).
+
+    The services run unchanged on the pool threads; Database hands each thread its own
+    connection, so the pools need no locking, and the Database's writer thread is the only
+    connection that ever writes.
+    """
+
+    ROUTES = [
+        Route("GET", "/api/health", "health"),
+        Route("GET", "/api/stats", "server_stats"),
+        Route("POST", "/api/login", "login"),
+        Route("POST", "/api/logout", "logout"),
+        Route("POST", "/api/register", "register", write=True),
+        Route("GET", "/api/products", "list_products"),
+        Route("GET", "/api/products/search", "search_products"),
+        Route("GET", "/api/products/([^/]+)", "product"),
+        Route("GET", "/api/inventory", "inventory"),
+        Route("POST", "/api/products", "add_product", write=True, admin=True),
+        Route("PUT", "/api/products/([^/]+)", "update_product", write=True, admin=True),
+        Route("DELETE", "/api/products/([^/]+)", "delete_product", write=True, admin=True),
+        Route("POST", "/api/cart/lines", "cart_lines"),
+        Route("POST", "/api/checkout/summary", "checkout_summary"),
+        Route("POST", "/api/checkout/quote", "checkout_quote"),
+        Route("POST", "/api/orders", "place_order", write=True, login=True),
+        Route("GET", "/api/orders", "orders", login=True),
+        Route("GET", "/api/account", "account", login=True),
+        Route("GET", "/api/addresses", "addresses", login=True),
+        Route("POST", "/api/addresses", "save_address", write=True, login=True),
+        Route("POST", "/api/messages", "send_message", write=True),
+    ]
+
+    def __init__(self, db, host=DEFAULT_HOST, port=DEFAULT_PORT, readers=READER_THREADS, writers=WRITE_THREADS,
+                 admin_token=None):
+        self.db = db
+        self.admin_token = admin_token # None disables the admin routes
+        self.services = Services(db)
+        self.host = host
+        self.port = port
+        self.reader_count = readers
+        self.writer_count = writers
+        self.readers = ThreadPoolExecutor(max_workers=readers, thread_name_prefix="api-reader")
+        self.writers = ThreadPoolExecutor(max_workers=writers, thread_name_prefix="api-writer")
+        self.stats = ServerStats()
+        self.sessions = OrderedDict() # token -> user id
+        self._sessions_lock = threading.Lock()
+        self.ready = threading.Event() # Set once the socket is listening (self.port is then the real port)
+        self._loop = None
+        self._server = None
+        self._connections = {} # connection task -> its StreamWriter; used on the event loop only
+
+    # --- Lifecycle ---
+    def serve(self):
+        try:
+            asyncio.run(self._serve())
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.readers.shutdown(wait=True)
+            self.writers.shutdown(wait=True) # Requests in flight still finish
+            self.db.writes.stop()
+            self.db.connections.close_all()
+
+    def stop(self):
+        """Stops serve() from another thread."""
+        if self._loop is not None and self._server is not None:
+            self._loop.call_soon_threadsafe(self._server.close)
+
+    async def _serve(self):
+        self._loop = asyncio.get_running_loop()
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        try:
+            self._loop.add_signal_handler(signal.SIGTERM, self._server.close) # Shut down cleanly under a supervisor
+        except (NotImplementedError, RuntimeError, ValueError): # Windows, or not on the main thread
+            pass
+        print(f"PUP E-Shop API listening on http://{self.host}:{self.port} "
+              f"({self.reader_count} readers, {self.writer_count} writers, group commit window {self.db.writes.window_ms:g} ms)")
+        self.ready.set()
+        async with self._server:
+            try:
+                await self._server.serve_forever()
+            except asyncio.CancelledError: # stop(), SIGTERM or Ctrl+C closed the server
+                pass
+            await self._close_connections()
+
+    async def _close_connections(self):
+        """Closes the kiosks' keep-alive connections and gives requests in flight time to finish."""
+        for writer in list(self._connections.values()):
+            writer.close() # An idle handler's readline() then returns b"" and it ends
+        if self._connections:
+            await asyncio.wait(list(self._connections), timeout=SHUTDOWN_GRACE_S)
+
+    # --- HTTP ---
+    async def _handle_connection(self, reader, writer):
+        self.stats.connections += 1
+        self._connections[asyncio.current_task()] = writer
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), KEEPALIVE_S)
+                except asyncio.TimeoutError:
+                    break
+                if not request_line:
+                    break
+                keep_alive = await self._handle_request(request_line, reader, writer)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass # Client went away mid-request
+        except asyncio.CancelledError:
+            pass # Still busy when the loop shut down
+        finally:
+            self._connections.pop(asyncio.current_task(), None)
+            writer.close()
+
+    async def _handle_request(self, request_line, reader, writer):
+        """Reads one request after its request line and writes the response. Returns whether to keep the connection."""
+        try:
+            method, target, version = request_line.decode("latin-1").split()
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            length = int(headers.get("content-length") or 0)
+            if length < 0:
+                raise ValueError("negative Content-Length")
+        except ValueError: # Malformed request line or header, or a line over the stream limit
+            self._write_response(writer, HTTPStatus.BAD_REQUEST, {"error": "BadRequest", "message": "Malformed request."}, False)
+            return False
+        if length > MAX_BODY_BYTES:
+            self._write_response(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                                 {"error": "BadRequest", "message": "Request body too large."}, False)
+            return False
+        body = await reader.readexactly(length) if length else b""
+
+        keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+        status, payload = await self._dispatch(method, target, headers, body)
+        self._write_response(writer, status, payload, keep_alive)
+        return keep_alive
+
+    def _write_response(self, writer, status, payload, keep_alive):
+        body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        head = (f"HTTP/1.1 {int(status)} {HTTPStatus(status).phrase}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+
+    def _match(self, method, path):
+        """(route, args), or (None, allowed) when the path exists under another method."""
+        allowed = False
+        for route in self.ROUTES:
+            match = route.pattern.match(path)
+            if match:
+                if route.method == method:
+                    return route, [unquote(arg) for arg in match.groups()]
+                allowed = True
+        return None, allowed
+
+    async def _dispatch(self, method, target, headers, body):
+        start = time.perf_counter()
+        url = urlsplit(target)
+        route, args = self._match(method, url.path)
+        if route is None:
+            status = HTTPStatus.METHOD_NOT_ALLOWED if args else HTTPStatus.NOT_FOUND
+            self.stats.finish(None, "(unmatched)", status, 0.0, (time.perf_counter() - start) * 1000.0)
+            return status, {"error": "NotFound", "message": f"No route for {method} {url.path}"}
+
+        pool = "writer" if route.write else "reader"
+        self.stats.enqueue(pool)
+        wait_ms = 0.0
+        try:
+            try:
+                data = json.loads(body) if body else {}
+            except ValueError:
+                raise ValidationError("Request body is not valid JSON.")
+            auth = headers.get("authorization", "")
+            token = auth[7:].strip() if auth.lower().startswith("bearer ") else None
+            user_id = self._session_user(token)
+            if route.login and user_id is None:
+                raise AuthError("Please log in again.")
+            if route.admin:
+                self._check_admin(headers.get("x-admin-token", ""))
+            query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+            request = Request(method, url.path, args, query, data if isinstance(data, dict) else {}, token, user_id)
+
+            queued_at = time.perf_counter()
+            executor = self.writers if route.write else self.readers
+            payload, wait_ms = await self._loop.run_in_executor(executor, self._run, route, request, queued_at)
+            status = HTTPStatus.OK
+        except Exception as e:
+            status, payload = self._error(e)
+        self.stats.finish(pool, route.name, status, wait_ms, (time.perf_counter() - start) * 1000.0)
+        return status, payload
+
+    def _run(self, route, request, queued_at):
+        """Runs on a pool thread. Returns the handler's payload and how long the request waited for this thread."""
+        wait_ms = (time.perf_counter() - queued_at) * 1000.0
+        return getattr(self, route.handler)(request), wait_ms
+
+    def _error(self, error):
+        for error_type, status in ERROR_STATUS:
+            if isinstance(error, error_type):
+                # Plain ValueErrors (bad tokens, ids) reach the client as ValidationError
+                name = type(error).__name__ if isinstance(error, (ServiceError, CheckoutError)) else "ValidationError"
+                payload = {"error": name, "message": str(error)}
+                if isinstance(error, CheckoutError):
+                    payload["details"] = vars(error) # e.g. product_id, name, available for OutOfStockError
+                return status, payload
+        traceback.print_exc()
+        return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "ServerError", "message": "Internal server error."}
+
+    def _check_admin(self, token):
+        if not self.admin_token:
+            raise ForbiddenError("Inventory editing is disabled on this server.")
+        if not secrets.compare_digest(token.encode("utf-8"), self.admin_token.encode("utf-8")):
+            raise ForbiddenError("Inventory changes need the admin token.")
+
+    # --- Sessions ---
+    def _session_user(self, token):
+        if not token:
+            return None
+        with self._sessions_lock:
+            return self.sessions.get(token)
+
+    def _new_session(self, user_id):
+        token = secrets.token_urlsafe(24)
+        with self._sessions_lock:
+            self.sessions[token] = user_id
+            while len(self.sessions) > MAX_SESSIONS:
+                self.sessions.popitem(last=False)
+        return token
+
+    # --- Handlers (run on the pool threads) ---
+    def health(self, request):
+        return {"ok": True}
+
+    def server_stats(self, request):
+        # Read from a pool thread while the loop updates it; good enough for a monitoring endpoint
+        return {"server": self.stats.to_dict(), "writes": self.db.writes.to_dict(), "queries": self.db.stats.snapshot()}
+
+    def login(self, request):
+        user = self.services.auth.login(request.text("email"), request.text("password"))
+        return {"id": user.id, "name": user.name, "email": user.email, "token": self._new_session(user.id)}
+
+    def logout(self, request):
+        if request.token:
+            with self._sessions_lock:
+                self.sessions.pop(request.token, None)
+        return {"ok": True}
+
+    def register(self, request):
+        user_id = self.services.auth.register(request.text("name"), request.text("email"),
+                                              request.text("password"), request.text("confirm_password"))
+        return {"user_id": user_id}
+
+    def list_products(self, request):
+        return page_to_json(self.services.catalog.list_page(request.param("token"), request.page_size()))
+
+    def search_products(self, request):
+        try:
+            limit = max(1, min(int(request.param("limit", MAX_PAGE_SIZE)), MAX_PAGE_SIZE))
+        except ValueError:
+            raise ValidationError("limit must be a number.")
+        return {"rows": [list(row) for row in self.services.catalog.search(request.param("q", ""), limit)]}
+
+    def product(self, request):
+        try:
+            product_id = int(request.args[0])
+        except ValueError:
+            raise NotFoundError("Product not found!")
+        return self.services.catalog.product(product_id)
+
+    def inventory(self, request):
+        return page_to_json(self.services.catalog.inventory_page(request.param("token"), request.page_size()))
+
+    def add_product(self, request):
+        data = request.data # quantity and price may be numbers or the form's text
+        self.services.catalog.add_product(request.text("name"), data.get("quantity", ""), data.get("price", ""))
+        return {"ok": True}
+
+    def update_product(self, request):
+        data = request.data
+        self.services.catalog.update_product(request.args[0], request.text("name"),
+                                             data.get("quantity", ""), data.get("price", ""))
+        return {"ok": True}
+
+    def delete_product(self, request):
+        try:
+            product_id = int(request.args[0])
+        except ValueError:
+            raise ValidationError("Product ID must be a number.")
+        self.services.catalog.delete_product(product_id)
+        return {"ok": True}
+
+    def cart_lines(self, request):
+        cart = CartService(self.db) # A throwaway cart: carts live on the kiosks
+        cart.items = request.cart()
+        return {"lines": [list(line) for line in cart.lines()]}
+
+    def checkout_summary(self, request):
+        summary = self.services.checkout.summary(request.cart())
+        return {"first_item": summary.first_item, "item_count": summary.item_count,
+                "subtotal": summary.subtotal, "shipping_cost": summary.shipping_cost}
+
+    def checkout_quote(self, request):
+        quote = self.services.checkout.quote(request.cart())
+        return {"lines": [list(line) for line in quote.lines], "shipping_cost": quote.shipping_cost}
+
+    def place_order(self, request):
+        expected_total = request.data.get("expected_total")
+        if expected_total is not None and (not isinstance(expected_total, (int, float)) or isinstance(expected_total, bool)):
+            raise ValidationError("expected_total must be a number.")
+        result = self.services.checkout.place_order(request.user_id, request.cart(), expected_total)
+        return {"order_id": result.order_id, "total_amount": result.total_amount, "retries": result.retries}
+
+    def orders(self, request):
+        return page_to_json(self.services.checkout.order_page(request.user_id, request.param("token"),
+                                                              request.page_size()))
+
+    def account(self, request):
+        row = self.services.accounts.user_info(request.user_id)
+        return {"user": list(row) if row else None}
+
+    def addresses(self, request):
+        return {"rows": [list(row) for row in self.services.accounts.addresses(request.user_id)]}
+
+    def save_address(self, request):
+        address_id = request.data.get("address_id")
+        if address_id is not None and (not isinstance(address_id, int) or isinstance(address_id, bool)):
+            raise ValidationError("address_id must be a number.")
+        action = self.services.accounts.save_address(request.user_id, address_id, request.text("address_line"),
+                                                     request.text("contact_name"), request.text("contact_no"))
+        return {"action": action}
+
+    def send_message(self, request):
+        self.services.accounts.send_message(request.user_id, request.text("name"), request.text("email"),
+                                            request.text("message"))
+        return {"ok": True}
+
+    # --- Reporting ---
+    def report(self):
+        return "\n".join([self.stats.report(), self.db.writes.report(), self.db.stats.report()])
+
+    def dump(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"server": self.stats.to_dict(), "writes": self.db.writes.to_dict(),
+                       "queries": self.db.stats.snapshot()}, f, indent=2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="PUP E-Shop HTTP/JSON API server.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--db", default=DB_PATH, help="database file (default: the kiosk database)")
+    parser.add_argument("--readers", type=int, default=READER_THREADS, help="reader threads")
+    parser.add_argument("--writers", type=int, default=WRITE_THREADS,
+                        help="request threads for write routes (statements still commit on one writer thread)")
+    parser.add_argument("--write-window-ms", type=float, default=WRITE_WINDOW_MS,
+                        help="how long a group commit waits for more writes")
+    parser.add_argument("--admin-token", default=os.environ.get(ADMIN_TOKEN_ENV),
+                        help=f"secret kiosks must send to edit inventory (default: ${ADMIN_TOKEN_ENV}; unset disables it)")
+    parser.add_argument("--report", help="write the latency report as JSON to this file on exit")
+    args = parser.parse_args(argv)
+
+    db = Database(args.db, write_window_ms=args.write_window_ms)
+    db.create_tables()
+    db.close() # Pool threads open their own connections
+    server = ShopServer(db, host=args.host, port=args.port, readers=args.readers, writers=args.writers,
+                        admin_token=args.admin_token)
+    server.serve()
+    print(server.report())
+    if args.report:
+        server.dump(args.report)
+        print(f"Server report written to {args.report}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""
+Benchmarks the image downscaling paths over every file in assets/images.
+
+Usage:
+    python -m tools.bench_images [--sizes 60x60,80x80,180x180] [--repeat 5] [--json out.json]
+
+For each quality level in utils/thumbnails.RESIZE_QUALITIES it times decode + resize of
+every image at every size (best of --repeat runs, so disk caching does not skew it), and
+records the resolution the decoder actually produced before the final resample. That
+resolution is what drives peak memory: JPEG draft mode can shrink it by up to 64x.
+Differences against "best" are reported as the mean absolute per-channel pixel error.
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+from PIL import Image, ImageChops, ImageStat
+
+from utils.helpers import IMAGE_DIR
+from utils.thumbnails import PRODUCT_THUMBNAIL_SIZES, RESIZE_QUALITIES, scale_image
+from tools.warm_thumbnails import parse_sizes
+
+
+def decode_timed(path, size, quality):
+    """Returns (seconds, decoded WxH before the final resample, resulting image)."""
+    start = time.perf_counter()
+    img = Image.open(path)
+    result = scale_image(img, size, quality)
+    elapsed = time.perf_counter() - start
+    return elapsed, img.size, result # draft() shrinks img.size to what was actually decoded
+
+
+def pixel_error(a, b):
+    """Mean absolute difference per channel, 0-255."""
+    a, b = a.convert("RGBA"), b.convert("RGBA")
+    return sum(ImageStat.Stat(ImageChops.difference(a, b)).mean) / 4.0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare image downscaling quality levels.")
+    parser.add_argument("--images", default=IMAGE_DIR, help="directory of source images")
+    parser.add_argument("--sizes", type=parse_sizes, default=PRODUCT_THUMBNAIL_SIZES)
+    parser.add_argument("--repeat", type=int, default=5, help="runs per image; the fastest is kept")
+    parser.add_argument("--json", help="also write per-image results to this file")
+    args = parser.parse_args(argv)
+
+    paths = sorted(p for p in glob.glob(os.path.join(args.images, "*")) if os.path.isfile(p))
+    results = []
+    totals = {quality: {"seconds": 0.0, "decoded_pixels": 0, "error": 0.0} for quality in RESIZE_QUALITIES}
+
+    for path in paths:
+        for size in args.sizes:
+            reference = None
+            for quality in RESIZE_QUALITIES:
+                runs = [decode_timed(path, size, quality) for _ in range(args.repeat)]
+                seconds = min(run[0] for run in runs)
+                _, decoded, result = runs[0]
+                if reference is None:
+                    reference = result # "best" comes first and is the baseline
+                error = pixel_error(reference, result)
+                totals[quality]["seconds"] += seconds
+                totals[quality]["decoded_pixels"] += decoded[0] * decoded[1]
+                totals[quality]["error"] += error
+                results.append({
+                    "image": os.path.basename(path), "size": f"{size[0]}x{size[1]}", "quality": quality,
+                    "ms": round(seconds * 1000.0, 3), "decoded": f"{decoded[0]}x{decoded[1]}",
+                    "error": round(error, 3),
+                })
+
+    cases = len(paths) * len(args.sizes)
+    baseline = totals["best"]["seconds"] or 1.0
+    print(f"{len(paths)} images x {len(args.sizes)} sizes, best of {args.repeat}:")
+    print(f"{'quality':<10} {'total ms':>10} {'speedup':>8} {'decoded MP':>11} {'mean error':>11}")
+    for quality, total in totals.items():
+        print(f"{quality:<10} {total['seconds'] * 1000.0:>10.1f} {baseline / (total['seconds'] or 1.0):>7.1f}x "
+              f"{total['decoded_pixels'] / 1e6:>11.2f} {total['error'] / max(cases, 1):>11.2f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"totals": totals, "results": results}, f, indent=2)
+        print(f"Per-image results written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""
+Runs EXPLAIN QUERY PLAN for every SQL query found in screens/, services/ (and the
+data-access modules they delegate to) and fails if any of them still needs a full table scan.
+
+Usage:
+    python -m tools.check_query_plans [--verbose]
+
+Queries are pulled out of those modules with the ast module: the first argument of
+any fetch_one/fetch_all/execute_query/submit/execute(many) call that is a string literal or
+an f-string. Interpolated f-string parts (e.g. "IN ({product_ids})") are replaced by a
+single "?" placeholder. fetch_page/submit_page calls are rebuilt from their literal
+columns/table/sort_column/where arguments into both the first-page and the follow-up
+page query; those must also avoid a temp B-tree sort, or keyset paging gains nothing. Plans come from a fresh, fully migrated scratch database, so the
+result depends only on the schema and indexes, not on the data in db/pup_shop.db.
+"""
+import argparse
+import ast
+import glob
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+
+from utils.database import BASE_DIR
+from utils.migrations import migrate
+from utils.pagination import build_page_query
+
+SCREENS_DIR = os.path.join(BASE_DIR, 'screens')
+SERVICES_DIR = os.path.join(BASE_DIR, 'services')
+# Modules outside screens/ and services/ that run queries on the screens' behalf.
+EXTRA_SOURCES = [
+    os.path.join(BASE_DIR, 'utils', 'checkout.py'),
+    os.path.join(BASE_DIR, 'utils', 'search.py'),
+]
+QUERY_METHODS = {"fetch_one", "fetch_all", "execute_query", "submit", "execute", "executemany"}
+PAGE_METHODS = {"fetch_page", "submit_page"}
+SQL_START = re.compile(r"^\s*(SELECT|INSERT|UPDATE|DELETE|WITH)\b", re.IGNORECASE)
+# "SCAN products" is a full table scan; "SCAN products USING [COVERING] INDEX ..." walks an index.
+TABLE_SCAN = re.compile(r"^SCAN \S+$")
+TEMP_SORT = re.compile(r"^USE TEMP B-TREE FOR (ORDER BY|RIGHT PART OF ORDER BY)")
+
+
+def _literal_sql(node):
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    if isinstance(node, ast.JoinedStr):
+        parts = []
+        for value in node.values:
+            if isinstance(value, ast.Constant):
+                parts.append(value.value)
+            else:
+                parts.append("?")
+        return "".join(parts)
+    return None
+
+
+def _page_queries(node):
+    """Both SQL variants of a fetch_page/submit_page call, or [] if its arguments are not literals."""
+    args = [_literal_sql(arg) for arg in node.args[:3]]
+    if len(args) < 3 or None in args:
+        return []
+    keywords = {kw.arg: kw.value for kw in node.keywords}
+    where = _literal_sql(keywords["where"]) if "where" in keywords else ""
+    descending = "descending" in keywords and isinstance(keywords["descending"], ast.Constant) \
+        and bool(keywords["descending"].value)
+    return [build_page_query(*args, where=where or "", descending=descending, after_key=after_key)
+            for after_key in (False, True)]
+
+
+def collect_queries(paths):
+    """Returns (path, line, sql, paged) for every SQL literal passed to a query method."""
+    queries = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            tree = ast.parse(f.read(), filename=path)
+        for node in ast.walk(tree):
+            if not isinstance(node, ast.Call) or not node.args:
+                continue
+            func = node.func
+            if not isinstance(func, ast.Attribute):
+                continue
+            if func.attr in PAGE_METHODS:
+                for sql in _page_queries(node):
+                    queries.append((path, node.lineno, sql, True))
+                continue
+            if func.attr not in QUERY_METHODS:
+                continue
+            sql = _literal_sql(node.args[0])
+            if sql and SQL_START.match(sql):
+                queries.append((path, node.lineno, sql, False))
+    return queries
+
+
+def explain(conn, sql):
+    params = (None,) * sql.count("?")
+    return [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--verbose", action="store_true", help="print the plan of every query")
+    args = parser.parse_args(argv)
+
+    paths = (sorted(glob.glob(os.path.join(SCREENS_DIR, "*.py"))) + sorted(glob.glob(os.path.join(SERVICES_DIR, "*.py")))
+             + EXTRA_SOURCES)
+    queries = collect_queries(paths)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(os.path.join(tmp, "plan_check.db"))
+        migrate(conn)
+        failures = 0
+        for path, line, sql, paged in queries:
+            where = f"{os.path.relpath(path, BASE_DIR)}:{line}"
+            one_line = " ".join(sql.split())
+            try:
+                plan = explain(conn, sql)
+            except sqlite3.Error as e:
+                print(f"ERROR {where}: {e}\n    {one_line}")
+                failures += 1
+                continue
+            scans = [detail for detail in plan if TABLE_SCAN.match(detail)]
+            sorts = [detail for detail in plan if paged and TEMP_SORT.match(detail)]
+            if scans:
+                failures += 1
+                print(f"FAIL  {where}: full table scan ({'; '.join(scans)})\n    {one_line}")
+            elif sorts:
+                failures += 1
+                print(f"FAIL  {where}: paginated query sorts in a temp B-tree ({'; '.join(sorts)})\n    {one_line}")
+            elif args.verbose:
+                print(f"ok    {where}: {'; '.join(plan) or 'no plan'}\n    {one_line}")
+        conn.close()
+
+    print(f"{len(queries)} queries checked, {failures} failing.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""
+Compares two startup profiles written by `python main.py --profile-startup out.json`.
+
+Usage:
+    python -m tools.compare_startup baseline.json candidate.json [--threshold 10] [--min-ms 5]
+
+Prints per-phase, per-screen and per-import deltas and exits with 1 when time to first
+interactive (or any phase) got slower by more than --threshold percent and more than
+--min-ms milliseconds, so it can gate a release build.
+"""
+import argparse
+import json
+import sys
+
+
+def load(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def phase_totals(profile):
+    totals = {}
+    for phase in profile.get("phases", []):
+        totals[phase["name"]] = totals.get(phase["name"], 0.0) + phase["duration_ms"]
+    return totals
+
+
+def compare(title, old, new, threshold, min_ms, rows=None):
+    """Prints a delta table for two {name: ms} dicts; returns the names that regressed."""
+    names = sorted(set(old) | set(new), key=lambda name: -max(old.get(name, 0.0), new.get(name, 0.0)))
+    if rows:
+        names = names[:rows]
+    regressed = []
+    print(f"{title}:")
+    for name in names:
+        before, after = old.get(name, 0.0), new.get(name, 0.0)
+        delta = after - before
+        pct = (delta / before * 100.0) if before else float("inf") if after else 0.0
+        flag = ""
+        if delta > min_ms and pct > threshold:
+            flag = "  <-- slower"
+            regressed.append(name)
+        print(f"  {name:<32} {before:>9.1f} -> {after:>9.1f} ms  ({delta:+.1f} ms, {pct:+.0f}%){flag}")
+    return regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Diff two startup profiles.")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=10.0, help="percent slowdown that counts as a regression")
+    parser.add_argument("--min-ms", type=float, default=5.0, help="ignore slowdowns smaller than this")
+    parser.add_argument("--imports", type=int, default=15, help="how many imports to list")
+    args = parser.parse_args(argv)
+
+    old, new = load(args.baseline), load(args.candidate)
+    if old.get("format_version") != new.get("format_version"):
+        print(f"Warning: comparing profile format {old.get('format_version')} with {new.get('format_version')}")
+
+    regressed = compare("Time to first interactive",
+                        {"first_interactive": old.get("first_interactive_ms", 0.0)},
+                        {"first_interactive": new.get("first_interactive_ms", 0.0)},
+                        args.threshold, args.min_ms)
+    regressed += compare("Phases", phase_totals(old), phase_totals(new), args.threshold, args.min_ms)
+    compare("Screens built during startup", old.get("screen_build_ms", {}), new.get("screen_build_ms", {}),
+            args.threshold, args.min_ms)
+    compare("Imports (cumulative)",
+            {r["module"]: r["cumulative_ms"] for r in old.get("imports", [])},
+            {r["module"]: r["cumulative_ms"] for r in new.get("imports", [])},
+            args.threshold, args.min_ms, rows=args.imports)
+
+    if regressed:
+        print(f"Regressed: {', '.join(regressed)}")
+        return 1
+    print("No startup regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+"""
+Synthetic data generator for large catalogs and order histories.
+
+Usage:
+    python -m tools.datagen --db /tmp/big.db --products 100000 --users 20000 --orders 1000000
+    python -m tools.datagen --db /tmp/small.db --products 2000 --orders 5000 --seed 7
+
+Everything is derived from --seed, including ids, dates and password salts, so two runs
+with the same arguments against the same starting database produce identical rows. Rows
+are bulk-loaded with executemany in transactions of --batch-size rows. Order summaries
+(orders.item_count/line_count) are maintained by the schema triggers as items go in, and
+products.sales_count is updated to match the generated order items at the end.
+
+Generated accounts are datagen-<id>@pupshop.local with password "password123".
+Write to a scratch database; the kiosk database is never used unless passed explicitly.
+"""
+import argparse
+import datetime
+import os
+import random
+import sys
+import time
+
+import bcrypt
+
+from utils.checkout import SHIPPING_COST
+from utils.database import Database
+
+PASSWORD = "password123"
+BASE_DATE = datetime.datetime(2024, 1, 1)
+HISTORY_DAYS = 730
+
+IMAGES = [
+    "product_lanyard.png", "product_jeepney_signage.png", "product_iskolar_tote_bag.png",
+    "product_study_with_style.png", "0.jpg", "1.png", "5.jpg", "6.jpg", "7.jpg", "8.jpg", "9.jpg",
+    "10.jpg", "11.png", "12.png", "13.png", "14.jpg", "15.png", "16.png", "18.jpg", "20.jpg", "25.jpg",
+]
+CATEGORIES = ["Lanyard", "Sticker", "Bag", "Apparel", "Notebook", "Pin", "Mug", "Keychain", "Cap", "Umbrella"]
+ADJECTIVES = ["Minimalist", "Classic", "Iskolar", "Baybayin", "Vintage", "Sintang Paaralan", "Maroon", "Gold",
+              "Obelisk", "Study With Style", "Limited", "Heritage", "Centennial", "Mabini", "Sta. Mesa"]
+ITEMS = {
+    "Lanyard": ["Lanyard", "ID Strap"], "Sticker": ["Sticker Pack", "Jeepney Signage", "Decal"],
+    "Bag": ["Tote Bag", "Drawstring Bag", "Backpack"], "Apparel": ["T-Shirt", "Hoodie", "Polo Shirt"],
+    "Notebook": ["Notebook", "Planner", "Journal"], "Pin": ["Enamel Pin", "Button Pin"],
+    "Mug": ["Mug", "Tumbler"], "Keychain": ["Keychain", "Acrylic Charm"], "Cap": ["Cap", "Bucket Hat"],
+    "Umbrella": ["Umbrella", "Foldable Umbrella"],
+}
+FIRST_NAMES = ["Juan", "Maria", "Jose", "Ana", "Mark", "Angel", "John", "Kristine", "Paolo", "Bea", "Carlo",
+               "Mika", "Rafael", "Jasmine", "Miguel", "Patricia", "Gabriel", "Nicole", "Andrei", "Camille"]
+LAST_NAMES = ["Dela Cruz", "Santos", "Reyes", "Garcia", "Mendoza", "Bautista", "Villanueva", "Ramos", "Castro",
+              "Aquino", "Navarro", "Torres", "Flores", "Gonzales", "Lopez", "Rivera"]
+STREETS = ["Anonas St.", "Pureza St.", "Teresa St.", "V. Mapa St.", "Altura St.", "Legarda St.", "Recto Ave."]
+CITIES = ["Sta. Mesa, Manila", "Sampaloc, Manila", "Quezon City", "San Juan City", "Mandaluyong City"]
+STATUSES = (["Delivered"] * 70) + (["Shipped"] * 15) + (["Pending"] * 10) + (["Cancelled"] * 5)
+
+# bcrypt's base64 alphabet; the last salt character only carries 2 bits, hence the short list.
+_BCRYPT_CHARS = "./ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+_BCRYPT_LAST_CHARS = ".Oeu"
+
+
+def deterministic_hash(rng, password, rounds):
+    salt = "".join(rng.choice(_BCRYPT_CHARS) for _ in range(21)) + rng.choice(_BCRYPT_LAST_CHARS)
+    return bcrypt.hashpw(password.encode("utf-8"), f"$2b${rounds:02d}${salt}".encode("ascii")).decode("utf-8")
+
+
+def next_id(db, table):
+    return db.fetch_one(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}")[0]
+
+
+class BatchWriter:
+    """Buffers rows per statement and flushes them with executemany, committing every batch_size rows."""
+
+    def __init__(self, db, batch_size):
+        self.db = db
+        self.batch_size = batch_size
+        self.pending = {}
+        self.buffered = 0
+        self.written = 0
+
+    def add(self, query, row):
+        self.pending.setdefault(query, []).append(row)
+        self.buffered += 1
+        if self.buffered >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.buffered:
+            return
+        self.db.execute("BEGIN")
+        try:
+            # Statements keep the order they were first used in (the dict is never rebuilt),
+            # so parents (orders) are always written before children (order_items) and the
+            # order summary triggers find their row.
+            for query, rows in self.pending.items():
+                if rows:
+                    self.db.executemany(query, rows)
+            self.db.conn.commit()
+        except BaseException:
+            self.db.conn.rollback()
+            raise
+        self.written += self.buffered
+        for rows in self.pending.values():
+            rows.clear()
+        self.buffered = 0
+
+
+def generate_products(db, rng, count, writer):
+    first_id = next_id(db, "products")
+    prices = []
+    for i in range(count):
+        category = rng.choice(CATEGORIES)
+        item = rng.choice(ITEMS[category])
+        name = f"PUP {rng.choice(ADJECTIVES)} {item} #{first_id + i}"
+        price = round(rng.choice([20, 45, 75, 99, 120, 140, 160, 199, 250, 350, 450, 599]) * rng.uniform(0.9, 1.1), 2)
+        description = f"{rng.choice(ADJECTIVES)} {item.lower()} from the PUP Study With Style collection ({category})."
+        writer.add(
+            "INSERT INTO products (id, name, price, stock_quantity, image_path, category, description, rating, sales_count) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0)",
+            (first_id + i, name, price, rng.randint(0, 500), rng.choice(IMAGES), category, description,
+             round(rng.uniform(3.0, 5.0), 1))
+        )
+        prices.append(price)
+    writer.flush()
+    return first_id, prices
+
+
+def generate_users(db, rng, count, addresses_per_user, rounds, writer):
+    first_id = next_id(db, "users")
+    hashed = deterministic_hash(rng, PASSWORD, rounds)
+    next_address_id = next_id(db, "addresses")
+    for i in range(count):
+        user_id = first_id + i
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        writer.add("INSERT INTO users (id, name, email, password) VALUES (?, ?, ?, ?)",
+                   (user_id, name, f"datagen-{user_id}@pupshop.local", hashed))
+        for _ in range(rng.randint(0, addresses_per_user * 2)):
+            writer.add(
+                "INSERT INTO addresses (id, user_id, address_line, contact_name, contact_no) VALUES (?, ?, ?, ?, ?)",
+                (next_address_id, user_id, f"{rng.randint(1, 2999)} {rng.choice(STREETS)}, {rng.choice(CITIES)}",
+                 name, f"09{rng.randint(100000000, 999999999)}")
+            )
+            next_address_id += 1
+    writer.flush()
+    return first_id
+
+
+def generate_orders(db, rng, count, user_ids, product_ids, prices, max_lines, writer):
+    """Returns {product_id: quantity sold} for the sales_count update."""
+    first_order_id = next_id(db, "orders")
+    next_item_id = next_id(db, "order_items")
+    sold = {}
+    first_product_id = product_ids[0]
+    for i in range(count):
+        order_id = first_order_id + i
+        order_date = BASE_DATE + datetime.timedelta(seconds=rng.randint(0, HISTORY_DAYS * 86400))
+        lines = []
+        for _ in range(rng.randint(1, max_lines)):
+            index = rng.randrange(len(product_ids))
+            lines.append((first_product_id + index, rng.randint(1, 3), prices[index]))
+        total = round(sum(quantity * price for _, quantity, price in lines) + SHIPPING_COST, 2)
+        # item_count/line_count start at 0 and are filled in by the order_items triggers
+        writer.add("INSERT INTO orders (id, user_id, order_date, total_amount, status) VALUES (?, ?, ?, ?, ?)",
+                   (order_id, rng.choice(user_ids), order_date.strftime("%Y-%m-%d %H:%M:%S"), total, rng.choice(STATUSES)))
+        for product_id, quantity, price in lines:
+            writer.add(
+                "INSERT INTO order_items (id, order_id, product_id, quantity, item_price_at_order) VALUES (?, ?, ?, ?, ?)",
+                (next_item_id, order_id, product_id, quantity, price)
+            )
+            next_item_id += 1
+            sold[product_id] = sold.get(product_id, 0) + quantity
+    writer.flush()
+    return sold
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk-load deterministic synthetic shop data.")
+    parser.add_argument("--db", required=True, help="database file to fill (created if missing)")
+    parser.add_argument("--products", type=int, default=10000)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--addresses-per-user", type=int, default=1, help="average addresses per user")
+    parser.add_argument("--orders", type=int, default=50000)
+    parser.add_argument("--max-lines", type=int, default=4, help="max order_items per order")
+    parser.add_argument("--batch-size", type=int, default=20000, help="rows per transaction")
+    parser.add_argument("--bcrypt-rounds", type=int, default=12, help="cost of the shared password hash")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    if os.path.abspath(args.db) == os.path.abspath(Database().db_path):
+        print("Refusing to bulk-load the kiosk database; pass a scratch file to --db.")
+        return 2
+
+    rng = random.Random(args.seed)
+    # Bulk load: durability of half-finished runs does not matter, speed does.
+    db = Database(args.db, pragmas={"synchronous": "OFF"})
+    db.create_tables()
+    writer = BatchWriter(db, args.batch_size)
+
+    started = time.perf_counter()
+    first_product_id, prices = generate_products(db, rng, args.products, writer)
+    print(f"products: {args.products} ({time.perf_counter() - started:.1f}s)")
+
+    phase = time.perf_counter()
+    first_user_id = generate_users(db, rng, args.users, args.addresses_per_user, args.bcrypt_rounds, writer)
+    print(f"users: {args.users} ({time.perf_counter() - phase:.1f}s)")
+
+    if args.orders and args.users and args.products:
+        phase = time.perf_counter()
+        user_ids = list(range(first_user_id, first_user_id + args.users))
+        product_ids = list(range(first_product_id, first_product_id + args.products))
+        sold = generate_orders(db, rng, args.orders, user_ids, product_ids, prices, args.max_lines, writer)
+        for product_id, quantity in sorted(sold.items()):
+            writer.add("UPDATE products SET sales_count = sales_count + ? WHERE id = ?", (quantity, product_id))
+        writer.flush()
+        print(f"orders: {args.orders} ({time.perf_counter() - phase:.1f}s)")
+
+    db.execute_query("ANALYZE")
+    db.close()
+    print(f"Done: {writer.written} rows in {time.perf_counter() - started:.1f}s -> {args.db}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
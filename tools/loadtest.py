@@ -0,0 +1,243 @@
+"""
+Headless multi-process checkout load test against a shared SQLite database.
+
+Usage:
+    python -m tools.loadtest --db /tmp/copy.db --workers 8 --duration 30
+    python -m tools.loadtest --db /tmp/copy.db --workers 4 --orders 200 --json result.json
+    python -m tools.loadtest --db /tmp/copy.db --server http://127.0.0.1:8765 --workers 8
+
+Each worker process plays shoppers through the services, exactly as the screens do: it
+logs in (bcrypt check), browses the product list and a few product detail pages, builds a
+cart and checks out with CheckoutService.quote/place_order. With --server the workers
+use services.client.RemoteServices against a running `python -m services.server --db`
+on the same file, so both ways of sharing the database can be compared under one load.
+
+The harness creates its own shopper accounts (loadtest-<n>@pupshop.local) and writes real
+orders, so --db is required and should be a copy; it refuses the kiosk database itself
+unless --i-mean-it is passed.
+At the end it reports throughput, latency percentiles, SQLITE_BUSY retries and checks
+that no product was oversold and that stock, sales_count and order summaries still add up.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+from services import ServiceError, Services
+from services.client import RemoteServices
+from utils.checkout import CheckoutBusyError, CheckoutError
+from utils.database import DB_PATH, Database
+from utils.helpers import hash_password
+
+SHOPPER_PASSWORD = "loadtest123"
+BROWSE_PAGE_SIZE = 100
+
+
+def shopper_email(n):
+    return f"loadtest-{n}@pupshop.local"
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def ensure_shoppers(db, count):
+    """Creates missing shopper accounts. One bcrypt hash is shared to keep setup fast."""
+    hashed = None
+    for n in range(count):
+        if db.fetch_one("SELECT id FROM users WHERE email = ?", (shopper_email(n),)):
+            continue
+        if hashed is None:
+            hashed = hash_password(SHOPPER_PASSWORD)
+        db.execute_query("INSERT INTO users (name, email, password) VALUES (?, ?, ?)",
+                         (f"Load Test {n}", shopper_email(n), hashed))
+
+
+def snapshot_products(db):
+    return {row[0]: (row[1], row[2] or 0) for row in db.fetch_all("SELECT id, stock_quantity, sales_count FROM products")}
+
+
+def all_products(shop):
+    """Every product, a page at a time, like scrolling the home screen to the end."""
+    rows, token = [], None
+    while True:
+        page = shop.catalog.list_page(token, BROWSE_PAGE_SIZE)
+        rows.extend(page.rows)
+        if not page.has_more:
+            return rows
+        token = page.next_token
+
+
+def run_worker(worker_id, db_path, deadline, max_orders, max_lines, think_ms, seed, server_url=None):
+    """One shopper process. Returns a plain dict so it pickles back to the parent."""
+    rng = random.Random(seed * 1000 + worker_id)
+    shop = RemoteServices(server_url) if server_url else Services(Database(db_path))
+    stats = {
+        "worker": worker_id, "orders": 0, "out_of_stock": 0, "busy_failures": 0, "busy_retries": 0,
+        "errors": [], "checkout_ms": [], "login_ms": [], "browse_ms": [],
+    }
+
+    start = time.perf_counter()
+    try:
+        user_id = shop.auth.login(shopper_email(worker_id), SHOPPER_PASSWORD).id
+    except ServiceError as e:
+        stats["errors"].append(f"login failed: {e}")
+        return stats
+    stats["login_ms"].append((time.perf_counter() - start) * 1000.0)
+
+    while time.time() < deadline and (not max_orders or stats["orders"] < max_orders):
+        start = time.perf_counter()
+        products = all_products(shop)
+        if not products:
+            stats["errors"].append("no products")
+            break
+        picks = rng.sample(products, min(len(products), rng.randint(1, max_lines)))
+        cart = {}
+        for product in picks:
+            shop.catalog.product(product[0])
+            cart[product[0]] = rng.randint(1, 3)
+        stats["browse_ms"].append((time.perf_counter() - start) * 1000.0)
+
+        if think_ms:
+            time.sleep(rng.uniform(0, think_ms) / 1000.0)
+
+        start = time.perf_counter()
+        try:
+            shop.checkout.quote(cart)
+            result = shop.checkout.place_order(user_id, cart)
+            stats["orders"] += 1
+            stats["busy_retries"] += result.retries
+        except CheckoutBusyError as e:
+            stats["busy_failures"] += 1
+            stats["busy_retries"] += e.attempts - 1
+        except CheckoutError:
+            stats["out_of_stock"] += 1
+        except Exception as e:
+            stats["errors"].append(repr(e))
+        stats["checkout_ms"].append((time.perf_counter() - start) * 1000.0)
+
+    if shop.db is not None:
+        shop.db.close()
+    return stats
+
+
+def check_consistency(db, before, first_order_id):
+    """Returns a list of problems found after the run (empty when consistent)."""
+    problems = []
+    after = snapshot_products(db)
+    sold = {row[0]: row[1] for row in db.fetch_all(
+        "SELECT product_id, SUM(quantity) FROM order_items WHERE order_id > ? GROUP BY product_id", (first_order_id,))}
+    for prod_id, (stock_before, sales_before) in before.items():
+        stock_after, sales_after = after.get(prod_id, (None, None))
+        if stock_after is None:
+            continue
+        qty = sold.get(prod_id, 0)
+        if stock_after < 0:
+            problems.append(f"product {prod_id}: oversold, stock is {stock_after}")
+        if stock_before - qty != stock_after:
+            problems.append(f"product {prod_id}: stock {stock_before} - sold {qty} != {stock_after}")
+        if sales_before + qty != sales_after:
+            problems.append(f"product {prod_id}: sales_count {sales_before} + sold {qty} != {sales_after}")
+    mismatched = db.fetch_all(
+        "SELECT o.id, o.item_count, COALESCE(SUM(oi.quantity), 0) FROM orders o "
+        "LEFT JOIN order_items oi ON oi.order_id = o.id WHERE o.id > ? "
+        "GROUP BY o.id HAVING o.item_count != COALESCE(SUM(oi.quantity), 0)", (first_order_id,))
+    for order_id, item_count, actual in mismatched:
+        problems.append(f"order {order_id}: item_count {item_count} != items {actual}")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Multi-process checkout load test.")
+    parser.add_argument("--db", required=True, help="database file to load (use a copy of the kiosk database)")
+    parser.add_argument("--workers", type=int, default=4, help="number of shopper processes")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds to run")
+    parser.add_argument("--orders", type=int, default=0, help="stop each worker after this many orders (0 = no limit)")
+    parser.add_argument("--max-lines", type=int, default=3, help="max distinct products per cart")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="max random pause between browsing and checkout")
+    parser.add_argument("--restock", type=int, default=0,
+                        help="set every product's stock to this value before the run (0 = leave as is)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--server", metavar="URL",
+                        help="shop through the API server at URL (serving --db) instead of opening --db in every worker")
+    parser.add_argument("--json", help="also write the full report to this file")
+    parser.add_argument("--i-mean-it", action="store_true",
+                        help="allow --db to be the kiosk database (adds accounts, changes stock, places real orders)")
+    args = parser.parse_args(argv)
+
+    if os.path.abspath(args.db) == os.path.abspath(DB_PATH) and not args.i_mean_it:
+        print("Refusing to load-test the kiosk database; pass a copy to --db (or --i-mean-it).")
+        return 2
+
+    db = Database(args.db)
+    db.create_tables()
+    ensure_shoppers(db, args.workers)
+    if args.restock:
+        db.execute_query("UPDATE products SET stock_quantity = ?", (args.restock,))
+    before = snapshot_products(db)
+    first_order_id = db.fetch_one("SELECT COALESCE(MAX(id), 0) FROM orders")[0]
+    db.close()
+
+    deadline = time.time() + args.duration
+    ctx = multiprocessing.get_context("spawn")
+    started = time.perf_counter()
+    with ctx.Pool(args.workers) as pool:
+        results = pool.starmap(run_worker, [
+            (n, args.db, deadline, args.orders, args.max_lines, args.think_ms, args.seed, args.server)
+            for n in range(args.workers)
+        ])
+    elapsed = time.perf_counter() - started
+
+    db = Database(args.db)
+    problems = check_consistency(db, before, first_order_id)
+    db.close()
+
+    checkout_ms = [ms for r in results for ms in r["checkout_ms"]]
+    browse_ms = [ms for r in results for ms in r["browse_ms"]]
+    orders = sum(r["orders"] for r in results)
+    report = {
+        "mode": "server" if args.server else "direct",
+        "workers": args.workers,
+        "elapsed_s": round(elapsed, 3),
+        "orders": orders,
+        "orders_per_s": round(orders / elapsed, 2) if elapsed else 0.0,
+        "checkout_p50_ms": round(percentile(checkout_ms, 50), 2),
+        "checkout_p99_ms": round(percentile(checkout_ms, 99), 2),
+        "browse_p50_ms": round(percentile(browse_ms, 50), 2),
+        "browse_p99_ms": round(percentile(browse_ms, 99), 2),
+        "out_of_stock": sum(r["out_of_stock"] for r in results),
+        "busy_retries": sum(r["busy_retries"] for r in results),
+        "busy_failures": sum(r["busy_failures"] for r in results),
+        "errors": [e for r in results for e in r["errors"]],
+        "consistency_problems": problems,
+    }
+
+    print(f"{report['orders']} orders in {report['elapsed_s']}s with {args.workers} {report['mode']} workers "
+          f"-> {report['orders_per_s']} orders/s")
+    print(f"checkout latency p50 {report['checkout_p50_ms']} ms, p99 {report['checkout_p99_ms']} ms; "
+          f"browse p50 {report['browse_p50_ms']} ms, p99 {report['browse_p99_ms']} ms")
+    print(f"out of stock: {report['out_of_stock']}, busy retries: {report['busy_retries']}, "
+          f"busy failures: {report['busy_failures']}, errors: {len(report['errors'])}")
+    if problems:
+        print(f"INCONSISTENT: {len(problems)} problem(s)")
+        for problem in problems[:20]:
+            print(f"  {problem}")
+    else:
+        print("Stock, sales counts and order summaries are consistent.")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    return 1 if problems or report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
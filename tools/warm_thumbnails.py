@@ -0,0 +1,86 @@
+"""
+Pre-generates the on-disk product thumbnails so a kiosk's first start does not pay
+for decoding and resizing every source image.
+
+Usage:
+    python -m tools.warm_thumbnails [--db db/pup_shop.db] [--sizes 60x60,80x80,180x180] [--quality balanced] [--clear]
+
+Every distinct products.image_path is resolved against assets/images (the same way
+the screens do) and resized to each size into the thumbnail store (cache/thumbnails
+by default). Thumbnails that are already current are left alone, so re-running it
+after adding products or replacing images only does the new work.
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import time
+
+from utils.database import DB_PATH
+from utils.helpers import IMAGE_DIR
+from utils.thumbnails import (
+    DEFAULT_RESIZE_QUALITY, PRODUCT_THUMBNAIL_SIZES, RESIZE_QUALITIES, THUMBNAIL_DIR, ThumbnailStore
+)
+
+
+def parse_sizes(text):
+    sizes = []
+    for part in text.split(","):
+        width, _, height = part.strip().lower().partition("x")
+        sizes.append((int(width), int(height or width)))
+    return sizes
+
+
+def product_image_paths(db_path):
+    # Read-only: warming must never migrate or otherwise touch the kiosk database.
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        rows = conn.execute("SELECT DISTINCT image_path FROM products WHERE image_path IS NOT NULL AND image_path != ''").fetchall()
+    finally:
+        conn.close()
+    return sorted(row[0] for row in rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-warm the on-disk product thumbnail cache.")
+    parser.add_argument("--db", default=DB_PATH, help="database to read products.image_path from")
+    parser.add_argument("--cache-dir", default=THUMBNAIL_DIR)
+    parser.add_argument("--sizes", type=parse_sizes, default=PRODUCT_THUMBNAIL_SIZES,
+                        help="comma-separated WxH list (default: the sizes the screens use)")
+    parser.add_argument("--quality", choices=sorted(RESIZE_QUALITIES), default=DEFAULT_RESIZE_QUALITY,
+                        help="resize quality; must match the kiosk's PUPSHOP_IMAGE_QUALITY to be used")
+    parser.add_argument("--clear", action="store_true", help="delete every stored thumbnail first")
+    args = parser.parse_args(argv)
+
+    store = ThumbnailStore(args.cache_dir, quality=args.quality)
+    if args.clear:
+        print(f"Removed {store.clear()} thumbnails from {args.cache_dir}")
+
+    try:
+        image_paths = product_image_paths(args.db)
+    except sqlite3.Error as e:
+        print(f"Could not read products from {args.db}: {e}")
+        return 1
+
+    started = time.perf_counter()
+    generated = 0
+    missing = []
+    for image_path in image_paths:
+        source = os.path.join(IMAGE_DIR, image_path)
+        try:
+            generated += store.warm(source, args.sizes)
+        except FileNotFoundError:
+            missing.append(image_path)
+        except OSError as e:
+            print(f"Skipping {image_path}: {e}")
+
+    sizes = ", ".join(f"{w}x{h}" for w, h in args.sizes)
+    print(f"{len(image_paths)} images x [{sizes}]: {generated} thumbnails generated "
+          f"in {time.perf_counter() - started:.2f}s -> {args.cache_dir}")
+    if missing:
+        print(f"{len(missing)} image files not found: {', '.join(missing)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+import datetime
+import sqlite3
+
+from utils.write_queue import is_busy
+
+SHIPPING_COST = 36.00
+
+
+class CheckoutError(Exception):
+    """Base class for errors a shopper should see as a checkout message."""
+
+
+class ProductNotFoundError(CheckoutError):
+    def __init__(self, product_id):
+        super().__init__(f"Product ID {product_id} not found.")
+        self.product_id = product_id
+
+
+class InvalidQuantityError(CheckoutError):
+    def __init__(self, product_id, quantity):
+        super().__init__(f"Quantity for product ID {product_id} must be at least 1, not {quantity}.")
+        self.product_id = product_id
+        self.quantity = quantity
+
+
+class OutOfStockError(CheckoutError):
+    def __init__(self, product_id, name, available):
+        super().__init__(f"Not enough stock for {name}. Available: {available}")
+        self.product_id = product_id
+        self.name = name
+        self.available = available
+
+
+class PriceChangedError(CheckoutError):
+    def __init__(self, expected_total, total):
+        super().__init__(f"Prices changed, please review your order. New total: P{total:.2f} (was P{expected_total:.2f}).")
+        self.expected_total = expected_total
+        self.total = total
+
+
+class CheckoutBusyError(CheckoutError):
+    def __init__(self, attempts):
+        super().__init__(f"The shop is busy right now (database locked after {attempts} attempts). Please try again.")
+        self.attempts = attempts
+
+
+class Quote:
+    """Priced cart: lines are (product_id, name, price, quantity), in cart order."""
+
+    def __init__(self, lines, shipping_cost):
+        self.lines = lines
+        self.subtotal = sum(price * quantity for _, _, price, quantity in lines)
+        self.shipping_cost = shipping_cost
+        self.total = self.subtotal + shipping_cost
+
+
+class OrderResult:
+    def __init__(self, order_id, total_amount, retries):
+        self.order_id = order_id
+        self.total_amount = total_amount
+        self.retries = retries
+
+
+def _placeholders(n):
+    return ",".join("?" * n)
+
+
+def _fetch_lines(db, cart, fetch):
+    """One batched lookup for every cart line; raises on bad quantities, unknown products or short stock."""
+    for prod_id, quantity in cart.items():
+        # A negative line would pass "stock_quantity >= ?" and add stock instead of reserving it
+        if quantity < 1:
+            raise InvalidQuantityError(prod_id, quantity)
+    product_ids = list(cart.keys())
+    rows = fetch(f"SELECT id, name, price, stock_quantity FROM products WHERE id IN ({_placeholders(len(product_ids))})",
+                 product_ids)
+    found = {row[0]: row for row in rows}
+    lines = []
+    for prod_id, quantity in cart.items():
+        if prod_id not in found:
+            raise ProductNotFoundError(prod_id)
+        _, name, price, stock = found[prod_id]
+        if stock < quantity:
+            raise OutOfStockError(prod_id, name, stock)
+        lines.append((prod_id, name, price, quantity))
+    return lines
+
+
+def quote_cart(db, cart, shipping_cost=SHIPPING_COST):
+    """Validates and prices the whole cart with a single query. Does not reserve anything."""
+    return Quote(_fetch_lines(db, cart, db.fetch_all), shipping_cost)
+
+
+def place_order(db, user_id, cart, shipping_cost=SHIPPING_COST, expected_total=None):
+    """
+    Creates the order and reserves its stock atomically.
+
+    The work is queued on the database's writer thread (utils/write_queue.py) and runs
+    inside its BEGIN IMMEDIATE transaction, in a savepoint of its own: prices and stock
+    are re-read, each line is reserved with a conditional
+    "UPDATE ... WHERE stock_quantity >= ?" (so two kiosks can never oversell), and the
+    order items are written with executemany. The writer retries SQLITE_BUSY with bounded,
+    jittered exponential backoff. Returns an OrderResult once the order is committed.
+
+    expected_total is the total the shopper confirmed (Quote.total). If the re-read prices
+    come to a different total, nothing is written and PriceChangedError is raised.
+    """
+    future = db.submit_write(_create_order, db, user_id, cart, shipping_cost, expected_total)
+    try:
+        order_id, total_amount = future.result()
+    except sqlite3.OperationalError as e:
+        if not is_busy(e):
+            raise
+        raise CheckoutBusyError(future.retries + 1) from e
+    return OrderResult(order_id, total_amount, future.retries)
+
+
+def _create_order(db, user_id, cart, shipping_cost, expected_total=None):
+    """Runs on the writer thread, inside the current transaction. Raising rolls back just this order."""
+    lines = _fetch_lines(db, cart, lambda query, params: db.execute(query, params).fetchall())
+    quote = Quote(lines, shipping_cost)
+    if expected_total is not None and round(quote.total, 2) != round(expected_total, 2):
+        raise PriceChangedError(expected_total, quote.total)
+
+    for prod_id, name, price, quantity in lines:
+        cursor = db.execute(
+            "UPDATE products SET stock_quantity = stock_quantity - ?, sales_count = sales_count + ? "
+            "WHERE id = ? AND stock_quantity >= ?",
+            (quantity, quantity, prod_id, quantity)
+        )
+        if cursor.rowcount != 1:
+            # We hold the write lock, so this only happens if the row vanished mid-transaction.
+            row = db.execute("SELECT stock_quantity FROM products WHERE id = ?", (prod_id,)).fetchone()
+            if row is None:
+                raise ProductNotFoundError(prod_id)
+            raise OutOfStockError(prod_id, name, row[0])
+
+    order_date = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    order_id = db.execute(
+        "INSERT INTO orders (user_id, order_date, total_amount, status) VALUES (?, ?, ?, ?)",
+        (user_id, order_date, quote.total, 'Pending')
+    ).lastrowid
+    db.executemany(
+        "INSERT INTO order_items (order_id, product_id, quantity, item_price_at_order) VALUES (?, ?, ?, ?)",
+        [(order_id, prod_id, quantity, price) for prod_id, _, price, quantity in lines]
+    )
+    return order_id, quote.total
@@ -1,118 +1,245 @@
 import sqlite3
+import threading
+import time
 import bcrypt
 import os
 
+from utils.db_executor import BackgroundExecutor, run_inline
+from utils.instrumentation import QueryStats
+from utils.migrations import migrate
+from utils.pagination import DEFAULT_PAGE_SIZE, fetch_page
+from utils.write_queue import MAX_BATCH, WRITE_WINDOW_MS, WriteQueue, WriteResult
+
 # Determine the base directory for the database file
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DB_PATH = os.path.join(BASE_DIR, 'db', 'pup_shop.db')
 
+# Pragmas applied to every connection when it is opened.
+# WAL lets readers keep going while a checkout is writing, and synchronous=NORMAL
+# is the recommended (still crash-safe) setting to pair with it.
+DEFAULT_PRAGMAS = {
+    "synchronous": "NORMAL",
+    "cache_size": -16000,       # negative = KiB, so ~16 MB of page cache
+    "mmap_size": 134217728,     # 128 MB
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000,       # ms to wait on a locked database before SQLITE_BUSY
+}
+
+
+class ConnectionManager:
+    """
+    Hands out one sqlite3 connection per thread for a single database file.
+    Every connection is switched to WAL and gets the configured pragmas when it opens.
+    """
+
+    def __init__(self, db_path, pragmas=None, journal_mode="WAL"):
+        self.db_path = db_path
+        self.pragmas = dict(DEFAULT_PRAGMAS)
+        if pragmas:
+            self.pragmas.update(pragmas)
+        self.journal_mode = journal_mode
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = set()
+
+    def get(self):
+        """Returns the calling thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._open()
+            self._local.conn = conn
+            self._local.cursor = conn.cursor()
+            with self._lock:
+                self._connections.add(conn)
+        return conn
+
+    def cursor(self):
+        """Returns the shared cursor of the calling thread's connection."""
+        self.get()
+        return self._local.cursor
+
+    def has_connection(self):
+        return getattr(self._local, "conn", None) is not None
+
+    def _open(self):
+        # check_same_thread stays on: a connection never leaves the thread that opened it.
+        conn = sqlite3.connect(self.db_path)
+        if self.journal_mode:
+            conn.execute(f"PRAGMA journal_mode = {self.journal_mode}")
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    def close(self):
+        """Closes the calling thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            with self._lock:
+                self._connections.discard(conn)
+            conn.close()
+            self._local.conn = None
+            self._local.cursor = None
+
+    def close_all(self):
+        """Closes every connection that is still open. Only safe once worker threads are done."""
+        with self._lock:
+            connections = list(self._connections)
+            self._connections.clear()
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.ProgrammingError:
+                # Connection belongs to another (still running) thread; it will be closed there.
+                pass
+        self._local.conn = None
+        self._local.cursor = None
+
+
 class Database:
-    def __init__(self, db_path=DB_PATH):
+    def __init__(self, db_path=DB_PATH, pragmas=None, slow_query_ms=50.0, write_window_ms=WRITE_WINDOW_MS,
+                 max_write_batch=MAX_BATCH):
         self.db_path = db_path
-        self.conn = None
-        self.cursor = None
+        self.connections = ConnectionManager(db_path, pragmas=pragmas)
+        self.executor = None
+        self.stats = QueryStats(slow_query_ms=slow_query_ms)
+        # All writes go through one writer thread and are committed in groups (see utils/write_queue.py)
+        self.writes = WriteQueue(self, window_ms=write_window_ms, max_batch=max_write_batch)
+
+    # conn/cursor resolve to the calling thread's own connection, so existing
+    # code using self.db.conn / self.db.cursor keeps working from any thread.
+    @property
+    def conn(self):
+        if not self.connections.has_connection():
+            return None
+        return self.connections.get()
+
+    @property
+    def cursor(self):
+        if not self.connections.has_connection():
+            return None
+        return self.connections.cursor()
 
     def connect(self):
-        if self.conn is None:
-            self.conn = sqlite3.connect(self.db_path)
-            self.cursor = self.conn.cursor()
+        self.connections.get()
 
     def close(self):
-        if self.conn:
-            self.conn.close()
-            self.conn = None
-            self.cursor = None
+        self.connections.close()
 
-    def execute_query(self, query, params=()):
+    def _timed(self, query, params, run):
+        """Runs run(cursor) and records its latency against the normalized query in self.stats."""
         self.connect()
+        cursor = self.cursor
+        start = time.perf_counter()
+        try:
+            result = run(cursor)
+        except sqlite3.Error as e:
+            self.stats.record(query, (time.perf_counter() - start) * 1000.0, error=e)
+            raise
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+        if self.stats.record(query, elapsed_ms):
+            self.stats.record_slow(query, params, elapsed_ms, self.explain(query, params))
+        return result
+
+    def explain(self, query, params=()):
+        """Returns the EXPLAIN QUERY PLAN detail lines for a statement (empty for DDL/pragmas)."""
+        try:
+            return [row[3] for row in self.conn.execute("EXPLAIN QUERY PLAN " + query, params)]
+        except sqlite3.Error:
+            return []
+
+    def execute_query(self, query, params=()):
+        """Runs one write statement through the writer queue and waits until it is committed."""
         try:
-            self.cursor.execute(query, params)
-            self.conn.commit()
+            self.submit_query(query, params).result()
             return True
         except sqlite3.Error as e:
             print(f"Database error: {e}")
             return False
 
+    # --- Queued writes ---
+    def submit_write(self, fn, *args):
+        """
+        Runs fn(*args) on the writer thread inside the next group commit and returns a
+        Future of its result. db.execute() inside fn uses the writer's connection; fn must
+        not BEGIN or COMMIT itself. If fn raises, only its own changes are rolled back.
+        """
+        return self.writes.submit(fn, *args)
+
+    def submit_query(self, query, params=()):
+        """Queues one write statement; the Future's result is a WriteResult once it is committed."""
+        def run():
+            cursor = self.execute(query, params)
+            return WriteResult(cursor.rowcount, cursor.lastrowid)
+        return self.writes.submit(run)
+
+    def execute(self, query, params=()):
+        """
+        Executes one statement on this thread's connection without committing and returns
+        the cursor (for rowcount/lastrowid). For callers that manage their own transaction.
+        """
+        return self._timed(query, params, lambda cursor: cursor.execute(query, params))
+
+    def executemany(self, query, seq_of_params):
+        seq_of_params = list(seq_of_params)
+        return self._timed(query, (), lambda cursor: cursor.executemany(query, seq_of_params))
+
     def fetch_one(self, query, params=()):
-        self.connect()
-        self.cursor.execute(query, params)
-        return self.cursor.fetchone()
+        return self._timed(query, params, lambda cursor: cursor.execute(query, params).fetchone())
 
     def fetch_all(self, query, params=()):
-        self.connect()
-        self.cursor.execute(query, params)
-        return self.cursor.fetchall()
+        return self._timed(query, params, lambda cursor: cursor.execute(query, params).fetchall())
+
+    # --- Paginated listings ---
+    def fetch_page(self, columns, table, sort_column, where="", params=(), page_size=DEFAULT_PAGE_SIZE,
+                   token=None, descending=False):
+        """
+        Keyset (cursor) pagination ordered by (sort_column, id). Pass the returned
+        Page.next_token back in to get the following page; it stays valid while rows
+        are inserted or deleted, unlike OFFSET paging. Returns a utils.pagination.Page.
+        """
+        return fetch_page(self, columns, table, sort_column, where=where, params=params,
+                          page_size=page_size, token=token, descending=descending)
+
+    def submit_page(self, columns, table, sort_column, on_done, where="", params=(), page_size=DEFAULT_PAGE_SIZE,
+                    token=None, descending=False, on_error=None):
+        """fetch_page() on a worker thread; on_done(page) runs on the Tk thread."""
+        return self.submit_call(
+            lambda: self.fetch_page(columns, table, sort_column, where=where, params=params,
+                                    page_size=page_size, token=token, descending=descending),
+            on_done=on_done, on_error=on_error
+        )
+
+    # --- Background queries ---
+    def start_executor(self, root, workers=2):
+        """Starts worker threads for submit()/submit_call(). Results are delivered through root.after()."""
+        if self.executor is None:
+            self.executor = BackgroundExecutor(root, workers=workers)
+        return self.executor
+
+    def submit(self, query, params=(), on_done=None, fetch="all", on_error=None):
+        """
+        Runs a SELECT off the Tk thread and calls on_done(rows) back on it.
+        fetch="one" passes a single row (or None) instead of a list.
+        """
+        fetcher = self.fetch_one if fetch == "one" else self.fetch_all
+        return self.submit_call(fetcher, (query, params), on_done=on_done, on_error=on_error)
+
+    def submit_call(self, fn, args=(), on_done=None, on_error=None):
+        """
+        Runs fn(*args) on a worker thread. Use this when a screen needs several queries
+        at once. Without a started executor (e.g. headless scripts) it runs inline.
+        """
+        if self.executor is not None:
+            return self.executor.submit_call(fn, args, on_done=on_done, on_error=on_error)
+        return run_inline(fn, args, on_done, on_error)
 
     def create_tables(self):
+        """Brings the schema up to date by applying any pending migrations (see utils/migrations.py)."""
         self.connect()
-        queries = [
-            """
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                email TEXT UNIQUE NOT NULL,
-                password TEXT NOT NULL
-            );
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS products (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                price REAL NOT NULL,
-                stock_quantity INTEGER NOT NULL,
-                image_path TEXT,
-                category TEXT,
-                description TEXT,
-                rating REAL DEFAULT 0.0,
-                sales_count INTEGER DEFAULT 0
-            );
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS addresses (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                address_line TEXT NOT NULL,
-                contact_name TEXT NOT NULL,
-                contact_no TEXT NOT NULL,
-                FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
-            );
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS orders (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                order_date TEXT NOT NULL,
-                total_amount REAL NOT NULL,
-                status TEXT NOT NULL, -- e.g., 'Pending', 'Shipped', 'Delivered', 'Cancelled'
-                FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
-            );
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS order_items (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                order_id INTEGER NOT NULL,
-                product_id INTEGER NOT NULL,
-                quantity INTEGER NOT NULL,
-                item_price_at_order REAL NOT NULL,
-                FOREIGN KEY (order_id) REFERENCES orders(id) ON DELETE CASCADE,
-                FOREIGN KEY (product_id) REFERENCES products(id) ON DELETE CASCADE
-            );
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS contact_messages (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER, -- NULLable if not logged in
-                name TEXT NOT NULL,
-                email TEXT NOT NULL,
-                message TEXT NOT NULL,
-                timestamp TEXT NOT NULL,
-                FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE SET NULL
-            );
-            """
-        ]
-        for query in queries:
-            if not self.execute_query(query):
-                print(f"Failed to create table with query: {query}")
+        try:
+            migrate(self.conn)
+        except sqlite3.Error as e:
+            print(f"Database migration failed: {e}")
         print("Database tables checked/created.")
 
         # Seed initial data for products if table is empty
@@ -0,0 +1,109 @@
+import queue
+import threading
+import traceback
+
+
+class Job:
+    """Handle for a query submitted to the BackgroundExecutor."""
+
+    def __init__(self, fn, args, on_done, on_error):
+        self.fn = fn
+        self.args = args
+        self.on_done = on_done
+        self.on_error = on_error
+        self.cancelled = False
+
+    def cancel(self):
+        """Drops the result when it arrives (the query itself still runs to completion)."""
+        self.cancelled = True
+
+
+def run_inline(fn, args=(), on_done=None, on_error=None):
+    """submit_call() without worker threads (e.g. headless scripts): runs fn(*args) and the callbacks now."""
+    try:
+        result = fn(*args)
+    except Exception as e:
+        if on_error is None:
+            raise
+        on_error(e)
+        return None
+    if on_done:
+        on_done(result)
+    return None
+
+
+class BackgroundExecutor:
+    """
+    Runs database work on worker threads and hands the results back on the Tk thread.
+
+    Workers never touch Tk. They push finished jobs onto a results queue, and the Tk
+    thread drains it with after() polling while anything is in flight, so on_done and
+    on_error callbacks always run on the mainloop and may update widgets freely.
+    submit_call() must be called from the Tk thread.
+    """
+
+    def __init__(self, root, workers=2, poll_interval=15, name="db-worker"):
+        self.root = root
+        self.poll_interval = poll_interval
+        self._jobs = queue.Queue()
+        self._results = queue.Queue()
+        self._pending = 0
+        self._polling = False
+        self._threads = []
+        for i in range(workers):
+            thread = threading.Thread(target=self._worker, name=f"{name}-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit_call(self, fn, args=(), on_done=None, on_error=None):
+        """Runs fn(*args) on a worker thread; on_done(result) / on_error(exc) run on the Tk thread."""
+        job = Job(fn, args, on_done, on_error)
+        self._pending += 1
+        self._jobs.put(job)
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_interval, self._poll)
+        return job
+
+    def shutdown(self):
+        for _ in self._threads:
+            self._jobs.put(None)
+
+    def _worker(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            if job.cancelled:
+                self._results.put((job, None, None))
+                continue
+            try:
+                result = job.fn(*job.args)
+                self._results.put((job, result, None))
+            except Exception as e:
+                self._results.put((job, None, e))
+
+    def _poll(self):
+        while True:
+            try:
+                job, result, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._pending -= 1
+            if job.cancelled:
+                continue
+            try:
+                if error is not None:
+                    if job.on_error:
+                        job.on_error(error)
+                    else:
+                        print(f"Background query failed: {error}")
+                elif job.on_done:
+                    job.on_done(result)
+            except Exception:
+                traceback.print_exc()
+
+        if self._pending > 0:
+            self.root.after(self.poll_interval, self._poll)
+        else:
+            self._polling = False
@@ -0,0 +1,165 @@
+import ctypes
+import ctypes.util
+import os
+import sys
+import tkinter as tk
+import tkinter.font as tkFont
+from collections import OrderedDict
+
+from utils.helpers import CUSTOM_FONT_FILES, FONT_SPECS
+
+MEASURE_CACHE_SIZE = 8192 # (font, text) -> pixel width entries kept
+ELLIPSIS = "…"
+FR_PRIVATE = 0x10 # AddFontResourceEx: only this process sees the font
+
+
+def register_font_file(path):
+    """
+    Makes a .ttf file available to Tk for this process, without installing it.
+    Returns True if the platform accepted it. Tk has no command for this itself.
+    """
+    if not os.path.exists(path):
+        return False
+    try:
+        if sys.platform == "win32":
+            return ctypes.windll.gdi32.AddFontResourceExW(path, FR_PRIVATE, 0) > 0
+        library = ctypes.util.find_library("fontconfig") # X11 Tk renders through Xft/fontconfig
+        if library:
+            fontconfig = ctypes.CDLL(library)
+            return bool(fontconfig.FcConfigAppFontAddFile(None, os.fsencode(path)))
+    except (OSError, AttributeError) as e:
+        print(f"Warning: Could not register font file {path}: {e}")
+    return False
+
+
+class FontRegistry:
+    """
+    Creates the app's named fonts once on the real Tk root and measures text with them.
+
+    Widgets use the names from utils/helpers (GLOBAL_FONT, TITLE_FONT, ...) and Tk
+    resolves them to the shared fonts created here. Custom font files are registered
+    with the OS before the fonts are created; when one is not available the next
+    family in its FONT_SPECS entry is used.
+
+    measure() remembers the width of every (font, text) pair, so wrapping and
+    truncating product names in the list screens only asks Tk about text it has not
+    seen before.
+    """
+
+    def __init__(self, root, specs=None, font_files=None):
+        self.root = root
+        self.fonts = {}      # name -> tkFont.Font
+        self.families = {}   # name -> family actually used
+        self.custom_files = [path for path in (font_files if font_files is not None else CUSTOM_FONT_FILES)
+                             if register_font_file(path)]
+        self._measure_cache = OrderedDict()
+        self._linespace = {}
+        self.hits = 0
+        self.misses = 0
+
+        available = set(tkFont.families(root))
+        for name, (size, candidates) in (specs if specs is not None else FONT_SPECS).items():
+            family, weight = next(((f, w) for f, w in candidates if f in available), candidates[-1])
+            self.families[name] = family
+            self.fonts[name] = self._create(name, family, size, weight)
+
+    def _create(self, name, family, size, weight):
+        try:
+            return tkFont.Font(root=self.root, name=name, family=family, size=size, weight=weight)
+        except tk.TclError: # Already created on this root (e.g. a second registry)
+            font = tkFont.Font(root=self.root, name=name, exists=True)
+            font.configure(family=family, size=size, weight=weight)
+            return font
+
+    def get(self, name):
+        """Returns the shared tkFont.Font for a registered name."""
+        return self.fonts[name]
+
+    # --- Measuring ---
+    def measure(self, text, font):
+        """Width of text in pixels, memoized per (font name, text)."""
+        key = (font, text)
+        width = self._measure_cache.get(key)
+        if width is not None:
+            self._measure_cache.move_to_end(key)
+            self.hits += 1
+            return width
+        self.misses += 1
+        width = self.fonts[font].measure(text)
+        self._measure_cache[key] = width
+        if len(self._measure_cache) > MEASURE_CACHE_SIZE:
+            self._measure_cache.popitem(last=False)
+        return width
+
+    def linespace(self, font):
+        if font not in self._linespace:
+            self._linespace[font] = self.fonts[font].metrics("linespace")
+        return self._linespace[font]
+
+    def truncate(self, text, font, width):
+        """Returns text, or the longest prefix of it plus an ellipsis, that fits in width pixels."""
+        if self.measure(text, font) <= width:
+            return text
+        low, high = 0, len(text) # Binary search on the prefix length
+        while low < high:
+            mid = (low + high + 1) // 2
+            if self.measure(text[:mid].rstrip() + ELLIPSIS, font) <= width:
+                low = mid
+            else:
+                high = mid - 1
+        return text[:low].rstrip() + ELLIPSIS
+
+    def wrap(self, text, font, width, max_lines=None):
+        """
+        Breaks text into lines no wider than width pixels, at spaces where possible.
+        With max_lines, the last line is truncated with an ellipsis if text does not fit.
+        """
+        lines = []
+        words = text.split()
+        current = ""
+        i = 0
+        while i < len(words) and not (max_lines and len(lines) == max_lines):
+            candidate = f"{current} {words[i]}" if current else words[i]
+            if self.measure(candidate, font) <= width:
+                current = candidate
+                i += 1
+            elif current:
+                lines.append(current)
+                current = ""
+            else: # A single word wider than the line: split it
+                cut = self._fit_prefix(words[i], font, width)
+                lines.append(words[i][:cut])
+                words[i] = words[i][cut:]
+        if current:
+            lines.append(current)
+        if i < len(words): # Ran out of lines
+            lines[-1] = self.truncate(" ".join([lines[-1]] + words[i:]), font, width)
+        return "\n".join(lines)
+
+    def _fit_prefix(self, word, font, width):
+        low, high = 1, len(word)
+        while low < high:
+            mid = (low + high + 1) // 2
+            if self.measure(word[:mid], font) <= width:
+                low = mid
+            else:
+                high = mid - 1
+        return low
+
+    # --- Reporting ---
+    def stats(self):
+        return {
+            "fonts": dict(self.families),
+            "custom_files": [os.path.basename(path) for path in self.custom_files],
+            "measure_entries": len(self._measure_cache),
+            "measure_hits": self.hits,
+            "measure_misses": self.misses,
+        }
+
+    def report(self):
+        stats = self.stats()
+        lookups = stats["measure_hits"] + stats["measure_misses"]
+        hit_rate = (stats["measure_hits"] / lookups * 100.0) if lookups else 0.0
+        families = ", ".join(f"{name}={family}" for name, family in stats["fonts"].items())
+        return (f"Fonts: {families}\n"
+                f"Text measurements: {lookups} lookups, {hit_rate:.0f}% cached, {stats['measure_entries']} entries")
@@ -2,12 +2,14 @@ import bcrypt
 from PIL import Image, ImageTk, ImageDraw, ImageFont
 import os
 import tkinter as tk
-import tkinter.font as tkFont
+
+from utils.image_cache import image_cache
+from utils.thumbnails import decode_image
 
 # --- Path Constants ---
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 IMAGE_DIR = os.path.join(BASE_DIR, 'assets', 'images')
-FONT_DIR = os.path.join(BASE_DIR, 'assets', 'fonts')
+FONT_DIR = os.path.join(BASE_DIR, 'assets', 'font')
 
 PUP_LOGO_PATH = os.path.join(IMAGE_DIR, 'pup_logo.png')
 QUESTION_MARK_PATH = os.path.join(IMAGE_DIR, 'question_mark.png')
@@ -17,7 +19,7 @@ PUP_CAMPUS_PATH = os.path.join(IMAGE_DIR, 'pup_campus.png')
 ADD_TO_CART_BTN_PATH = os.path.join(IMAGE_DIR, 'add_to_cart.png')
 BUY_NOW_BTN_PATH = os.path.join(IMAGE_DIR, 'buy_now.png')
 CHECK_MARK_PATH = os.path.join(IMAGE_DIR, 'check_mark.png')
-ROCA_ONE_FONT_PATH = os.path.join(FONT_DIR, "RocaOne.ttf") # <--- ENSURE THIS IS DEFINED
+ROCA_ONE_FONT_PATH = os.path.join(FONT_DIR, "RocaOne.ttf")
 
 # --- Color Constants ---
 PUP_RED = "#9F2228"
@@ -29,55 +31,28 @@ LIGHT_BG = "#F5F5F5"
 WHITE_BG = "#FFFFFF"
 BORDER_COLOR = "#D1D1D1"
 
-# --- Font Constants (Initial defaults - will be updated by load_custom_fonts) ---
-GLOBAL_FONT = ("Segoe UI", 8)
-GLOBAL_FONT_BOLD = ("Segoe UI", 8, "bold")
-BUTTON_FONT = ("Segoe UI", 10, "bold")
-
-# These variables are directly imported by other modules.
-# They start as string tuples (fallback) and are updated to tkFont.Font objects if custom font loads.
-TITLE_FONT = ("Segoe UI", 13, "bold") # <--- Initialized with fallback
-HEADER_FONT = ("Segoe UI", 18, "bold") # <--- Initialized with fallback
-
-# Global variables to store tkFont.Font instances
-# (These specifically hold the objects that Tkinter widgets will use)
-_header_font_instance = None
-_title_font_instance = None
-_roca_one_loaded_flag = False
-
-def load_custom_fonts():
-    """
-    Loads custom fonts. This function MUST be called AFTER tk.Tk() is initialized.
-    It updates the global TITLE_FONT and HEADER_FONT variables to Tkinter Font objects.
-    """
-    global _header_font_instance, _title_font_instance, _roca_one_loaded_flag
-    global TITLE_FONT, HEADER_FONT # Declare intent to modify these global variables
-
-    if _roca_one_loaded_flag: # Only load once
-        return
-
-    try:
-        # Register the font file with Tkinter's font system.
-        # This makes the font available by its family name.
-        # We give it a unique name 'RocaOneCustom' to avoid conflicts.
-        tk.Tk().tk.call('font', 'create', 'RocaOneCustom', '-family', 'RocaOne', '-file', ROCA_ONE_FONT_PATH)
-        
-        # Create tkFont.Font instances using the custom family name
-        _header_font_instance = tkFont.Font(family='RocaOneCustom', size=18)
-        _title_font_instance = tkFont.Font(family='RocaOneCustom', size=13)
-        
-        _roca_one_loaded_flag = True
-        print(f"Successfully loaded custom font: {ROCA_ONE_FONT_PATH}")
-
-        # Assign the loaded tkFont.Font instances to the global font constants
-        # Other modules will now use these objects after this function runs.
-        HEADER_FONT = _header_font_instance
-        TITLE_FONT = _title_font_instance
-
-    except Exception as e: # Catch any generic exception during font loading
-        print(f"Warning: Could not load custom font '{ROCA_ONE_FONT_PATH}'. Using fallback fonts. Error: {e}")
-        _roca_one_loaded_flag = False
-        # Fallback fonts (Segoe UI bold) are already set as initial defaults, so no change needed here.
+# --- Font Constants ---
+# These are Tk named fonts, created once on the App root by utils/fonts.FontRegistry.
+# Widgets refer to them by name, so they pick up the custom font (or the fallback)
+# no matter when a screen module imported the constant.
+GLOBAL_FONT = "PupBody"
+GLOBAL_FONT_BOLD = "PupBodyBold"
+BUTTON_FONT = "PupButton"
+TITLE_FONT = "PupTitle"
+HEADER_FONT = "PupHeader"
+
+FALLBACK_FONT_FAMILY = "Segoe UI"
+CUSTOM_FONT_FAMILY = "Roca One" # Family name inside RocaOne.ttf
+CUSTOM_FONT_FILES = [ROCA_ONE_FONT_PATH]
+
+# name -> (size, [(family, weight), ...]); the first family that is available wins
+FONT_SPECS = {
+    GLOBAL_FONT: (8, [(FALLBACK_FONT_FAMILY, "normal")]),
+    GLOBAL_FONT_BOLD: (8, [(FALLBACK_FONT_FAMILY, "bold")]),
+    BUTTON_FONT: (10, [(FALLBACK_FONT_FAMILY, "bold")]),
+    TITLE_FONT: (13, [(CUSTOM_FONT_FAMILY, "normal"), (FALLBACK_FONT_FAMILY, "bold")]),
+    HEADER_FONT: (18, [(CUSTOM_FONT_FAMILY, "normal"), (FALLBACK_FONT_FAMILY, "bold")]),
+}
 
 
 # --- Helper Functions (rest remains largely same) ---
@@ -87,13 +62,16 @@ def hash_password(password):
 def check_password(password, hashed_password):
     return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
 
-def load_image(path, size=None):
-    """Loads an image and returns a PhotoImage object."""
+def load_image(path, size=None, cache=True):
+    """
+    Loads an image and returns a PhotoImage object.
+    Goes through the shared image cache (utils/image_cache.py) unless cache=False, so
+    callers get the same PhotoImage back for the same file and size.
+    """
     try:
-        img = Image.open(path)
-        if size:
-            img = img.resize(size, Image.LANCZOS)
-        return ImageTk.PhotoImage(img)
+        if cache:
+            return image_cache.get(path, size)
+        return ImageTk.PhotoImage(decode_image(path, size, image_cache.quality))
     except FileNotFoundError:
         # print(f"Error: Image not found at {path}") # Comment out to reduce console spam
         return None
@@ -0,0 +1,148 @@
+import os
+import threading
+from collections import OrderedDict
+
+from PIL import ImageTk
+
+from utils.thumbnails import DEFAULT_RESIZE_QUALITY, RESIZE_QUALITIES, ThumbnailStore, decode_image
+
+DEFAULT_BUDGET_BYTES = 32 * 1024 * 1024 # ~32 MB of decoded pixels
+
+
+def image_nbytes(img):
+    """Approximate memory held by a decoded image (the PhotoImage copy is the same order of size)."""
+    return img.width * img.height * len(img.getbands())
+
+
+class ImageCache:
+    """
+    LRU cache of ready-to-display PhotoImages keyed by (path, mtime, size).
+
+    Keying on the file's mtime means an image replaced on disk is decoded again
+    instead of being served stale. Entries are evicted least-recently-used first
+    once the decoded pixels exceed budget_bytes. get() must be called on the Tk thread.
+
+    With a ThumbnailStore, resized misses are served from pre-resized files on disk
+    before falling back to decoding the full source.
+    """
+
+    def __init__(self, budget_bytes=DEFAULT_BUDGET_BYTES, thumbnails=None, quality=DEFAULT_RESIZE_QUALITY):
+        self.budget_bytes = budget_bytes
+        self.thumbnails = thumbnails
+        self.quality = quality
+        self._entries = OrderedDict() # key -> (photo, nbytes)
+        self._lock = threading.Lock()
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(path, size=None):
+        """Returns the cache key for path at size, or None if the file does not exist."""
+        path = os.path.abspath(path)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        return (path, mtime, tuple(size) if size else None)
+
+    def lookup(self, key):
+        """Returns the cached PhotoImage for key (counting a hit) or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, photo, nbytes):
+        """Stores photo under key and evicts old entries until the budget is met."""
+        with self._lock:
+            self.misses += 1
+            if nbytes > self.budget_bytes:
+                return # Larger than the whole budget: hand it out, but never keep it
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes_used -= old[1]
+            self._entries[key] = (photo, nbytes)
+            self.bytes_used += nbytes
+            while self.bytes_used > self.budget_bytes and self._entries:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self.bytes_used -= evicted_bytes
+                self.evictions += 1
+
+    def get(self, path, size=None):
+        """
+        Returns a PhotoImage for path resized to size, decoding it only on a cache miss.
+        Raises FileNotFoundError if the file is missing (like Image.open would).
+        """
+        key = self.make_key(path, size)
+        if key is None:
+            raise FileNotFoundError(path)
+        photo = self.lookup(key)
+        if photo is not None:
+            return photo
+        img = self.decode(path, size)
+        photo = ImageTk.PhotoImage(img)
+        self.put(key, photo, image_nbytes(img))
+        return photo
+
+    def decode(self, path, size=None):
+        """The miss path of get(): a PIL image of path at size. Safe to call from any thread."""
+        if size and self.thumbnails is not None:
+            return self.thumbnails.load(path, size)
+        return decode_image(path, size, self.quality)
+
+    def set_quality(self, quality):
+        """Switches the resize quality ("best", "balanced" or "fast") for new decodes."""
+        if quality not in RESIZE_QUALITIES:
+            raise ValueError(f"Unknown image quality {quality!r}; expected one of {', '.join(RESIZE_QUALITIES)}")
+        self.quality = quality
+        if self.thumbnails is not None:
+            self.thumbnails.quality = quality
+        self.clear()
+
+    def set_budget(self, budget_bytes):
+        """Changes the memory budget, evicting immediately if the cache is now over it."""
+        with self._lock:
+            self.budget_bytes = budget_bytes
+            while self.bytes_used > self.budget_bytes and self._entries:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self.bytes_used -= evicted_bytes
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes_used = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes_used": self.bytes_used,
+                "budget_bytes": self.budget_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+    def report(self):
+        s = self.stats()
+        return (f"Image cache: {s['entries']} images, {s['bytes_used'] / 1048576:.1f}/{s['budget_bytes'] / 1048576:.1f} MB, "
+                f"{s['hits']} hits, {s['misses']} misses ({s['hit_rate']:.0%} hit rate), {s['evictions']} evictions"
+                + self._thumbnail_report())
+
+    def _thumbnail_report(self):
+        if self.thumbnails is None:
+            return ""
+        t = self.thumbnails.stats()
+        return f"; thumbnails on disk: {t['hits']} hits, {t['misses']} misses, {t['writes']} written"
+
+
+# Shared by every screen through utils.helpers.load_image.
+image_cache = ImageCache(thumbnails=ThumbnailStore())
@@ -0,0 +1,124 @@
+import tkinter as tk
+
+from PIL import ImageTk
+
+from utils.db_executor import BackgroundExecutor
+from utils.image_cache import image_cache, image_nbytes
+
+PLACEHOLDER_COLOR = "#EDEDED"
+
+
+class ImageLoader:
+    """
+    Loads images for labels without blocking the mainloop.
+
+    load_into() shows a placeholder right away (or the real image, if it is already in
+    the memory cache) and decodes/resizes the file on a worker pool of its own, so image
+    work never queues behind database queries. The PhotoImage itself is created on the
+    Tk thread when the result comes back through after() and swapped into the label.
+
+    A request is cancelled when its label is destroyed, when the same label asks for
+    another image, or explicitly through cancel(label). Labels waiting on the same
+    (path, size) share one decode.
+    """
+
+    def __init__(self, root, cache=image_cache, workers=2):
+        self.root = root
+        self.cache = cache
+        self.executor = BackgroundExecutor(root, workers=workers, name="image-worker")
+        self._placeholders = {} # size -> PhotoImage
+        self._pending = {}      # cache key -> (job, set of waiting labels)
+        self._requests = {}     # label -> cache key it is waiting for
+
+    def placeholder(self, size):
+        """A flat grey PhotoImage of size, created once and shared."""
+        photo = self._placeholders.get(size)
+        if photo is None:
+            width, height = size
+            photo = tk.PhotoImage(master=self.root, width=width, height=height)
+            photo.put(PLACEHOLDER_COLOR, to=(0, 0, width, height))
+            self._placeholders[size] = photo
+        return photo
+
+    def load_into(self, label, path, size, on_missing=None):
+        """
+        Puts the image at path (resized to size) into label, via a placeholder if it still
+        has to be decoded. on_missing(label) runs instead if the file cannot be loaded.
+        """
+        size = tuple(size)
+        self.cancel(label)
+        key = self.cache.make_key(path, size)
+        if key is None:
+            self._missing(label, on_missing)
+            return
+        photo = self.cache.lookup(key)
+        if photo is not None:
+            self._show(label, photo)
+            return
+
+        self._show(label, self.placeholder(size))
+        if not getattr(label, "_image_loader_bound", False):
+            label.bind("<Destroy>", lambda event, label=label: self.cancel(label), add="+")
+            label._image_loader_bound = True
+        self._requests[label] = key
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            pending[1].add((label, on_missing))
+            return
+        job = self.executor.submit_call(
+            self.cache.decode, (path, size),
+            on_done=lambda img, key=key: self._on_decoded(key, img),
+            on_error=lambda error, key=key: self._on_failed(key, error)
+        )
+        self._pending[key] = (job, {(label, on_missing)})
+
+    def cancel(self, label):
+        """Stops waiting for label's image; the decode itself is dropped if nobody else needs it."""
+        key = self._requests.pop(label, None)
+        if key is None:
+            return
+        pending = self._pending.get(key)
+        if pending is None:
+            return
+        job, waiters = pending
+        waiters.difference_update({w for w in waiters if w[0] is label})
+        if not waiters:
+            job.cancel()
+            del self._pending[key]
+
+    def shutdown(self):
+        self.executor.shutdown()
+
+    def _waiters(self, key):
+        _, waiters = self._pending.pop(key, (None, set()))
+        for label, on_missing in waiters:
+            if self._requests.get(label) == key:
+                del self._requests[label]
+                yield label, on_missing
+
+    def _on_decoded(self, key, img):
+        photo = ImageTk.PhotoImage(img, master=self.root)
+        self.cache.put(key, photo, image_nbytes(img))
+        for label, _ in self._waiters(key):
+            self._show(label, photo)
+
+    def _on_failed(self, key, error):
+        if not isinstance(error, FileNotFoundError):
+            print(f"Error loading image {key[0]}: {error}")
+        for label, on_missing in self._waiters(key):
+            self._missing(label, on_missing)
+
+    def _show(self, label, photo):
+        if label.winfo_exists():
+            label.configure(image=photo)
+            label.image = photo # Keep a reference so Tk doesn't drop the image
+
+    def _missing(self, label, on_missing):
+        if not label.winfo_exists():
+            return
+        if on_missing is not None:
+            on_missing(label)
+        else:
+            label.configure(image="", text="[No Image]")
+            label.image = None
@@ -0,0 +1,165 @@
+import json
+import logging
+import re
+import threading
+import time
+
+logger = logging.getLogger("pupshop.db")
+
+# Latency histogram bucket upper bounds, in milliseconds. The last bucket catches everything above.
+BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, float("inf"))
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*\?\s*,)*\s*\?\s*\)", re.IGNORECASE)
+
+
+def normalize_sql(sql):
+    """
+    Collapses a statement to its shape so that e.g. every "WHERE id IN (1,2,3)" variant
+    built by the cart screens is counted as one statement.
+    """
+    sql = _WHITESPACE.sub(" ", sql).strip().rstrip(";")
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    return _IN_LIST.sub("IN (...)", sql)
+
+
+class LatencyHistogram:
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS_MS)
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, elapsed_ms):
+        for i, bound in enumerate(BUCKETS_MS):
+            if elapsed_ms <= bound:
+                self.counts[i] += 1
+                break
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def percentile(self, pct):
+        """Upper bound of the bucket holding the pct-th percentile (max for the open bucket)."""
+        if not self.count:
+            return 0.0
+        rank = pct / 100.0 * self.count
+        seen = 0
+        for bound, n in zip(BUCKETS_MS, self.counts):
+            seen += n
+            if seen >= rank:
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "p50_ms": round(self.percentile(50), 3),
+            "p95_ms": round(self.percentile(95), 3),
+            "max_ms": round(self.max_ms, 3),
+            "buckets": {("inf" if b == float("inf") else str(b)): n for b, n in zip(BUCKETS_MS, self.counts) if n},
+        }
+
+
+class QueryStats:
+    """
+    Per-statement latency histograms, a slow-query log and per-screen query counts.
+
+    screen_provider is a zero-argument callable returning the name of the active screen
+    (App wires it to App.current_frame_name); queries run outside any screen are counted
+    under "-".
+    """
+
+    def __init__(self, slow_query_ms=50.0, screen_provider=None, max_slow_queries=100):
+        self.slow_query_ms = slow_query_ms
+        self.screen_provider = screen_provider
+        self.max_slow_queries = max_slow_queries
+        self.histograms = {}
+        self.screen_counts = {}
+        self.slow_queries = []
+        self.started = time.time()
+        self._lock = threading.Lock()
+
+    def current_screen(self):
+        if self.screen_provider is None:
+            return "-"
+        try:
+            return self.screen_provider() or "-"
+        except Exception:
+            return "-"
+
+    def record(self, sql, elapsed_ms, error=None):
+        """Records one execution. Returns True if it counts as a slow query."""
+        key = normalize_sql(sql)
+        screen = self.current_screen()
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = LatencyHistogram()
+            histogram.add(elapsed_ms)
+            if error is not None:
+                histogram.errors += 1
+            per_screen = self.screen_counts.setdefault(screen, {})
+            per_screen[key] = per_screen.get(key, 0) + 1
+        return error is None and elapsed_ms >= self.slow_query_ms
+
+    def record_slow(self, sql, params, elapsed_ms, plan):
+        entry = {
+            "sql": normalize_sql(sql),
+            "params": [repr(p) for p in params],
+            "elapsed_ms": round(elapsed_ms, 3),
+            "screen": self.current_screen(),
+            "thread": threading.current_thread().name,
+            "plan": plan,
+            "at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        with self._lock:
+            self.slow_queries.append(entry)
+            del self.slow_queries[:-self.max_slow_queries]
+        logger.warning("Slow query (%.1f ms on %s): %s | plan: %s",
+                       elapsed_ms, entry["screen"], entry["sql"], "; ".join(plan) or "n/a")
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self.screen_counts.clear()
+            self.slow_queries.clear()
+            self.started = time.time()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "uptime_s": round(time.time() - self.started, 3),
+                "slow_query_ms": self.slow_query_ms,
+                "statements": {sql: h.to_dict() for sql, h in self.histograms.items()},
+                "screens": {screen: dict(counts) for screen, counts in self.screen_counts.items()},
+                "slow_queries": list(self.slow_queries),
+            }
+
+    def report(self, top=15):
+        """Human-readable summary: slowest statements by total time, then per-screen counts."""
+        data = self.snapshot()
+        lines = [f"Query report ({data['uptime_s']:.0f}s, slow threshold {self.slow_query_ms:g} ms)"]
+        statements = sorted(data["statements"].items(), key=lambda item: item[1]["total_ms"], reverse=True)
+        lines.append(f"{'count':>7} {'err':>4} {'total ms':>10} {'p50':>7} {'p95':>7} {'max':>8}  statement")
+        for sql, h in statements[:top]:
+            lines.append(f"{h['count']:>7} {h['errors']:>4} {h['total_ms']:>10.1f} {h['p50_ms']:>7.2f} "
+                         f"{h['p95_ms']:>7.2f} {h['max_ms']:>8.1f}  {sql[:100]}")
+        lines.append("Queries per screen:")
+        for screen, counts in sorted(data["screens"].items()):
+            lines.append(f"  {screen}: {sum(counts.values())} queries, {len(counts)} distinct")
+        if data["slow_queries"]:
+            lines.append(f"Slow queries logged: {len(data['slow_queries'])}")
+        return "\n".join(lines)
+
+    def dump(self, path):
+        """Writes the full snapshot as JSON."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, indent=2)
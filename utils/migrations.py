@@ -0,0 +1,202 @@
+import sqlite3
+
+# Ordered schema migrations. Each entry is (version, description, statements).
+# The database records the last applied version in PRAGMA user_version, so a
+# migration runs exactly once per database file. Never edit a released step;
+# append a new one instead.
+MIGRATIONS = [
+    (1, "baseline schema", [
+        """
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            email TEXT UNIQUE NOT NULL,
+            password TEXT NOT NULL
+        );
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS products (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            price REAL NOT NULL,
+            stock_quantity INTEGER NOT NULL,
+            image_path TEXT,
+            category TEXT,
+            description TEXT,
+            rating REAL DEFAULT 0.0,
+            sales_count INTEGER DEFAULT 0
+        );
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS addresses (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            address_line TEXT NOT NULL,
+            contact_name TEXT NOT NULL,
+            contact_no TEXT NOT NULL,
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+        );
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS orders (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            order_date TEXT NOT NULL,
+            total_amount REAL NOT NULL,
+            status TEXT NOT NULL, -- e.g., 'Pending', 'Shipped', 'Delivered', 'Cancelled'
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+        );
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS order_items (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            order_id INTEGER NOT NULL,
+            product_id INTEGER NOT NULL,
+            quantity INTEGER NOT NULL,
+            item_price_at_order REAL NOT NULL,
+            FOREIGN KEY (order_id) REFERENCES orders(id) ON DELETE CASCADE,
+            FOREIGN KEY (product_id) REFERENCES products(id) ON DELETE CASCADE
+        );
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS contact_messages (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER, -- NULLable if not logged in
+            name TEXT NOT NULL,
+            email TEXT NOT NULL,
+            message TEXT NOT NULL,
+            timestamp TEXT NOT NULL,
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE SET NULL
+        );
+        """,
+    ]),
+    (2, "covering indexes for order history, addresses and product listings", [
+        # OrderHistoryScreen: WHERE user_id = ? ORDER BY order_date DESC
+        "CREATE INDEX IF NOT EXISTS idx_orders_user_date ON orders (user_id, order_date, total_amount, status);",
+        # Per-order item totals: WHERE order_id = ? -> SUM(quantity)
+        "CREATE INDEX IF NOT EXISTS idx_order_items_order ON order_items (order_id, quantity);",
+        # ProfileScreen: WHERE user_id = ? ORDER BY id
+        "CREATE INDEX IF NOT EXISTS idx_addresses_user ON addresses (user_id, id, address_line, contact_name, contact_no);",
+        # HomeScreen: ORDER BY name
+        "CREATE INDEX IF NOT EXISTS idx_products_name ON products (name, price, image_path, sales_count);",
+        # InventoryManagementScreen: ORDER BY id, without dragging descriptions through the cache
+        "CREATE INDEX IF NOT EXISTS idx_products_inventory ON products (id, name, stock_quantity, price);",
+    ]),
+    (3, "per-order item summary maintained by triggers", [
+        # item_count = SUM(order_items.quantity), line_count = number of order_items rows.
+        "ALTER TABLE orders ADD COLUMN item_count INTEGER NOT NULL DEFAULT 0;",
+        "ALTER TABLE orders ADD COLUMN line_count INTEGER NOT NULL DEFAULT 0;",
+        """
+        UPDATE orders SET
+            item_count = COALESCE((SELECT SUM(quantity) FROM order_items WHERE order_id = orders.id), 0),
+            line_count = (SELECT COUNT(*) FROM order_items WHERE order_id = orders.id);
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_order_items_insert AFTER INSERT ON order_items
+        BEGIN
+            UPDATE orders SET item_count = item_count + NEW.quantity, line_count = line_count + 1
+            WHERE id = NEW.order_id;
+        END;
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_order_items_delete AFTER DELETE ON order_items
+        BEGIN
+            UPDATE orders SET item_count = item_count - OLD.quantity, line_count = line_count - 1
+            WHERE id = OLD.order_id;
+        END;
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_order_items_update AFTER UPDATE OF quantity, order_id ON order_items
+        BEGIN
+            UPDATE orders SET item_count = item_count - OLD.quantity, line_count = line_count - 1
+            WHERE id = OLD.order_id;
+            UPDATE orders SET item_count = item_count + NEW.quantity, line_count = line_count + 1
+            WHERE id = NEW.order_id;
+        END;
+        """,
+        # Rebuild the order history index so it also covers the new summary column.
+        "DROP INDEX IF EXISTS idx_orders_user_date;",
+        "CREATE INDEX idx_orders_user_date ON orders (user_id, order_date, total_amount, status, item_count);",
+    ]),
+    (4, "full-text product search (FTS5) kept in sync by triggers", [
+        # External-content table: the text lives in products only, the FTS table holds just the index.
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(
+            name, description, category,
+            content='products', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        );
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_products_fts_insert AFTER INSERT ON products
+        BEGIN
+            INSERT INTO products_fts (rowid, name, description, category)
+            VALUES (NEW.id, NEW.name, NEW.description, NEW.category);
+        END;
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_products_fts_delete AFTER DELETE ON products
+        BEGIN
+            INSERT INTO products_fts (products_fts, rowid, name, description, category)
+            VALUES ('delete', OLD.id, OLD.name, OLD.description, OLD.category);
+        END;
+        """,
+        # Only text edits touch the index; stock and sales updates at checkout do not.
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_products_fts_update AFTER UPDATE OF name, description, category ON products
+        BEGIN
+            INSERT INTO products_fts (products_fts, rowid, name, description, category)
+            VALUES ('delete', OLD.id, OLD.name, OLD.description, OLD.category);
+            INSERT INTO products_fts (rowid, name, description, category)
+            VALUES (NEW.id, NEW.name, NEW.description, NEW.category);
+        END;
+        """,
+        "INSERT INTO products_fts (products_fts) VALUES ('rebuild');",
+    ]),
+    (5, "listing indexes ordered by (sort key, id) for keyset pagination", [
+        # With id right after the sort key, "WHERE (key, id) > (?, ?) ORDER BY key, id LIMIT ?"
+        # is a pure index range walk with no temp B-tree for the tie-breaker.
+        "DROP INDEX IF EXISTS idx_products_name;",
+        "CREATE INDEX idx_products_name ON products (name, id, price, image_path, sales_count);",
+        "DROP INDEX IF EXISTS idx_orders_user_date;",
+        "CREATE INDEX idx_orders_user_date ON orders (user_id, order_date, id, total_amount, status, item_count);",
+    ]),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn, target=LATEST_VERSION):
+    """
+    Applies every pending migration up to target, each in its own transaction.
+    Returns the list of versions that were applied.
+    """
+    applied = []
+    for version, description, statements in MIGRATIONS:
+        if version > target:
+            break
+        if version <= get_version(conn):
+            continue
+        if conn.in_transaction:
+            conn.commit()
+        # IMMEDIATE takes the write lock up front, so two kiosks starting at the same
+        # time cannot both apply the same step; re-check the version once we hold it.
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if version <= get_version(conn):
+                conn.rollback()
+                continue
+            for statement in statements:
+                conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {int(version)}")
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        print(f"Applied migration {version}: {description}")
+        applied.append(version)
+    return applied
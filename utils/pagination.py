@@ -0,0 +1,80 @@
+import base64
+import json
+
+DEFAULT_PAGE_SIZE = 50
+
+
+class Page:
+    """One page of a keyset-paginated listing. next_token is None on the last page."""
+
+    def __init__(self, rows, next_token):
+        self.rows = rows
+        self.next_token = next_token
+
+    @property
+    def has_more(self):
+        return self.next_token is not None
+
+
+def encode_token(sort_column, key):
+    """Opaque page token holding the (sort key, id) of the last row served."""
+    raw = json.dumps([sort_column, list(key)], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_token(token, sort_column, key_length):
+    """The key of a token from encode_token; raises ValueError for anything it could not have issued."""
+    try:
+        column, key = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid page token: {token!r}") from e
+    if column != sort_column:
+        raise ValueError(f"Page token was issued for a listing sorted by {column!r}, not {sort_column!r}")
+    # Tokens come back from clients, so a forged key must not reach the query as bind parameters
+    if (not isinstance(key, list) or len(key) != key_length
+            or not all(value is None or isinstance(value, (str, int, float)) for value in key)):
+        raise ValueError(f"Invalid page token: {token!r}")
+    return key
+
+
+def build_page_query(columns, table, sort_column, where="", descending=False, after_key=False, id_column="id"):
+    """
+    Builds the SELECT for one page. Rows are ordered by (sort_column, id_column), which
+    must be backed by an index on (..., sort_column, id_column) to stay a range walk.
+    The sort key and id are appended as hidden trailing columns; fetch_page strips them.
+    Parameters, in order: the caller's where params, the after-key values (if after_key), the limit.
+    """
+    direction = "DESC" if descending else "ASC"
+    op = "<" if descending else ">"
+    conditions = [f"({where})"] if where else []
+    if sort_column == id_column:
+        hidden = id_column
+        order = f"{id_column} {direction}"
+        if after_key:
+            conditions.append(f"{id_column} {op} ?")
+    else:
+        hidden = f"{sort_column}, {id_column}"
+        order = f"{sort_column} {direction}, {id_column} {direction}"
+        if after_key:
+            conditions.append(f"({sort_column}, {id_column}) {op} (?, ?)")
+    sql = f"SELECT {columns}, {hidden} FROM {table}"
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    return sql + f" ORDER BY {order} LIMIT ?"
+
+
+def fetch_page(db, columns, table, sort_column, where="", params=(), page_size=DEFAULT_PAGE_SIZE,
+               token=None, descending=False, id_column="id"):
+    """Runs one keyset page query and returns a Page (see Database.fetch_page)."""
+    params = list(params)
+    hidden = 1 if sort_column == id_column else 2
+    if token:
+        params.extend(decode_token(token, sort_column, hidden))
+    sql = build_page_query(columns, table, sort_column, where, descending, after_key=bool(token), id_column=id_column)
+    rows = db.fetch_all(sql, params + [page_size + 1])
+
+    next_token = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_token = encode_token(sort_column, rows[-1][-hidden:])
+    return Page([row[:-hidden] for row in rows], next_token)
@@ -0,0 +1,178 @@
+import tkinter as tk
+
+from utils.helpers import GLOBAL_FONT_BOLD, GRAY_TEXT, WHITE_BG
+
+
+class KeyedRows:
+    """
+    Keeps a packed column of row widgets in step with a list of items, keyed by id.
+
+    reconcile(items) diffs the new items against the rows already on screen: rows whose
+    key disappeared are destroyed, new keys get a row from create_row(parent, item),
+    rows whose item changed are passed to update_row(row, item), and rows that moved are
+    re-packed into place. Unchanged rows are left completely alone, so a refresh where
+    nothing changed touches no widgets at all.
+
+    key(item) defaults to item[0] (the id column of a query row).
+
+    With a renderer (utils/render_scheduler.ChunkedRenderer), render(items) does the same
+    work a few rows per idle slot, so a long list never blocks input while it is built.
+    """
+
+    def __init__(self, parent, create_row, update_row, key=None, empty_text=None, pack_options=None,
+                 renderer=None, on_render=None):
+        self.parent = parent
+        self.create_row = create_row
+        self.update_row = update_row
+        self.key = key or (lambda item: item[0])
+        self.empty_text = empty_text
+        self.pack_options = pack_options or {"fill": "x", "pady": 3, "padx": 3}
+        self.rows = {}   # key -> row widget
+        self.items = {}  # key -> item the row currently shows
+        self.order = []  # keys in on-screen order
+        self.renderer = renderer   # optional ChunkedRenderer used by render()
+        self.on_render = on_render # called after each chunk render() builds, e.g. to grow the scrollregion
+        self.pending = []          # items a chunked render is working towards
+        self._message_label = None
+
+    def reconcile(self, items):
+        """Makes the rows match items. Returns (created, updated, removed, moved) counts."""
+        self.cancel_render()
+        steps = self.reconcile_steps(items)
+        while True:
+            try:
+                next(steps)
+            except StopIteration as done:
+                return done.value
+
+    def reconcile_steps(self, items):
+        """
+        reconcile() as a generator that yields after every row it creates or updates, so a
+        ChunkedRenderer can spread the work over several idle slots. Closing it early leaves
+        the rows consistent: the ones already placed are in their new order, followed by
+        the old rows it had not reached yet.
+        """
+        new_keys = [self.key(item) for item in items]
+        new_items = dict(zip(new_keys, items))
+
+        removed = 0
+        for key in [k for k in self.order if k not in new_items]:
+            self.rows.pop(key).destroy()
+            del self.items[key]
+            removed += 1
+        old_order = [k for k in self.order if k in new_items]
+        self.order = old_order
+        self._show_empty(not new_keys)
+
+        created = updated = moved = 0
+        prev = None
+        j = 0
+        placed = set()
+        try:
+            for key in new_keys:
+                # Skip old rows that were already moved further up
+                while j < len(old_order) and old_order[j] in placed:
+                    j += 1
+                item = new_items[key]
+                row = self.rows.get(key)
+                changed = row is None or self.items[key] != item
+                if row is None:
+                    row = self.create_row(self.parent, item)
+                    self.rows[key] = row
+                    self._pack(row, prev, old_order[j] if j < len(old_order) else None)
+                    created += 1
+                else:
+                    if changed:
+                        self.update_row(row, item)
+                        updated += 1
+                    if j < len(old_order) and old_order[j] == key:
+                        j += 1
+                    else:
+                        self._pack(row, prev, old_order[j] if j < len(old_order) else None)
+                        moved += 1
+                self.items[key] = item
+                placed.add(key)
+                prev = row
+                if changed:
+                    yield
+        finally:
+            self.order = [k for k in new_keys if k in placed] + [k for k in old_order[j:] if k not in placed]
+        return created, updated, removed, moved
+
+    def render(self, items):
+        """
+        Like reconcile(), but built in time-sliced chunks through the renderer, if there is one.
+        Starting another render (or extend/remove during one) picks up from the rows built so far.
+        """
+        if self.renderer is None:
+            self.reconcile(items)
+            if self.on_render is not None:
+                self.on_render()
+            return
+        self.renderer.cancel()
+        self.pending = list(items)
+        self.renderer.start(self.reconcile_steps(self.pending), on_chunk=self.on_render)
+
+    def cancel_render(self):
+        """Stops a chunked render where it is (e.g. when the screen is left)."""
+        if self.renderer is not None:
+            self.renderer.cancel()
+
+    @property
+    def rendering(self):
+        return self.renderer is not None and self.renderer.active
+
+    def target_items(self):
+        """The items the rows show, or are being built towards while a chunked render runs."""
+        if self.rendering:
+            return list(self.pending)
+        return [self.items[key] for key in self.order]
+
+    def extend(self, items):
+        """Appends rows for items after the existing ones (e.g. the next page)."""
+        self.render(self.target_items() + list(items))
+
+    def update(self, key, item):
+        """Replaces the item of an existing row in place (no-op if the key is not shown)."""
+        if self.rendering:
+            self.pending = [item if self.key(i) == key else i for i in self.pending]
+        if key in self.rows and self.items[key] != item:
+            self.update_row(self.rows[key], item)
+            self.items[key] = item
+
+    def remove(self, key):
+        """Removes a single row without touching the others."""
+        if self.rendering:
+            self.render([i for i in self.pending if self.key(i) != key])
+        elif key in self.rows:
+            self.reconcile([self.items[k] for k in self.order if k != key])
+
+    def get(self, key):
+        return self.rows.get(key)
+
+    def clear(self):
+        self.reconcile([])
+
+    def show_message(self, text):
+        """Shows a centred status message (e.g. "Loading...") below the rows; None hides it."""
+        if text:
+            if self._message_label is None:
+                self._message_label = tk.Label(self.parent, font=GLOBAL_FONT_BOLD, fg=GRAY_TEXT, bg=WHITE_BG)
+            self._message_label.config(text=text)
+            self._message_label.pack(pady=50)
+        elif self._message_label is not None:
+            self._message_label.pack_forget()
+
+    def _show_empty(self, empty):
+        if empty and self.empty_text:
+            self.show_message(self.empty_text)
+        elif not empty:
+            self.show_message(None)
+
+    def _pack(self, row, prev, next_row_key):
+        if prev is not None:
+            row.pack(after=prev, **self.pack_options)
+        elif next_row_key is not None:
+            row.pack(before=self.rows[next_row_key], **self.pack_options)
+        else:
+            row.pack(**self.pack_options)
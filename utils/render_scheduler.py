@@ -0,0 +1,76 @@
+import time
+
+CHUNK_BUDGET_MS = 8 # Work per idle slot; leaves room in a 16 ms frame for input and drawing
+
+
+class ChunkedRenderer:
+    """
+    Runs a rendering generator in time-budgeted chunks from after_idle.
+
+    The generator yields after each unit of work (e.g. one row built). Each chunk keeps
+    calling next() until budget_ms has passed, calls on_chunk() (e.g. to grow the canvas
+    scrollregion), then hands control back to the event loop so scrolls and clicks are
+    handled before the next chunk. The first chunk runs straight away, so a short list
+    appears in one go just as before.
+
+    Only one generator runs per renderer: start() and cancel() close the previous one,
+    which lets it leave its widgets in a consistent state.
+    """
+
+    def __init__(self, widget, budget_ms=CHUNK_BUDGET_MS, clock=time.perf_counter):
+        self.widget = widget
+        self.budget_ms = budget_ms
+        self.clock = clock
+        self._steps = None
+        self._job = None
+        self._on_chunk = None
+        self._on_done = None
+        self.chunks = 0 # Chunks run by the current (or last) generator
+
+    @property
+    def active(self):
+        return self._steps is not None
+
+    def start(self, steps, on_chunk=None, on_done=None):
+        """Starts running the generator steps; on_done(result) gets its return value."""
+        self.cancel()
+        self._steps = steps
+        self._on_chunk = on_chunk
+        self._on_done = on_done
+        self.chunks = 0
+        self._run()
+
+    def cancel(self):
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+            self._job = None
+        if self._steps is not None:
+            steps, self._steps = self._steps, None
+            steps.close()
+
+    def _run(self):
+        self._job = None
+        steps = self._steps
+        deadline = self.clock() + self.budget_ms / 1000.0
+        self.chunks += 1
+        try:
+            while True:
+                next(steps)
+                if self.clock() >= deadline:
+                    break
+        except StopIteration as done:
+            self._steps = None
+            if self._on_chunk is not None:
+                self._on_chunk()
+            if self._on_done is not None:
+                self._on_done(done.value)
+            return
+        except Exception:
+            self._steps = None
+            steps.close()
+            raise
+
+        if self._on_chunk is not None:
+            self._on_chunk()
+        if self._steps is steps: # on_chunk may have started or cancelled a render
+            self._job = self.widget.after_idle(self._run)
@@ -0,0 +1,42 @@
+import re
+
+# Column weights for bm25(): a hit in the name counts far more than one in the description.
+NAME_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+CATEGORY_WEIGHT = 4.0
+
+DEFAULT_LIMIT = 50
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def build_match_query(text):
+    """
+    Turns free text typed by a shopper into a safe FTS5 MATCH expression.
+    Every word must match (implicit AND) and the last one is a prefix, so results
+    update while typing. Returns None when there is nothing searchable.
+    """
+    tokens = _TOKEN.findall(text)
+    if not tokens:
+        return None
+    # Quoting each token keeps FTS5 syntax characters (", *, :, -, AND/OR/NOT) literal.
+    terms = ['"' + token.replace('"', '""') + '"' for token in tokens]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def search_products(db, text, limit=DEFAULT_LIMIT):
+    """
+    Ranked product search over name, description and category.
+    Returns rows shaped like HomeScreen's listing: (id, name, price, image_path, sales_count).
+    """
+    match = build_match_query(text)
+    if match is None:
+        return []
+    return db.fetch_all(
+        "SELECT p.id, p.name, p.price, p.image_path, p.sales_count "
+        "FROM products_fts JOIN products p ON p.id = products_fts.rowid "
+        "WHERE products_fts MATCH ? "
+        "ORDER BY bm25(products_fts, ?, ?, ?) LIMIT ?",
+        (match, NAME_WEIGHT, DESCRIPTION_WEIGHT, CATEGORY_WEIGHT, limit)
+    )
@@ -0,0 +1,175 @@
+import builtins
+import json
+import os
+import platform
+import sys
+import time
+from contextlib import contextmanager
+
+PROFILE_FORMAT_VERSION = 1
+
+
+class ImportTimer:
+    """
+    Times module imports by wrapping builtins.__import__ while installed.
+
+    Only import statements that actually load something new are recorded. Each record
+    has the cumulative time (including nested imports) and the self time (excluding
+    them), the same split python -X importtime reports.
+    """
+
+    def __init__(self):
+        self.records = {} # module -> [self_ms, cumulative_ms]
+        self._stack = []
+        self._original = None
+
+    def install(self):
+        if self._original is None:
+            self._original = builtins.__import__
+            builtins.__import__ = self._import
+
+    def uninstall(self):
+        if self._original is not None:
+            builtins.__import__ = self._original
+            self._original = None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        loaded_before = len(sys.modules)
+        self._stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return self._original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000.0
+            nested_ms = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += elapsed_ms
+            if len(sys.modules) != loaded_before:
+                if level and globals:
+                    name = f"{globals.get('__package__') or ''}.{name}".strip(".")
+                record = self.records.setdefault(name, [0.0, 0.0])
+                record[0] += elapsed_ms - nested_ms
+                record[1] += elapsed_ms
+
+    def top(self, limit=None):
+        rows = sorted(self.records.items(), key=lambda item: item[1][1], reverse=True)
+        if limit:
+            rows = rows[:limit]
+        return [{"module": name, "self_ms": round(self_ms, 3), "cumulative_ms": round(cumulative_ms, 3)}
+                for name, (self_ms, cumulative_ms) in rows]
+
+
+class StartupProfiler:
+    """
+    Records wall time per startup phase (imports, database, images, fonts, screens...),
+    per-module import times and, optionally, a cProfile of the whole startup.
+
+    phase() is cheap enough to leave in place when profiling is off: a disabled profiler
+    records nothing. to_dict() output has stable keys and units (milliseconds since t0)
+    so reports from different releases can be diffed with tools/compare_startup.py.
+    """
+
+    def __init__(self, t0=None, enabled=True, cprofile_path=None):
+        self.t0 = t0 if t0 is not None else time.perf_counter()
+        self.enabled = enabled
+        self.phases = []
+        self.marks = {}
+        self._last_checkpoint_ms = None
+        self.imports = ImportTimer()
+        self.cprofile_path = cprofile_path
+        self._profile = None
+        if enabled and cprofile_path:
+            import cProfile
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+
+    def _now_ms(self):
+        return (time.perf_counter() - self.t0) * 1000.0
+
+    @contextmanager
+    def phase(self, name):
+        if not self.enabled:
+            yield
+            return
+        start = self._now_ms()
+        try:
+            yield
+        finally:
+            end = self._now_ms()
+            self.phases.append({"name": name, "start_ms": round(start, 3), "duration_ms": round(end - start, 3)})
+            self._last_checkpoint_ms = end
+
+    def checkpoint(self, name):
+        """
+        Closes a phase called name that started at the previous checkpoint or phase() block
+        (or at t0). Lets a long constructor be split up without re-indenting it.
+        """
+        if not self.enabled:
+            return
+        now = self._now_ms()
+        start = self._last_checkpoint_ms
+        if start is None:
+            start = 0.0
+        self.phases.append({"name": name, "start_ms": round(start, 3), "duration_ms": round(now - start, 3)})
+        self._last_checkpoint_ms = now
+
+    @contextmanager
+    def timed_imports(self):
+        """Records every module loaded inside the block (and its phase as "imports")."""
+        if not self.enabled:
+            yield
+            return
+        self.imports.install()
+        try:
+            with self.phase("imports"):
+                yield
+        finally:
+            self.imports.uninstall()
+
+    def mark(self, name):
+        """Records a point in time, e.g. "first_interactive"."""
+        if self.enabled:
+            self.marks[name] = round(self._now_ms(), 3)
+
+    def stop(self):
+        if self._profile is not None:
+            self._profile.disable()
+            self._profile.dump_stats(self.cprofile_path)
+            self._profile = None
+
+    def to_dict(self, extra=None):
+        report = {
+            "format_version": PROFILE_FORMAT_VERSION,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "phases": self.phases,
+            "marks": self.marks,
+            "imports": self.imports.top(),
+        }
+        if self.cprofile_path:
+            report["cprofile"] = os.path.abspath(self.cprofile_path)
+        if extra:
+            report.update(extra)
+        return report
+
+    def dump(self, path, extra=None):
+        """Writes the JSON report to path ("-" prints it)."""
+        text = json.dumps(self.to_dict(extra), indent=2, sort_keys=True)
+        if path == "-":
+            print(text)
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text + "\n")
+
+    def summary(self, top_imports=10):
+        lines = ["Startup profile:"]
+        for phase in self.phases:
+            lines.append(f"  {phase['name']:<24} {phase['duration_ms']:>9.1f} ms  (at {phase['start_ms']:.1f} ms)")
+        for name, at_ms in self.marks.items():
+            lines.append(f"  {name:<24} at {at_ms:.1f} ms")
+        imports = self.imports.top(top_imports)
+        if imports:
+            lines.append("  slowest imports (cumulative / self):")
+            for record in imports:
+                lines.append(f"    {record['module']:<30} {record['cumulative_ms']:>8.1f} / {record['self_ms']:>7.1f} ms")
+        return "\n".join(lines)
@@ -0,0 +1,174 @@
+import glob
+import hashlib
+import os
+import tempfile
+import threading
+
+from PIL import Image
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+THUMBNAIL_DIR = os.path.join(BASE_DIR, 'cache', 'thumbnails')
+
+# Sizes the screens display product images at: Home/Cart rows, Checkout rows, Product Detail.
+PRODUCT_THUMBNAIL_SIZES = [(60, 60), (80, 80), (180, 180)]
+
+# Modes PNG can store as-is; anything else (e.g. CMYK JPEGs) is converted first.
+_PNG_MODES = {"1", "L", "LA", "P", "RGB", "RGBA"}
+
+# Resize quality levels, as (resample filter, reducing gap):
+#   "best"     full-resolution decode, then a single LANCZOS pass (the original behaviour)
+#   "balanced" JPEGs are decoded at a reduced DCT scale and large sources are shrunk with a
+#              cheap integer reduce() down to 2x the target before LANCZOS; visually the same
+#              at thumbnail sizes
+#   "fast"     same shortcuts down to 1x the target, finished with BILINEAR
+RESIZE_QUALITIES = {
+    "best": (Image.LANCZOS, None),
+    "balanced": (Image.LANCZOS, 2.0),
+    "fast": (Image.BILINEAR, 1.0),
+}
+DEFAULT_RESIZE_QUALITY = "balanced"
+
+
+def scale_image(img, size, quality=DEFAULT_RESIZE_QUALITY):
+    """
+    Resizes a freshly opened (not yet loaded) image to size at the given quality level.
+    For JPEGs, draft() makes the decoder itself skip detail we would throw away anyway,
+    which cuts both decode time and peak memory.
+    """
+    resample, reducing_gap = RESIZE_QUALITIES[quality]
+    if reducing_gap is None:
+        return img.resize(size, resample)
+    if img.format == "JPEG":
+        # draft() picks the smallest 1/2, 1/4 or 1/8 scale that is still at least this big
+        img.draft(img.mode, (int(size[0] * reducing_gap), int(size[1] * reducing_gap)))
+    return img.resize(size, resample, reducing_gap=reducing_gap)
+
+
+def decode_image(path, size=None, quality=DEFAULT_RESIZE_QUALITY):
+    """Opens and (optionally) resizes an image file. Pure PIL, so safe to call from any thread."""
+    img = Image.open(path)
+    if size:
+        img = scale_image(img, tuple(size), quality)
+    else:
+        img.load()
+    return img
+
+
+class ThumbnailStore:
+    """
+    Persistent store of pre-resized images, one PNG per (source, size).
+
+    File names carry a hash of the source path plus a signature of its mtime and byte
+    size, so a changed source simply misses and its stale variant is replaced on the
+    next write. load() is thread-safe; writes go through a temp file and os.replace so
+    a crash or a second kiosk never leaves a half-written thumbnail behind.
+    """
+
+    def __init__(self, cache_dir=THUMBNAIL_DIR, quality=DEFAULT_RESIZE_QUALITY):
+        self.cache_dir = cache_dir
+        self.quality = quality
+        self._lock = threading.Lock()
+        self._disabled = False
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def _source_prefix(self, source, size):
+        digest = hashlib.sha1(os.path.abspath(source).encode("utf-8")).hexdigest()[:16]
+        return f"{digest}_{size[0]}x{size[1]}"
+
+    def path_for(self, source, size):
+        """Thumbnail file path for the current version of source, or None if source is missing."""
+        try:
+            st = os.stat(source)
+        except OSError:
+            return None
+        # The quality level is part of the signature, so changing it regenerates the variants.
+        signature = hashlib.sha1(f"{st.st_mtime_ns}:{st.st_size}:{self.quality}".encode("ascii")).hexdigest()[:10]
+        return os.path.join(self.cache_dir, f"{self._source_prefix(source, size)}_{signature}.png")
+
+    def load(self, source, size):
+        """Returns source resized to size as a PIL image, from disk if a current thumbnail exists."""
+        size = tuple(size)
+        thumb_path = self.path_for(source, size)
+        if thumb_path is None:
+            raise FileNotFoundError(source)
+        if not self._disabled:
+            try:
+                img = Image.open(thumb_path)
+                img.load()
+                with self._lock:
+                    self.hits += 1
+                return img
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"Discarding unreadable thumbnail {thumb_path}: {e}")
+        with self._lock:
+            self.misses += 1
+        img = decode_image(source, size, self.quality)
+        self._write(source, size, thumb_path, img)
+        return img
+
+    def _write(self, source, size, thumb_path, img):
+        if self._disabled:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            if img.mode not in _PNG_MODES:
+                img = img.convert("RGBA")
+            fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=self.cache_dir)
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    img.save(f, format="PNG")
+                os.replace(tmp_path, thumb_path)
+            except (OSError, ValueError):
+                try:
+                    os.unlink(tmp_path) # Never leave a half-written thumbnail behind
+                except OSError:
+                    pass
+                raise
+        except ValueError as e: # PIL could not encode this one image; the cache itself is fine
+            print(f"Warning: could not cache thumbnail {thumb_path}: {e}")
+            return
+        except OSError as e:
+            # Read-only install or full disk: keep working, just without the disk layer.
+            print(f"Warning: thumbnail cache disabled ({self.cache_dir}): {e}")
+            self._disabled = True
+            return
+        with self._lock:
+            self.writes += 1
+        # Drop variants made from older versions of the same source at this size.
+        for stale in glob.glob(os.path.join(self.cache_dir, glob.escape(self._source_prefix(source, size)) + "_*.png")):
+            if stale != thumb_path:
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
+
+    def warm(self, source, sizes=PRODUCT_THUMBNAIL_SIZES):
+        """Makes sure a current thumbnail exists for every size. Returns how many had to be generated."""
+        generated = 0
+        for size in sizes:
+            thumb_path = self.path_for(source, size)
+            if thumb_path is None:
+                raise FileNotFoundError(source)
+            if not os.path.exists(thumb_path):
+                self._write(source, tuple(size), thumb_path, decode_image(source, tuple(size), self.quality))
+                generated += 1
+        return generated
+
+    def clear(self):
+        """Deletes every stored thumbnail. Returns the number of files removed."""
+        removed = 0
+        for path in glob.glob(os.path.join(self.cache_dir, "*.png")):
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "writes": self.writes, "disabled": self._disabled}
@@ -0,0 +1,152 @@
+import time
+
+from utils.instrumentation import LatencyHistogram
+
+TRANSITION_MS = 220 # Length of a screen slide
+FRAME_MS = 16       # Target frame interval (~60 fps); late frames just jump further ahead
+
+
+def ease_out_cubic(t):
+    return 1 - (1 - t) ** 3
+
+
+class TransitionStats:
+    """Frame intervals of every slide, plus how many slides finished, were interrupted or dropped frames."""
+
+    def __init__(self, frame_ms=FRAME_MS):
+        self.frame_ms = frame_ms
+        self.frames = LatencyHistogram()
+        self.completed = 0
+        self.interrupted = 0
+        self.merged = 0
+        self.dropped_frames = 0
+        self.longest_ms = 0.0 # Longest slide from start to last frame, lateness included
+
+    def record_frame(self, interval_ms):
+        self.frames.add(interval_ms)
+        if interval_ms > self.frame_ms * 1.5:
+            self.dropped_frames += int(round(interval_ms / self.frame_ms)) - 1
+
+    def to_dict(self):
+        return {
+            "frame_target_ms": self.frame_ms,
+            "completed": self.completed,
+            "interrupted": self.interrupted,
+            "merged": self.merged,
+            "dropped_frames": self.dropped_frames,
+            "longest_ms": round(self.longest_ms, 3),
+            "frame_ms": self.frames.to_dict(),
+        }
+
+    def report(self):
+        frames = self.frames
+        return (f"Transitions: {self.completed} completed, {self.interrupted} interrupted, {self.merged} merged; "
+                f"frame time p50 {frames.percentile(50):.0f} ms, p95 {frames.percentile(95):.0f} ms, "
+                f"max {frames.max_ms:.0f} ms (target {self.frame_ms} ms), {self.dropped_frames} dropped frames")
+
+
+class TransitionEngine:
+    """
+    Slides one screen out and the next one in, paced by elapsed time rather than by tick count.
+
+    Each frame positions both screens for the time that has actually passed, so when the
+    event loop is busy the slide skips ahead instead of running slow, and always ends
+    after duration_ms. Only one slide runs at a time: starting another towards the screen
+    already sliding in is merged into it, and starting one anywhere else finishes the
+    current slide instantly first, so slides never stack up.
+
+    Screens are moved with place() while sliding and put back into the grid slot they
+    came from when the slide ends.
+    """
+
+    def __init__(self, root, container, duration_ms=TRANSITION_MS, frame_ms=FRAME_MS, easing=ease_out_cubic,
+                 clock=time.perf_counter):
+        self.root = root
+        self.container = container
+        self.duration_ms = duration_ms
+        self.frame_ms = frame_ms
+        self.easing = easing
+        self.clock = clock
+        self.stats = TransitionStats(frame_ms)
+        self._current = None # dict describing the running slide, or None
+
+    @property
+    def active(self):
+        return self._current is not None
+
+    def slide(self, old_frame, new_frame, on_done=None):
+        """Slides new_frame in from the right over old_frame. on_done() runs once it is in place."""
+        current = self._current
+        if current is not None:
+            if current["new"] is new_frame:
+                self.stats.merged += 1
+                if on_done is not None:
+                    current["on_done"].append(on_done)
+                return
+            self.finish()
+            self.stats.interrupted += 1
+
+        width = self.container.winfo_width()
+        if self.duration_ms <= 0 or width <= 1 or old_frame is new_frame:
+            self._settle(old_frame, new_frame, self._grid_info(old_frame), self._grid_info(new_frame))
+            if on_done is not None:
+                on_done()
+            return
+
+        now = self.clock()
+        self._current = {
+            "old": old_frame, "new": new_frame, "width": width, "start": now, "last": None,
+            "old_grid": self._grid_info(old_frame), "new_grid": self._grid_info(new_frame),
+            "on_done": [on_done] if on_done is not None else [], "job": None,
+        }
+        new_frame.place(x=width, y=0, relwidth=1, relheight=1)
+        old_frame.place(x=0, y=0, relwidth=1, relheight=1)
+        new_frame.tkraise()
+        self._tick()
+
+    def finish(self):
+        """Jumps the running slide (if any) to its end state."""
+        current = self._current
+        if current is None:
+            return
+        self._current = None
+        if current["job"] is not None:
+            self.root.after_cancel(current["job"])
+        self._settle(current["old"], current["new"], current["old_grid"], current["new_grid"])
+        for callback in current["on_done"]:
+            callback()
+
+    def _tick(self):
+        current = self._current
+        current["job"] = None
+        now = self.clock()
+        if current["last"] is not None: # The first frame is drawn straight away
+            self.stats.record_frame((now - current["last"]) * 1000.0)
+        current["last"] = now
+
+        elapsed_ms = (now - current["start"]) * 1000.0
+        progress = min(elapsed_ms / self.duration_ms, 1.0)
+        if progress >= 1.0:
+            self.stats.completed += 1
+            self.stats.longest_ms = max(self.stats.longest_ms, elapsed_ms)
+            self.finish()
+            return
+
+        x = int(round(current["width"] * (1.0 - self.easing(progress))))
+        current["new"].place_configure(x=x)
+        current["old"].place_configure(x=x - current["width"])
+        current["job"] = self.root.after(self.frame_ms, self._tick)
+
+    # --- Geometry ---
+    def _grid_info(self, frame):
+        info = frame.grid_info()
+        return info or {"row": 0, "column": 0, "sticky": "nsew"}
+
+    def _settle(self, old_frame, new_frame, old_grid, new_grid):
+        for frame, grid in ((old_frame, old_grid), (new_frame, new_grid)):
+            if frame.winfo_manager() == "place":
+                frame.place_forget()
+                frame.grid(**grid)
+        new_frame.tkraise()
+        if old_frame is not new_frame:
+            old_frame.lower()
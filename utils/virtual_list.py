@@ -0,0 +1,144 @@
+import math
+import tkinter as tk
+
+from utils.helpers import GLOBAL_FONT, GRAY_TEXT, WHITE_BG
+
+
+class VirtualList(tk.Frame):
+    """
+    Scrollable list that only builds enough row widgets to fill the viewport.
+
+    Rows have a fixed height. The canvas scroll region spans every item, but only
+    ceil(viewport / row_height) + 2 * buffer_rows row widgets exist; as the view moves,
+    rows that scrolled out are moved to the newly exposed positions and re-bound to
+    their new items. Building and scrolling therefore cost the same for 50 items or
+    50,000.
+
+    create_row(parent) builds one empty row widget and returns it.
+    bind_row(row, item, index) fills a row with an item; it is called again every time
+    the row is recycled, so it must fully overwrite whatever the previous item set.
+    unbind_row(row) (optional) runs when a row scrolls out of view, e.g. to cancel an
+    image load that is no longer needed.
+    on_near_end() (optional) fires when the view comes within near_end_rows of the last
+    item, e.g. to fetch the next page.
+    """
+
+    def __init__(self, parent, row_height, create_row, bind_row, unbind_row=None, buffer_rows=3, row_gap=6,
+                 on_near_end=None, near_end_rows=10, bg=WHITE_BG, **kwargs):
+        tk.Frame.__init__(self, parent, bg=bg, **kwargs)
+        self.row_height = row_height
+        self.row_gap = row_gap
+        self.create_row = create_row
+        self.bind_row = bind_row
+        self.unbind_row = unbind_row
+        self.buffer_rows = buffer_rows
+        self.on_near_end = on_near_end
+        self.near_end_rows = near_end_rows
+        self.items = []
+
+        self._rows = []     # every row widget ever built: (row, canvas window id)
+        self._bound = {}    # item index -> (row, window id) currently showing it
+        self._free = []     # (row, window id) not showing anything
+
+        self.canvas = tk.Canvas(self, bg=bg, highlightthickness=0)
+        self.scrollbar = tk.Scrollbar(self.canvas, orient="vertical", command=self.canvas.yview)
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.pack(fill="both", expand=True)
+        self.canvas.configure(yscrollcommand=self._on_scrolled)
+        self.canvas.bind("<Configure>", self._on_configure)
+
+        self._message = None
+        self.message_label = tk.Label(self.canvas, font=GLOBAL_FONT, fg=GRAY_TEXT, bg=bg)
+        self._message_id = self.canvas.create_window(0, 50, window=self.message_label, anchor="n", state="hidden")
+
+    # --- Data ---
+    def set_items(self, items, message=None):
+        """
+        Replaces the list contents and scrolls back to the top. message shows when items is empty.
+        Rows whose position still holds an equal item keep their binding; only changed ones are re-bound.
+        """
+        old_items, self.items = self.items, list(items)
+        for index in list(self._bound):
+            if index >= len(self.items) or self.items[index] != old_items[index]:
+                self._release(index)
+        self.canvas.yview_moveto(0)
+        self._update_scrollregion()
+        self.show_message(message if not self.items else None)
+        self._layout()
+
+    def append_items(self, items):
+        """Adds items to the end without disturbing the rows already on screen."""
+        self.items.extend(items)
+        self._update_scrollregion()
+        if self.items:
+            self.show_message(None)
+        self._layout()
+
+    def refresh(self):
+        """Re-binds every visible row, e.g. after the items changed in place."""
+        for index, (row, _) in self._bound.items():
+            self.bind_row(row, self.items[index], index)
+
+    def show_message(self, text):
+        """Shows text (e.g. "Loading...") centred over the list, or hides it for None."""
+        self._message = text
+        if text:
+            self.message_label.config(text=text)
+            self.canvas.coords(self._message_id, self.canvas.winfo_width() / 2, 50)
+            self.canvas.itemconfigure(self._message_id, state="normal")
+        else:
+            self.canvas.itemconfigure(self._message_id, state="hidden")
+
+    # --- Layout ---
+    def _update_scrollregion(self):
+        height = max(len(self.items) * self.row_height, 1)
+        self.canvas.configure(scrollregion=(0, 0, self.canvas.winfo_width(), height))
+
+    def _visible_range(self):
+        top = self.canvas.canvasy(0)
+        height = max(self.canvas.winfo_height(), self.row_height)
+        first = max(int(top // self.row_height) - self.buffer_rows, 0)
+        last = min(int(math.ceil((top + height) / self.row_height)) + self.buffer_rows, len(self.items))
+        return first, last
+
+    def _layout(self):
+        first, last = self._visible_range()
+        for index in [i for i in self._bound if i < first or i >= last]:
+            self._release(index)
+
+        width = self.canvas.winfo_width()
+        for index in range(first, last):
+            if index in self._bound:
+                continue
+            if self._free:
+                row, window_id = self._free.pop()
+            else:
+                row = self.create_row(self.canvas)
+                window_id = self.canvas.create_window(0, 0, window=row, anchor="nw",
+                                                      width=width, height=self.row_height - self.row_gap)
+                self._rows.append((row, window_id))
+            self.canvas.coords(window_id, 0, index * self.row_height + self.row_gap / 2)
+            self.canvas.itemconfigure(window_id, state="normal")
+            self.bind_row(row, self.items[index], index)
+            self._bound[index] = (row, window_id)
+
+        if self.on_near_end is not None and self.items and last >= len(self.items) - self.near_end_rows:
+            self.on_near_end()
+
+    def _release(self, index):
+        row, window_id = self._bound.pop(index)
+        self.canvas.itemconfigure(window_id, state="hidden")
+        self._free.append((row, window_id))
+        if self.unbind_row is not None:
+            self.unbind_row(row)
+
+    def _on_scrolled(self, first, last):
+        self.scrollbar.set(first, last)
+        self._layout()
+
+    def _on_configure(self, event):
+        for _, window_id in self._rows:
+            self.canvas.itemconfigure(window_id, width=event.width)
+        self._update_scrollregion()
+        self.show_message(self._message) # Re-centre it for the new width
+        self._layout()
@@ -0,0 +1,233 @@
+import json
+import os
+import sys
+import threading
+import time
+import tkinter
+from collections import deque
+
+from utils.instrumentation import LatencyHistogram
+
+HEARTBEAT_MS = 50      # How often the event loop is asked to check in
+STALL_MS = 200         # A heartbeat this late counts as a stall
+SAMPLE_MS = 50         # How often the sampler thread looks for a stall in progress
+MAX_STALLS = 100       # Stalls kept for the report (oldest dropped first)
+MAX_SAMPLES = 10       # Main-thread stacks kept per stall
+STACK_DEPTH = 25       # Innermost frames kept per stack
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def handler_name(func):
+    """module.qualname of a Tk callback; after() callbacks are unwrapped to the function they call."""
+    if getattr(func, "__qualname__", "").endswith("after.<locals>.callit") and func.__closure__:
+        for cell in func.__closure__:
+            contents = cell.cell_contents
+            if callable(contents) and not isinstance(contents, tkinter.Misc):
+                func = contents
+                break
+    func = getattr(func, "__func__", func) # Bound methods
+    module = getattr(func, "__module__", None) or "?"
+    name = getattr(func, "__qualname__", None) or type(func).__name__
+    return f"{module}.{name}"
+
+
+def format_stack(frame, depth=STACK_DEPTH):
+    """The frames of a stack as "file:line in function", outermost first, paths relative to the repo."""
+    lines = []
+    while frame is not None and len(lines) < depth:
+        path = frame.f_code.co_filename
+        if path.startswith(BASE_DIR):
+            path = os.path.relpath(path, BASE_DIR)
+        lines.append(f"{path}:{frame.f_lineno} in {frame.f_code.co_name}")
+        frame = frame.f_back
+    lines.reverse()
+    return lines
+
+
+class StallWatchdog:
+    """
+    Measures how late the Tk event loop is and what it was doing when it stalled.
+
+    A heartbeat scheduled with after() every heartbeat_ms records how late it fired:
+    that lateness is the time the loop could not react to input. A daemon sampler
+    thread watches the heartbeat; while one is more than stall_ms overdue it captures
+    the main thread's Python stack (sys._current_frames), so a stall report shows where
+    the time went even inside a single long handler such as bcrypt in login_user.
+
+    install() also replaces tkinter.CallWrapper, through which every Tk command,
+    binding and after() callback registered afterwards is called, with one that times
+    each call per handler. Handlers that open a messagebox include the time the dialog
+    was open.
+    """
+
+    def __init__(self, root, heartbeat_ms=HEARTBEAT_MS, stall_ms=STALL_MS, sample_ms=SAMPLE_MS,
+                 max_stalls=MAX_STALLS, screen_provider=None, clock=time.perf_counter):
+        self.root = root
+        self.heartbeat_ms = heartbeat_ms
+        self.stall_ms = stall_ms
+        self.sample_ms = sample_ms
+        self.screen_provider = screen_provider
+        self.clock = clock
+        self.loop_latency = LatencyHistogram()
+        self.handlers = {} # handler name -> LatencyHistogram
+        self.stalls = deque(maxlen=max_stalls)
+        self.stall_count = 0
+
+        self._lock = threading.Lock()
+        self._running = []         # handler names currently on the main thread's stack
+        self._slowest = None       # (ms, name) of the slowest handler since the last heartbeat
+        self._samples = []         # stacks captured during the current stall
+        self._last_beat = None
+        self._job = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._main_ident = threading.main_thread().ident
+        self._original_wrapper = None
+        self._heartbeat_name = handler_name(self._beat)
+
+    # --- Handler timing ---
+    def install(self):
+        """Starts timing Tk callbacks. Call before building widgets: commands registered earlier are not timed."""
+        if self._original_wrapper is not None:
+            return
+        self._original_wrapper = original = tkinter.CallWrapper
+        watchdog = self
+
+        class TimedCallWrapper(original):
+            def __call__(self, *args):
+                return watchdog._call(super().__call__, handler_name(self.func), args)
+
+        tkinter.CallWrapper = TimedCallWrapper
+
+    def uninstall(self):
+        if self._original_wrapper is not None:
+            tkinter.CallWrapper = self._original_wrapper
+            self._original_wrapper = None
+
+    def _call(self, call, name, args):
+        self._running.append(name)
+        start = self.clock()
+        try:
+            return call(*args)
+        finally:
+            elapsed_ms = (self.clock() - start) * 1000.0
+            self._running.pop()
+            if name != self._heartbeat_name: # The heartbeat is measured separately
+                histogram = self.handlers.get(name)
+                if histogram is None:
+                    histogram = self.handlers[name] = LatencyHistogram()
+                histogram.add(elapsed_ms)
+                if self._slowest is None or elapsed_ms > self._slowest[0]:
+                    self._slowest = (elapsed_ms, name)
+
+    # --- Heartbeat and sampler ---
+    def start(self):
+        if self._job is not None:
+            return
+        self._last_beat = self.clock()
+        self._job = self.root.after(self.heartbeat_ms, self._beat)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample_loop, name="stall-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._job is not None:
+            try:
+                self.root.after_cancel(self._job)
+            except tkinter.TclError: # Root already destroyed
+                pass
+            self._job = None
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def _beat(self):
+        now = self.clock()
+        with self._lock:
+            late_ms = max((now - self._last_beat) * 1000.0 - self.heartbeat_ms, 0.0)
+            self._last_beat = now
+            samples, self._samples = self._samples, []
+        self.loop_latency.add(late_ms)
+        if late_ms >= self.stall_ms:
+            self._record_stall(late_ms, samples)
+        self._slowest = None
+        self._job = self.root.after(self.heartbeat_ms, self._beat)
+
+    def _record_stall(self, late_ms, samples):
+        self.stall_count += 1
+        slowest_ms, slowest = self._slowest or (0.0, None)
+        self.stalls.append({
+            "at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "duration_ms": round(late_ms, 3),
+            "screen": self._current_screen(),
+            "handler": slowest,
+            "handler_ms": round(slowest_ms, 3),
+            "samples": samples,
+        })
+        print(f"Warning: UI stalled for {late_ms:.0f} ms" + (f" in {slowest} ({slowest_ms:.0f} ms)" if slowest else ""))
+
+    def _current_screen(self):
+        try:
+            return (self.screen_provider() if self.screen_provider else None) or "-"
+        except Exception:
+            return "-"
+
+    def _sample_loop(self):
+        while not self._stop.wait(self.sample_ms / 1000.0):
+            try:
+                self._sample()
+            except Exception as e: # One bad sample must not end stall sampling for the session
+                print(f"Warning: stall sampler skipped a sample: {e}")
+
+    def _sample(self):
+        with self._lock:
+            overdue_ms = (self.clock() - self._last_beat) * 1000.0 - self.heartbeat_ms
+            if overdue_ms < self.stall_ms or len(self._samples) >= MAX_SAMPLES:
+                return
+        frame = sys._current_frames().get(self._main_ident)
+        if frame is None:
+            return
+        running = list(self._running) # The main thread pushes and pops this without a lock
+        sample = {
+            "overdue_ms": round(overdue_ms, 3),
+            "handler": running[-1] if running else None,
+            "stack": format_stack(frame),
+        }
+        del frame
+        with self._lock:
+            self._samples.append(sample)
+
+    # --- Reporting ---
+    def to_dict(self):
+        handlers = sorted(self.handlers.items(), key=lambda item: item[1].total_ms, reverse=True)
+        return {
+            "heartbeat_ms": self.heartbeat_ms,
+            "stall_threshold_ms": self.stall_ms,
+            "loop_latency_ms": self.loop_latency.to_dict(),
+            "stall_count": self.stall_count,
+            "stalls": list(self.stalls),
+            "handlers": {name: histogram.to_dict() for name, histogram in handlers},
+        }
+
+    def dump(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def report(self, top=10):
+        latency = self.loop_latency
+        lines = [f"Event loop: {latency.count} heartbeats, late p50 {latency.percentile(50):.0f} ms, "
+                 f"p95 {latency.percentile(95):.0f} ms, max {latency.max_ms:.0f} ms; "
+                 f"{self.stall_count} stalls over {self.stall_ms} ms"]
+        handlers = sorted(self.handlers.items(), key=lambda item: item[1].max_ms, reverse=True)[:top]
+        if handlers:
+            lines.append(f"{'handler':<60} {'calls':>6} {'p95 ms':>8} {'max ms':>8}")
+            for name, histogram in handlers:
+                lines.append(f"{name[-60:]:<60} {histogram.count:>6} {histogram.percentile(95):>8.1f} {histogram.max_ms:>8.1f}")
+        for stall in list(self.stalls)[-3:]:
+            lines.append(f"Stall {stall['duration_ms']:.0f} ms on {stall['screen']} in {stall['handler']}")
+            if stall["samples"]:
+                for frame in stall["samples"][0]["stack"][-5:]:
+                    lines.append(f"    {frame}")
+        return "\n".join(lines)
@@ -0,0 +1,241 @@
+import queue
+import random
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+
+from utils.instrumentation import LatencyHistogram
+
+WRITE_WINDOW_MS = 2 # How long a batch stays open for more writes after its first one
+MAX_BATCH = 64      # Writes per group commit at most
+
+# SQLITE_BUSY retry policy for a batch (another process holds the write lock past busy_timeout)
+MAX_BUSY_RETRIES = 6
+BUSY_BASE_DELAY = 0.02  # seconds
+BUSY_MAX_DELAY = 0.5
+
+
+def is_busy(error):
+    message = str(error).lower()
+    return "locked" in message or "busy" in message
+
+
+class WriteFuture(Future):
+    """A queued write. retries is how often its batch had to wait out SQLITE_BUSY."""
+
+    def __init__(self):
+        super().__init__()
+        self.retries = 0
+
+
+class WriteResult:
+    """What a queued statement reports back once it is committed."""
+
+    def __init__(self, rowcount, lastrowid):
+        self.rowcount = rowcount
+        self.lastrowid = lastrowid
+
+
+class _Write:
+    def __init__(self, fn, args, future):
+        self.fn = fn
+        self.args = args
+        self.future = future
+        self.queued = time.perf_counter()
+
+
+class WriteQueue:
+    """
+    Runs every write of a Database on one writer thread and commits them in groups.
+
+    submit(fn, *args) queues fn to run on the writer thread (where db.execute() uses the
+    writer's own connection) and returns a WriteFuture. The writer takes the first queued
+    write, keeps the batch open for window_ms or until max_batch writes, and runs them all
+    in one BEGIN IMMEDIATE transaction with a single COMMIT, so concurrent writers share
+    one fsync and one trip through SQLite's write lock. The window only stays open while
+    writes are actually arriving together (another one is already queued, or the last
+    batch had more than one); a lone writer, like a single kiosk, commits straight away. Each write runs inside its own
+    SAVEPOINT: one that raises is rolled back alone and its future gets the exception,
+    the rest of the batch still commits. Futures resolve only after the COMMIT.
+
+    There is one thread and one FIFO queue, so writes are applied in the order they were
+    submitted; a caller's own writes can never overtake each other. A write submitted from
+    the writer thread itself (a queued function calling execute_query) runs straight away
+    inside the current transaction.
+    """
+
+    def __init__(self, db, window_ms=WRITE_WINDOW_MS, max_batch=MAX_BATCH, name="db-writer"):
+        self.db = db
+        self.window_ms = window_ms
+        self.max_batch = max_batch
+        self.name = name
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+        self.writes = 0
+        self.batches = 0
+        self.failed = 0
+        self.busy_retries = 0
+        self.largest_batch = 0
+        self._last_batch = 0
+        self.queue_wait = LatencyHistogram() # submit() -> start of its batch
+        self.commit_ms = LatencyHistogram()  # BEGIN -> COMMIT of a batch
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def on_writer_thread(self):
+        return threading.current_thread() is self._thread
+
+    def submit(self, fn, *args):
+        """Queues fn(*args) for the writer thread; returns a WriteFuture of its return value."""
+        future = WriteFuture()
+        if self.on_writer_thread():
+            try:
+                future.set_result(fn(*args))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+        self._start()
+        self._queue.put(_Write(fn, args, future))
+        return future
+
+    def _start(self):
+        if self.running:
+            return
+        with self._lock:
+            if not self.running:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+
+    def stop(self, timeout=5.0):
+        """Commits what is already queued, then ends the writer thread (a later submit() starts a new one)."""
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        self._queue.put(None)
+        thread.join(timeout)
+
+    # --- Writer thread ---
+    def _run(self):
+        try:
+            while True:
+                first = self._queue.get()
+                if first is None:
+                    return
+                batch = [first]
+                stopping = self._collect(batch)
+                self._commit(batch)
+                if stopping:
+                    return
+        finally:
+            self.db.close() # The writer's connection
+
+    def _collect(self, batch):
+        """Adds writes that arrive within the window. Returns True if stop() was requested meanwhile."""
+        concurrent = self._last_batch > 1 or not self._queue.empty()
+        deadline = time.perf_counter() + (self.window_ms / 1000.0 if concurrent else 0.0)
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.perf_counter()
+            try:
+                write = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                return False
+            if write is None:
+                return True
+            batch.append(write)
+        return False
+
+    def _commit(self, batch):
+        batch = [write for write in batch if write.future.set_running_or_notify_cancel()] # Drop cancelled writes
+        if not batch:
+            return
+        started = time.perf_counter()
+        for write in batch:
+            self.queue_wait.add((started - write.queued) * 1000.0)
+        self.batches += 1
+        self.writes += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+        self._last_batch = len(batch)
+
+        retries = 0
+        while True:
+            try:
+                outcomes = self._run_batch(batch)
+                break
+            except sqlite3.OperationalError as e:
+                if not is_busy(e) or retries >= MAX_BUSY_RETRIES:
+                    self._fail(batch, e, retries)
+                    return
+                delay = min(BUSY_MAX_DELAY, BUSY_BASE_DELAY * (2 ** retries))
+                time.sleep(delay * random.uniform(0.5, 1.0))
+                retries += 1
+                self.busy_retries += 1
+            except Exception as e: # e.g. the COMMIT itself failed: nothing in the batch was written
+                self._fail(batch, e, retries)
+                return
+        self.commit_ms.add((time.perf_counter() - started) * 1000.0)
+
+        for write, result, error in outcomes:
+            write.future.retries = retries
+            if error is not None:
+                self.failed += 1
+                write.future.set_exception(error)
+            else:
+                write.future.set_result(result)
+
+    def _run_batch(self, batch):
+        """One transaction for the whole batch; returns (write, result, error) per write."""
+        self.db.connect()
+        conn = self.db.conn
+        if conn.in_transaction:
+            conn.commit()
+        self.db.execute("BEGIN IMMEDIATE")
+        outcomes = []
+        try:
+            for write in batch:
+                conn.execute("SAVEPOINT queued_write")
+                try:
+                    result = write.fn(*write.args)
+                except Exception as e:
+                    if isinstance(e, sqlite3.OperationalError) and is_busy(e):
+                        raise # Retry the whole batch
+                    conn.execute("ROLLBACK TO queued_write")
+                    outcomes.append((write, None, e))
+                else:
+                    outcomes.append((write, result, None))
+                conn.execute("RELEASE queued_write")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        return outcomes
+
+    def _fail(self, batch, error, retries):
+        for write in batch:
+            self.failed += 1
+            write.future.retries = retries
+            write.future.set_exception(error)
+
+    # --- Reporting ---
+    def to_dict(self):
+        return {
+            "window_ms": self.window_ms,
+            "writes": self.writes,
+            "group_commits": self.batches,
+            "largest_batch": self.largest_batch,
+            "failed": self.failed,
+            "busy_retries": self.busy_retries,
+            "queue_wait_ms": self.queue_wait.to_dict(),
+            "commit_ms": self.commit_ms.to_dict(),
+        }
+
+    def report(self):
+        per_commit = self.writes / self.batches if self.batches else 0.0
+        return (f"Writes: {self.writes} in {self.batches} group commits ({per_commit:.1f} per commit, "
+                f"largest {self.largest_batch}, window {self.window_ms:g} ms); "
+                f"queue wait p95 {self.queue_wait.percentile(95):.1f} ms, commit p95 {self.commit_ms.percentile(95):.1f} ms; "
+                f"{self.failed} failed, {self.busy_retries} busy retries")